@@ -8,7 +8,11 @@ from datacentric.date_time.local_minute import LocalMinute
 from datacentric.date_time.local_date_time import LocalDateTime
 from datacentric.date_time.instant import Instant
 from datacentric.date_time.iso_day_of_week import IsoDayOfWeek
+from datacentric.date_time.day_ordinal import DayOrdinal
+from datacentric.date_time.business_calendar import BusinessCalendar
 from datacentric.storage.env_type import EnvType
+from datacentric.storage.change_type import ChangeType
+from datacentric.storage.record_change import RecordChange
 from datacentric.storage.context import Context
 from datacentric.storage.data import Data
 from datacentric.storage.record import Record
@@ -16,9 +20,18 @@ from datacentric.storage.key_util import KeyUtil
 from datacentric.storage.data_source import DataSource
 from datacentric.storage.mongo.mongo_data_source import MongoDataSource
 from datacentric.storage.mongo.temporal_mongo_data_source import TemporalMongoDataSource
+from datacentric.storage.memory.temporal_memory_data_source import TemporalMemoryDataSource
+from datacentric.storage.sqlite.temporal_sqlite_data_source import TemporalSqliteDataSource
+from datacentric.storage.snapshot.snapshot_data_source import SnapshotDataSource
+from datacentric.storage.snapshot.snapshot_writer import SnapshotWriter
+from datacentric.storage.version_compactor import VersionCompactor
+from datacentric.storage.compaction_result import CompactionResult
+from datacentric.storage.query_cache import QueryCache
 from datacentric.testing.unit_test import UnitTest
 from datacentric.date_time.zone import Zone
 from datacentric.storage.mongo.temporal_mongo_unit_test_context import TemporalMongoUnitTestContext
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+from datacentric.storage.sqlite.temporal_sqlite_unit_test_context import TemporalSqliteUnitTestContext
 from datacentric.storage.unit_test_context import UnitTestContext
 from datacentric.testing.unit_test_complexity import UnitTestComplexity
 from datacentric.schema.declaration.element_decl import ElementDecl
@@ -0,0 +1,47 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+from typing import TypeVar
+
+from datacentric.storage.data import Data
+
+TData = TypeVar('TData', bound=Data)
+
+
+def head_collection(maybe_cls=None):
+    """Records marked by HeadCollection attribute are stored together with
+    a side collection that holds only the latest version of each key in
+    each dataset, which is used by load methods and queries when CutoffTime
+    is not set.
+
+    Apply this attribute to the base class of the collection.
+    """
+
+    def wrap(cls):
+        if not inspect.isclass(cls):
+            raise Exception('@head_collection should be applied on class')
+        if not issubclass(cls, Data):
+            raise Exception('@head_collection should be applied on Data derived class')
+
+        cls.has_head_collection = True
+        return cls
+
+    # See if we're being called as @head_collection or @head_collection().
+    if maybe_cls is None:
+        # We're called with parens.
+        return wrap
+
+    # We're called as @head_collection without parens.
+    return wrap(maybe_cls)
@@ -16,6 +16,7 @@ import argparse
 
 from datacentric.commands.run import RunCommand
 from datacentric.commands.schema import SchemaCommand
+from datacentric.commands.compact import CompactCommand
 
 parser = argparse.ArgumentParser()
 sub_parsers = parser.add_subparsers(help='commands', dest='command')
@@ -28,6 +29,10 @@ SchemaCommand.add_arguments(schema_parser)
 run_parser = sub_parsers.add_parser('run', help='Execute handler')
 RunCommand.add_arguments(run_parser)
 
+# Compact command
+compact_parser = sub_parsers.add_parser('compact', help='Delete record versions older than retention horizon.')
+CompactCommand.add_arguments(compact_parser)
+
 if __name__ == '__main__':
     res = parser.parse_args()
     command = res.command
@@ -37,6 +42,9 @@ if __name__ == '__main__':
     elif command == 'run':
         run = RunCommand(res)
         run.execute()
+    elif command == 'compact':
+        compact = CompactCommand(res)
+        compact.execute()
     else:
         print(f'Unknown command: {command}.')
         parser.print_help()
@@ -0,0 +1,84 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime as dt
+from bson import ObjectId
+
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.context import Context
+from datacentric.storage.record import Record
+from datacentric.storage.mongo.mongo_server import MongoServer
+from datacentric.storage.mongo.temporal_mongo_data_source import TemporalMongoDataSource
+from datacentric.storage.version_compactor import VersionCompactor
+
+
+class CompactCommand:
+    """Command to delete record versions older than retention horizon"""
+
+    def __init__(self, cli_args):
+        """Init compact command from parsed CLI args."""
+        self.packages: str = cli_args.packages
+        self.types: str = cli_args.types
+        self.host: str = cli_args.host
+        self.env: EnvType = EnvType[cli_args.env]
+        self.group: str = cli_args.group
+        self.name: str = cli_args.name
+        self.retention_days: float = cli_args.retention_days
+        self.batch_size: int = cli_args.batch_size
+        self.pause: float = cli_args.pause
+
+    @classmethod
+    def add_arguments(cls, parser):
+        """Add arguments to parser."""
+        parser.add_argument('--packages', '-p', nargs='+', required=True,
+                            help='Packages where record types are defined')
+        parser.add_argument('--types', '-t', nargs='+', required=True,
+                            help='Record types for which the collections are compacted')
+        # Change short option to avoid -h conflict. Users always expect -h to work
+        parser.add_argument('--host', '-o', type=str, required=False,
+                            help='Db Host. Fallbacks to standard if not provided')
+        parser.add_argument('--env', '-e', type=str, required=True, help='Environment type')
+        parser.add_argument('--group', '-g', type=str, required=True, help='Environment group')
+        parser.add_argument('--name', '-n', type=str, required=True, help='Environment name')
+        parser.add_argument('--retention-days', '-r', type=float, required=True,
+                            help='Versions older than this number of days are deleted unless still required')
+        parser.add_argument('--batch-size', '-b', type=int, default=1000,
+                            help='Number of keys read and versions deleted in one batch')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Pause in seconds after each batch to limit the load on the database')
+
+    def execute(self):
+        """Compact collections for the specified types and print the outcome."""
+        context = Context()
+
+        data_source = TemporalMongoDataSource()
+        data_source.env_type = self.env
+        data_source.env_group = self.group
+        data_source.env_name = self.name
+        if self.host is not None:
+            data_source.mongo_server = MongoServer.create_key(mongo_server_uri=self.host)
+        data_source.init(context)
+        context.data_source = data_source
+
+        for package in self.packages:
+            ClassInfo.get_derived_types(package, Record)
+
+        horizon_time = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=self.retention_days)
+        compactor = VersionCompactor(data_source, ObjectId.from_datetime(horizon_time),
+                                     batch_size=self.batch_size, pause_seconds=self.pause)
+        for type_name in self.types:
+            result = compactor.compact(ClassInfo.get_type(type_name))
+            print(f'{result.collection_name}: deleted {result.versions_deleted} of {result.versions_scanned} '
+                  f'versions older than {horizon_time.isoformat()}, reclaimed {result.bytes_reclaimed} bytes.')
@@ -0,0 +1,94 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterable
+import numpy as np
+from datacentric.date_time.day_ordinal import DayOrdinal
+from datacentric.date_time.iso_day_of_week import IsoDayOfWeek
+
+
+class BusinessCalendar:
+    """
+    Business days from 1970-01-01 to 9999-12-31, excluding weekend days
+    and holidays, stored as a bitset with one bit per day ordinal.
+
+    Together with the bitset, the calendar stores the number of business
+    days before each byte of the bitset, so that checking a date and
+    counting business days between two dates take constant time per
+    value. Methods with _array suffix perform the same operations for
+    NumPy arrays of LocalDate without a loop in Python.
+    """
+
+    __slots__ = ('__business_day_bits', '__business_day_counts')
+
+    __bit_counts: np.ndarray = np.array([bin(x).count('1') for x in range(256)], dtype=np.int64)
+    """Number of bits set in each byte value."""
+
+    def __init__(self, holidays: Iterable[int] = (),
+                 weekend: Iterable[IsoDayOfWeek] = (IsoDayOfWeek.Saturday, IsoDayOfWeek.Sunday)):
+        """
+        Create calendar from holidays represented as LocalDate ints in
+        yyyymmdd format and weekend days, Saturday and Sunday by default.
+        """
+
+        # 1970-01-01 is Thursday
+        ordinals: np.ndarray = np.arange(DayOrdinal.max_value + 1, dtype=np.int64)
+        is_business_day: np.ndarray = ~np.isin((ordinals + 3) % 7 + 1, [int(x) for x in weekend])
+        is_business_day[DayOrdinal.from_local_date_array(np.fromiter(holidays, dtype=np.int64))] = False
+
+        # Trailing zero byte for the end of range after 9999-12-31
+        self.__business_day_bits: np.ndarray = np.append(np.packbits(is_business_day, bitorder='little'),
+                                                         np.uint8(0))
+        self.__business_day_counts: np.ndarray = np.concatenate(
+            ([0], np.cumsum(BusinessCalendar.__bit_counts[self.__business_day_bits])))
+
+    def is_business_day(self, value: int) -> bool:
+        """Return true if LocalDate represented as int in yyyymmdd format is a business day."""
+        ordinal: int = DayOrdinal.from_local_date(value)
+        return bool((self.__business_day_bits[ordinal >> 3] >> (ordinal & 7)) & 1)
+
+    def count_business_days(self, start: int, end: int) -> int:
+        """
+        Return the number of business days from start inclusive to end
+        exclusive, where start and end are LocalDate represented as int
+        in yyyymmdd format. The result is negative if end is before start.
+        """
+        return int(self.count_business_days_array(np.array([start]), np.array([end]))[0])
+
+    def is_business_day_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Return boolean array which is true for each LocalDate represented
+        as int in yyyymmdd format that is a business day.
+        """
+        ordinals: np.ndarray = DayOrdinal.from_local_date_array(values)
+        return ((self.__business_day_bits[ordinals >> 3] >> (ordinals & 7)) & 1).astype(bool)
+
+    def count_business_days_array(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Return array of the number of business days from each start
+        inclusive to the corresponding end exclusive, where starts and
+        ends are arrays of LocalDate represented as int in yyyymmdd
+        format, or a single LocalDate. The result is negative where
+        end is before start.
+        """
+        return self.__count_before(DayOrdinal.from_local_date_array(ends)) - \
+            self.__count_before(DayOrdinal.from_local_date_array(starts))
+
+    def __count_before(self, ordinals: np.ndarray) -> np.ndarray:
+        """Return array of the number of business days before each day ordinal."""
+
+        # Business days before the byte, followed by the bits of the byte before the ordinal
+        byte_indices: np.ndarray = ordinals >> 3
+        partial_bytes: np.ndarray = self.__business_day_bits[byte_indices] & ((1 << (ordinals & 7)) - 1)
+        return self.__business_day_counts[byte_indices] + BusinessCalendar.__bit_counts[partial_bytes]
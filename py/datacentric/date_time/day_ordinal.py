@@ -0,0 +1,174 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABC, abstractmethod
+import datetime as dt
+import numpy as np
+from datacentric.date_time.local_date import LocalDate
+from datacentric.date_time.iso_day_of_week import IsoDayOfWeek
+
+
+class DayOrdinal(int, ABC):
+    """
+    Represents a date as the number of days since 1970-01-01, which is
+    the first date in the range of LocalDate, and provides conversion
+    to and from LocalDate represented as int in yyyymmdd format.
+
+    Conversion from LocalDate uses a precomputed table of the ordinal
+    of the first day of each month from 1970 to 9999, so that adding
+    days and finding the day of week take constant time per value.
+    Methods with _array suffix perform the same operations for NumPy
+    arrays without a loop in Python.
+    """
+
+    __month_starts: np.ndarray = np.arange(
+        np.datetime64('1970-01', 'M'), np.datetime64('10000-01', 'M') + 1).astype('datetime64[D]').astype(np.int64)
+    """Ordinal of the first day of each month from 1970-01, followed by the ordinal of 10000-01-01."""
+
+    __epoch_ordinal: int = dt.date(1970, 1, 1).toordinal()
+    """Proleptic Gregorian ordinal of 1970-01-01 used by dt.date."""
+
+    max_value: int = int(__month_starts[-1]) - 1
+    """Ordinal of 9999-12-31, the last date in the range of LocalDate."""
+
+    # --- METHODS
+
+    @abstractmethod
+    def abstract_class_guard(self) -> None:
+        """
+        Guard method to prevent this abstract base class from
+        being instantiated.
+        """
+        pass
+
+    # --- CLASS
+
+    @classmethod
+    def from_local_date(cls, value: int) -> int:
+        """Convert LocalDate represented as int in yyyymmdd format to day ordinal."""
+
+        # Perform fast validation to detect values out of range
+        LocalDate.validate(value)
+
+        year, month_day = divmod(value, 10_000)
+        month, day = divmod(month_day, 100)
+        month_index: int = 12 * (year - 1970) + month - 1
+        month_start: int = int(cls.__month_starts[month_index])
+
+        # Detect errors such as Feb 31
+        if day > cls.__month_starts[month_index + 1] - month_start:
+            raise Exception(f'LocalDate {value} is not a valid date.')
+        return month_start + day - 1
+
+    @classmethod
+    def to_local_date(cls, value: int) -> int:
+        """Convert day ordinal to LocalDate represented as int in yyyymmdd format."""
+
+        cls.validate(value)
+        return LocalDate.from_date(dt.date.fromordinal(value + cls.__epoch_ordinal))
+
+    @classmethod
+    def add_days(cls, value: int, days: int) -> int:
+        """Add days to LocalDate represented as int in yyyymmdd format."""
+        return cls.to_local_date(cls.from_local_date(value) + days)
+
+    @classmethod
+    def day_of_week(cls, value: int) -> IsoDayOfWeek:
+        """Return ISO day of week for LocalDate represented as int in yyyymmdd format."""
+
+        # 1970-01-01 is Thursday
+        return IsoDayOfWeek((cls.from_local_date(value) + 3) % 7 + 1)
+
+    @classmethod
+    def validate(cls, value: int) -> None:
+        """
+        Raise exception if the argument is not None and is not a day
+        ordinal within the range of LocalDate.
+        """
+
+        # If None, return before doing other checks
+        if value is None:
+            return
+
+        if not (0 <= value <= cls.max_value):
+            raise Exception(f'Day ordinal {value} should be in 0 to {cls.max_value} range '
+                            f'which corresponds to dates from 1970-01-01 to 9999-12-31.')
+
+    # --- ARRAYS
+
+    @classmethod
+    def from_local_date_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of LocalDate represented as int in yyyymmdd format
+        to array of day ordinals as int64.
+        """
+
+        # Perform fast validation to detect values out of range
+        values = np.asarray(values, dtype=np.int64)
+        LocalDate.validate_array(values)
+
+        years, month_days = np.divmod(values, 10_000)
+        months, days = np.divmod(month_days, 100)
+        month_indices: np.ndarray = 12 * (years - 1970) + months - 1
+        month_starts: np.ndarray = cls.__month_starts[month_indices]
+
+        # Detect errors such as Feb 31
+        invalid_indices = np.flatnonzero(days > cls.__month_starts[month_indices + 1] - month_starts)
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'LocalDate {values[index]} at index {index} is not a valid date.')
+        return month_starts + days - 1
+
+    @classmethod
+    def to_local_date_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of day ordinals to array of LocalDate represented
+        as int64 in yyyymmdd format.
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+        return LocalDate.from_datetime64_array(values.astype('datetime64[D]'))
+
+    @classmethod
+    def add_days_array(cls, values: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        Add array of days, or the same number of days, to each element of
+        array of LocalDate represented as int in yyyymmdd format.
+        """
+        return cls.to_local_date_array(cls.from_local_date_array(values) + np.asarray(days, dtype=np.int64))
+
+    @classmethod
+    def day_of_week_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Return array of integer values of IsoDayOfWeek for array of LocalDate
+        represented as int in yyyymmdd format.
+        """
+
+        # 1970-01-01 is Thursday
+        return (cls.from_local_date_array(values) + 3) % 7 + 1
+
+    @classmethod
+    def validate_array(cls, values: np.ndarray) -> None:
+        """
+        Raise exception for the first value in the array which is not
+        a day ordinal within the range of LocalDate.
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        invalid_indices = np.flatnonzero((values < 0) | (values > cls.max_value))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'Day ordinal {values[index]} at index {index} should be in 0 to {cls.max_value} '
+                            f'range which corresponds to dates from 1970-01-01 to 9999-12-31.')
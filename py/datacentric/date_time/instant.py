@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
 from abc import ABC, abstractmethod
-from typing import Union, Optional, Tuple
+from typing import Union, Optional, Tuple, Iterable
 import datetime as dt
+import numpy as np
 import pytz
 
 
@@ -28,10 +30,18 @@ class Instant(dt.datetime, ABC):
     * ISO string in yyy-mm-ddThh:mm:ss.fffZ format
     * Python dt.datetime
     * Pandas pd.timestamp
+
+    Methods with _array suffix perform conversions for NumPy arrays of
+    datetime64[ms] in UTC, milliseconds since the Unix epoch, and str.
     """
 
     __unix_epoch: dt.datetime = dt.datetime.fromtimestamp(0, pytz.UTC)
 
+    __one_millisecond: dt.timedelta = dt.timedelta(milliseconds=1)
+
+    __fixed_format_pattern = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})\.(\d{3})Z', re.ASCII)
+    """Pattern for the yyyy-mm-ddThh:mm:ss.fffZ format produced by to_str(...), parsed without strptime."""
+
     # --- METHODS
 
     @abstractmethod
@@ -114,6 +124,13 @@ class Instant(dt.datetime, ABC):
             raise Exception(f'String {value} passed to Instant.from_str(...) method '
                             f'must end with capital Z that indicates UTC timezone.')
 
+        # Fast path for the format produced by to_str(...), which has
+        # whole milliseconds and does not require rounding
+        fixed_format_match = cls.__fixed_format_pattern.fullmatch(value)
+        if fixed_format_match is not None:
+            year, month, day, hour, minute, second, millisecond = map(int, fixed_format_match.groups())
+            return dt.datetime(year, month, day, hour, minute, second, 1000 * millisecond, pytz.UTC)
+
         # Convert to datetime and set UTC timezone
         dtime_from_str: dt.datetime
         if '.' in value:
@@ -150,8 +167,8 @@ class Instant(dt.datetime, ABC):
         # Convert to string in ISO format with UTC (Z) timezone suffix
         # and 3 digits after decimal points for seconds, irrespective of
         # how many digits are actually required.
-        result_to_microseconds: str = value.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        result: str = result_to_microseconds[:-3] + 'Z'
+        result: str = f'{value.year:04d}-{value.month:02d}-{value.day:02d}T' \
+                      f'{value.hour:02d}:{value.minute:02d}:{value.second:02d}.{value.microsecond // 1000:03d}Z'
         return result
 
     @classmethod
@@ -161,10 +178,9 @@ class Instant(dt.datetime, ABC):
         Convert milliseconds since Unix epoch Instant stored as dt.datetime
         in UTC timezone.
         """
-        # Convert milliseconds from Unix epoch to seconds, then construct the date
-        # and replace timezone with pytz.UTC which is more standard
-        return dt.datetime.utcfromtimestamp(
-            unix_millis / 1000.0).replace(tzinfo=pytz.UTC)
+        # Add milliseconds to Unix epoch in pytz.UTC timezone, which is
+        # exact unlike conversion from float seconds
+        return cls.__unix_epoch + dt.timedelta(milliseconds=unix_millis)
 
     @classmethod
     def to_unix_millis(cls, value: dt.datetime) -> int:
@@ -181,13 +197,10 @@ class Instant(dt.datetime, ABC):
         # milliseconds
         cls.validate(value)
 
-        # Convert to milliseconds since Unix epoch and round to whole
-        # milliseconds. Because we cannot subtract datetimes with two
-        # different instances of tzinfo, even if both are UTC, we
-        # cannot use a class variable for unix_epoch. It has to be
-        # created in the argument timezone instead.
-        unix_epoch: dt.datetime = dt.datetime.fromtimestamp(0, value.tzinfo)
-        result: int = round((value - unix_epoch).total_seconds() * 1000)
+        # Convert to milliseconds since Unix epoch. Subtraction of datetimes
+        # with different instances of tzinfo uses their UTC offsets, and
+        # division of timedelta by timedelta is exact for whole milliseconds
+        result: int = (value - cls.__unix_epoch) // cls.__one_millisecond
         return result
 
     @classmethod
@@ -275,18 +288,112 @@ class Instant(dt.datetime, ABC):
         if value is None:
             return
 
-        # Convert to milliseconds since Unix epoch and round to whole
-        # milliseconds
-        unix_epoch: dt.datetime = dt.datetime.fromtimestamp(0, value.tzinfo)
-        unix_millis: float = (value - unix_epoch).total_seconds() * 1000
-        rounded_unix_millis: int = round(unix_millis)
-
-        # Return false if more than roundoff tolerance
-        if abs(unix_millis - rounded_unix_millis) >= 1e-10:
+        # Fractional milliseconds are in microsecond field, UTC offsets
+        # of time zones do not have fractional milliseconds
+        if value.microsecond % 1000 != 0:
             raise Exception(f'Instant {cls.__to_str_lenient(value)} has fractional milliseconds. Valid '
                 f'Instant values must have whole milliseconds to ensure that no loss of precision '
                 f'occurs during serialization roundtrip. Use Instant.round(...) to remove.')
 
+    # --- ARRAYS
+
+    @classmethod
+    def from_unix_millis_array(cls, unix_millis: np.ndarray) -> np.ndarray:
+        """
+        Convert array of milliseconds since Unix epoch to array of
+        Instant represented as NumPy datetime64[ms] in UTC.
+        """
+        return np.asarray(unix_millis, dtype=np.int64).astype('datetime64[ms]')
+
+    @classmethod
+    def to_unix_millis_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of Instant represented as NumPy datetime64 in UTC
+        to array of milliseconds since Unix epoch as int64.
+
+        Error message if an element has fractional milliseconds.
+        """
+
+        values = np.asarray(values)
+        if values.dtype.kind != 'M':
+            raise Exception(f'Array of {values.dtype} passed to Instant.to_unix_millis_array(...) '
+                            f'is not an array of datetime64.')
+
+        result: np.ndarray = values.astype('datetime64[ms]')
+        invalid_indices = np.flatnonzero(result != values)
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'Instant {values[index]} at index {index} has fractional milliseconds. Valid '
+                            f'Instant values must have whole milliseconds to ensure that no loss of precision '
+                            f'occurs during serialization roundtrip.')
+        return result.astype(np.int64)
+
+    @classmethod
+    def from_str_array(cls, values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert array of str in ISO format with UTC (Z) timezone suffix to
+        the tuple of arrays (instants, is_valid), where instants are NumPy
+        datetime64[ms], and is_valid is false for each string that cannot
+        be parsed, for which the instant is NaT.
+
+        Strings in yyyy-mm-ddThh:mm:ss.fffZ format are parsed without
+        a loop in Python, other strings are passed to from_str(...).
+        """
+
+        values = np.asarray(values, dtype=np.str_)
+        count = len(values)
+
+        # View each string of 24 characters as an array of character codes
+        is_fixed_format: np.ndarray = np.char.str_len(values) == 24
+        codes: np.ndarray = values.astype('U24').view(np.uint32).reshape(count, 24).astype(np.int64)
+        separators = {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':', 19: '.', 23: 'Z'}
+        for position, separator in separators.items():
+            is_fixed_format &= codes[:, position] == ord(separator)
+        digits: np.ndarray = codes - ord('0')
+        digit_positions = [x for x in range(24) if x not in separators]
+        is_fixed_format &= np.all((digits[:, digit_positions] >= 0) & (digits[:, digit_positions] <= 9), axis=1)
+
+        def field(start: int, end: int) -> np.ndarray:
+            result_field = np.zeros(count, dtype=np.int64)
+            for position in range(start, end):
+                result_field = 10 * result_field + digits[:, position]
+            return np.where(is_fixed_format, result_field, 0)
+
+        years, months, days = field(0, 4), field(5, 7), field(8, 10)
+        hours, minutes, seconds, milliseconds = field(11, 13), field(14, 16), field(17, 19), field(20, 23)
+        is_valid: np.ndarray = is_fixed_format & (1 <= years) & (1 <= months) & (months <= 12) & \
+            (1 <= days) & (days <= 31) & (hours <= 23) & (minutes <= 59) & (seconds <= 59)
+
+        # Day beyond the end of the month moves the date to the next month
+        months_since_epoch: np.ndarray = np.where(is_valid, (years - 1970) * 12 + months - 1, 0) \
+            .astype('datetime64[M]')
+        dates: np.ndarray = months_since_epoch.astype('datetime64[D]') + (days - 1).astype('timedelta64[D]')
+        is_valid &= dates.astype('datetime64[M]') == months_since_epoch
+
+        result: np.ndarray = dates.astype('datetime64[ms]') + \
+            (3_600_000 * hours + 60_000 * minutes + 1000 * seconds + milliseconds).astype('timedelta64[ms]')
+        result[~is_valid] = np.datetime64('NaT')
+
+        # Strings in other formats accepted by from_str(...)
+        for index in np.flatnonzero(~is_fixed_format):
+            try:
+                result[index] = np.datetime64(cls.to_unix_millis(cls.from_str(values[index])), 'ms')
+                is_valid[index] = True
+            except Exception:
+                pass
+
+        return result, is_valid
+
+    @classmethod
+    def to_str_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of Instant represented as NumPy datetime64 in UTC to
+        array of str in ISO format with UTC (Z) timezone suffix and 3 digits
+        after decimal points for seconds.
+        """
+        unix_millis: np.ndarray = cls.to_unix_millis_array(values)
+        return np.char.add(np.datetime_as_string(unix_millis.astype('datetime64[ms]'), unit='ms'), 'Z')
+
     @classmethod
     def __to_str_lenient(cls, value: dt.datetime) -> str:
         """
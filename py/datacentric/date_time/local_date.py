@@ -13,8 +13,9 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from typing import Union, Tuple
+from typing import Union, Tuple, Iterable
 import datetime as dt
+import numpy as np
 
 
 class LocalDate(int, ABC):
@@ -25,6 +26,10 @@ class LocalDate(int, ABC):
     * Integer year, month, and day of month
     * ISO string in yyyy-mm-dd format
     * Python dt.date
+
+    Methods with _array suffix perform the same conversions for NumPy
+    arrays of LocalDate represented as int64 in yyyymmdd format, and
+    for arrays of NumPy datetime64[D] and str.
     """
 
     # --- METHODS
@@ -148,6 +153,141 @@ class LocalDate(int, ABC):
             raise Exception(f'LocalDate {value} is not in readable yyyymmdd format. '
                             f'The day {day} should be in 1 to 31 range.')
 
+    # --- ARRAYS
+
+    @classmethod
+    def from_fields_array(cls, years: np.ndarray, months: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        Convert arrays of year, month and day fields to array of LocalDate
+        represented as int64 in yyyymmdd format.
+        """
+
+        # Convert to int in ISO yyyymmdd format
+        result: np.ndarray = 10_000 * np.asarray(years, dtype=np.int64) + \
+            100 * np.asarray(months, dtype=np.int64) + np.asarray(days, dtype=np.int64)
+
+        # Perform full validation and return
+        cls.validate_array(result)
+        return result
+
+    @classmethod
+    def to_fields_array(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert array of LocalDate represented as int in yyyymmdd format
+        to the tuple of arrays (years, months, days).
+        """
+
+        # Perform fast validation to detect values out of range.
+        # This will not detect errors such as Feb 31
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        # Convert to tuple
+        years, months, days = cls.__to_fields_array_lenient(values)
+        return years, months, days
+
+    @classmethod
+    def from_str_array(cls, iso_strings: Iterable[str]) -> np.ndarray:
+        """
+        Convert array of str in yyyy-mm-dd format to array of LocalDate
+        represented as int64 in yyyymmdd format.
+        """
+
+        iso_strings = np.asarray(iso_strings, dtype=np.str_)
+
+        # Strings in other formats accepted by datetime64, such as yyyy-mm
+        # or strings with time zone, do not have the length of yyyy-mm-dd
+        invalid_indices = np.flatnonzero(np.char.str_len(iso_strings) != 10)
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'String {iso_strings[index]} at index {index} passed to LocalDate.from_str_array '
+                            f'is not in yyyy-mm-dd format.')
+
+        # Parsing to datetime64 also validates the date
+        return cls.from_datetime64_array(iso_strings.astype('datetime64[D]'))
+
+    @classmethod
+    def to_str_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of LocalDate represented as int in yyyymmdd format
+        to array of str in ISO yyyy-mm-dd format.
+        """
+
+        # Conversion to datetime64 will check that each value is a valid date
+        return np.datetime_as_string(cls.to_datetime64_array(values), unit='D')
+
+    @classmethod
+    def from_datetime64_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of NumPy datetime64 to array of LocalDate represented
+        as int64 in yyyymmdd format, discarding time of day if present.
+        """
+
+        days_since_epoch: np.ndarray = np.asarray(values).astype('datetime64[D]')
+        months_since_epoch: np.ndarray = days_since_epoch.astype('datetime64[M]')
+        years: np.ndarray = months_since_epoch.astype(np.int64) // 12 + 1970
+        months: np.ndarray = months_since_epoch.astype(np.int64) % 12 + 1
+        days: np.ndarray = (days_since_epoch - months_since_epoch).astype(np.int64) + 1
+
+        result: np.ndarray = 10_000 * years + 100 * months + days
+        cls.validate_array(result)
+        return result
+
+    @classmethod
+    def to_datetime64_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of LocalDate represented as int in yyyymmdd format
+        to array of NumPy datetime64[D].
+        """
+
+        # Perform fast validation to detect values out of range.
+        # This will not detect errors such as Feb 31
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        # Convert to tuple
+        years, months, days = cls.__to_fields_array_lenient(values)
+
+        # Day beyond the end of the month moves the result to the next month,
+        # which detects errors such as Feb 31
+        months_since_epoch: np.ndarray = ((years - 1970) * 12 + months - 1).astype('datetime64[M]')
+        result: np.ndarray = months_since_epoch.astype('datetime64[D]') + (days - 1).astype('timedelta64[D]')
+        invalid_indices = np.flatnonzero(result.astype('datetime64[M]') != months_since_epoch)
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'LocalDate {values[index]} at index {index} is not a valid date.')
+        return result
+
+    @classmethod
+    def is_valid_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Return boolean array which is true for each value that is in
+        yyyymmdd format.
+
+        This fast validation method will not detect errors such as Feb 31.
+        """
+
+        years, months, days = cls.__to_fields_array_lenient(np.asarray(values, dtype=np.int64))
+        return (1970 <= years) & (years <= 9999) & (1 <= months) & (months <= 12) & (1 <= days) & (days <= 31)
+
+    @classmethod
+    def validate_array(cls, values: np.ndarray) -> None:
+        """
+        Raise exception for the first value in the array which is not
+        in yyyymmdd format, with the same message as validate(...)
+        preceded by the index of the value.
+
+        This fast validation method will not detect errors such as Feb 31.
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        invalid_indices = np.flatnonzero(~cls.is_valid_array(values))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'LocalDate {values[index]} at index {index} is not in readable yyyymmdd format. '
+                            f'The year should be in 1970 to 9999 range, the month in 1 to 12 range, '
+                            f'and the day in 1 to 31 range.')
+
     @classmethod
     def __to_fields_lenient(cls, value: int) -> Tuple[int, int, int]:
         """
@@ -162,3 +302,15 @@ class LocalDate(int, ABC):
         day: int = value
 
         return year, month, day
+
+    @classmethod
+    def __to_fields_array_lenient(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert array of LocalDate represented as int in yyyymmdd format
+        to the tuple of arrays (years, months, days), without modifying
+        the argument.
+        """
+
+        years, month_days = np.divmod(values, 10_000)
+        months, days = np.divmod(month_days, 100)
+        return years, months, days
@@ -15,6 +15,9 @@
 from abc import ABC, abstractmethod
 from typing import Union, Optional, Tuple
 import datetime as dt
+import numpy as np
+from datacentric.date_time.local_date import LocalDate
+from datacentric.date_time.local_time import LocalTime
 
 
 class LocalDateTime(int, ABC):
@@ -28,6 +31,10 @@ class LocalDateTime(int, ABC):
       seconds always have 3 digits after the decimal point, irrespective
       of how many digits are actually required.
     * Python dt.time without timezone
+
+    Methods with _array suffix perform the same conversions for NumPy
+    arrays of LocalDateTime represented as int64 in yyyymmddhhmmssfff
+    format, and for arrays of NumPy datetime64.
     """
 
     # --- METHODS
@@ -122,6 +129,115 @@ class LocalDateTime(int, ABC):
             raise Exception(f'LocalDateTime {value} is not in yyyymmddhhmmssfff format. '
                             f'The millisecond {millisecond} should be in 0 to 999 range.')
 
+    # --- ARRAYS
+
+    @classmethod
+    def from_fields_array(cls, years: np.ndarray, months: np.ndarray, days: np.ndarray,
+                          hours: Optional[np.ndarray] = None, minutes: Optional[np.ndarray] = None,
+                          seconds: Optional[np.ndarray] = None,
+                          milliseconds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert arrays of year to millisecond fields to array of LocalDateTime
+        represented as int64 in yyyymmddhhmmssfff format.
+
+        Arrays of hour to millisecond fields are optional. Zero values
+        will be assumed if not specified.
+        """
+
+        fields = [np.asarray(x if x is not None else 0, dtype=np.int64)
+                  for x in (years, months, days, hours, minutes, seconds, milliseconds)]
+        result: np.ndarray = 1000_00_00_00_00_00 * fields[0] + 1000_00_00_00_00 * fields[1] + \
+            1000_00_00_00 * fields[2] + 1000_00_00 * fields[3] + 1000_00 * fields[4] + 1000 * fields[5] + fields[6]
+
+        # Validate and return
+        cls.validate_array(result)
+        return result
+
+    @classmethod
+    def to_fields_array(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+                                                          np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert array of LocalDateTime represented as int in yyyymmddhhmmssfff
+        format to the tuple of arrays (years, months, days, hours, minutes,
+        seconds, milliseconds).
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        dates, times = np.divmod(values, 1000_00_00_00)
+        years, months, days = LocalDate.to_fields_array(dates)
+        hours, minutes, seconds, milliseconds = LocalTime.to_fields_array(times)
+        return years, months, days, hours, minutes, seconds, milliseconds
+
+    @classmethod
+    def from_datetime64_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of NumPy datetime64 to array of LocalDateTime
+        represented as int64 in yyyymmddhhmmssfff format.
+
+        The argument is truncated to whole milliseconds.
+        """
+
+        # Truncate to whole milliseconds since epoch, as from_datetime(...) does for scalar values
+        values = np.asarray(values)
+        unit, count = np.datetime_data(values.dtype)
+        if unit in ('us', 'ns'):
+            ticks = values.astype(np.int64) // (np.timedelta64(1, 'ms') // np.timedelta64(count, unit))
+        else:
+            ticks = values.astype('datetime64[ms]').astype(np.int64)
+
+        days_since_epoch, milliseconds_of_day = np.divmod(ticks, 86_400_000)
+        dates: np.ndarray = LocalDate.from_datetime64_array(days_since_epoch.astype('datetime64[D]'))
+        times: np.ndarray = LocalTime.from_timedelta64_array(milliseconds_of_day.astype('timedelta64[ms]'))
+        result: np.ndarray = 1000_00_00_00 * dates + times
+        return result
+
+    @classmethod
+    def to_datetime64_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of LocalDateTime represented as int in yyyymmddhhmmssfff
+        format to array of NumPy datetime64[ms].
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        # This will also validate the date
+        dates, times = np.divmod(values, 1000_00_00_00)
+        result: np.ndarray = LocalDate.to_datetime64_array(dates).astype('datetime64[ms]') + \
+            LocalTime.to_timedelta64_array(times)
+        return result
+
+    @classmethod
+    def is_valid_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Return boolean array which is true for each value that is
+        in yyyymmddhhmmssfff format.
+
+        This fast validation method will not detect errors such as Feb 31.
+        """
+
+        dates, times = np.divmod(np.asarray(values, dtype=np.int64), 1000_00_00_00)
+        return LocalDate.is_valid_array(dates) & LocalTime.is_valid_array(times)
+
+    @classmethod
+    def validate_array(cls, values: np.ndarray) -> None:
+        """
+        Raise exception for the first value in the array which is
+        not in yyyymmddhhmmssfff format.
+
+        This fast validation method will not detect errors such as Feb 31.
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        invalid_indices = np.flatnonzero(~cls.is_valid_array(values))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'LocalDateTime {values[index]} at index {index} is not in yyyymmddhhmmssfff format. '
+                            f'The date should be in yyyymmdd format from 1970 to 9999 and the time '
+                            f'in hhmmssfff format.')
+
     @classmethod
     def __to_fields_lenient(cls, value: int) -> Tuple[int, int, int, int, int, int, int]:
         """
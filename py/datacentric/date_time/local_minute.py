@@ -15,6 +15,7 @@
 from abc import ABC, abstractmethod
 from typing import Union, Optional, Tuple
 import datetime as dt
+import numpy as np
 
 
 class LocalMinute(int, ABC):
@@ -26,6 +27,10 @@ class LocalMinute(int, ABC):
     * Integer in hhmm format
     * String in hh:mm format
     * Python dt.time (when used as input, must fall exactly on the minute)
+
+    Methods with _array suffix perform the same conversions for NumPy
+    arrays of LocalMinute represented as int64 in hhmm format, and
+    for arrays of NumPy timedelta64 since midnight.
     """
 
     # --- METHODS
@@ -149,6 +154,92 @@ class LocalMinute(int, ABC):
             raise Exception(f'LocalMinute {value} is not in hhmm format. '
                             f'The minute {minute} should be in 0 to 59 range.')
 
+    # --- ARRAYS
+
+    @classmethod
+    def from_fields_array(cls, hours: np.ndarray, minutes: np.ndarray) -> np.ndarray:
+        """
+        Convert arrays of hour and minute fields to array of LocalMinute
+        represented as int64 in hhmm format.
+        """
+
+        # Convert to LocalMinute represented as int in hhmm format
+        result: np.ndarray = 100 * np.asarray(hours, dtype=np.int64) + np.asarray(minutes, dtype=np.int64)
+
+        # Perform validation to detect out of range values
+        cls.validate_array(result)
+
+        return result
+
+    @classmethod
+    def to_fields_array(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert array of LocalMinute represented as int in hhmm format to
+        the tuple of arrays (hours, minutes).
+        """
+
+        # Perform validation to detect out of range values
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        # Convert to tuple
+        hours, minutes = np.divmod(values, 100)
+        return hours, minutes
+
+    @classmethod
+    def from_timedelta64_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of NumPy timedelta64 since midnight to array of
+        LocalMinute represented as int64 in hhmm format.
+
+        Each value must fall exactly on the minute.
+        """
+
+        values = np.asarray(values)
+        minutes: np.ndarray = values.astype('timedelta64[m]')
+        invalid_indices = np.flatnonzero((minutes != values) | (values < np.timedelta64(0, 'm')) |
+                                         (values >= np.timedelta64(1440, 'm')))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'Value {values[index]} at index {index} passed to LocalMinute.from_timedelta64_array '
+                            f'does not fall exactly on the minute within the day.')
+
+        hours, minutes = np.divmod(minutes.astype(np.int64), 60)
+        result: np.ndarray = 100 * hours + minutes
+        return result
+
+    @classmethod
+    def to_timedelta64_array(cls, values: np.ndarray) -> np.ndarray:
+        """Convert array of LocalMinute to array of NumPy timedelta64[m] since midnight."""
+
+        hours, minutes = cls.to_fields_array(values)
+        result: np.ndarray = (60 * hours + minutes).astype('timedelta64[m]')
+        return result
+
+    @classmethod
+    def is_valid_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Return boolean array which is true for each value that is
+        in hhmm format.
+        """
+
+        hours, minutes = np.divmod(np.asarray(values, dtype=np.int64), 100)
+        return (0 <= hours) & (hours <= 23) & (0 <= minutes) & (minutes <= 59)
+
+    @classmethod
+    def validate_array(cls, values: np.ndarray) -> None:
+        """
+        Raise exception for the first value in the array which is
+        not in hhmm format.
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        invalid_indices = np.flatnonzero(~cls.is_valid_array(values))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'LocalMinute {values[index]} at index {index} is not in hhmm format. '
+                            f'The hour should be in 0 to 23 range and the minute in 0 to 59 range.')
+
     @classmethod
     def __to_fields_lenient(cls, value: int) -> Tuple[int, int]:
         """
@@ -15,6 +15,7 @@
 from abc import ABC, abstractmethod
 from typing import Union, Optional, Tuple
 import datetime as dt
+import numpy as np
 
 
 class LocalTime(int, ABC):
@@ -26,6 +27,10 @@ class LocalTime(int, ABC):
     * Integer to millisecond precision in ISO hhmmssfff format
     * ISO string to millisecond precision in hh:mm:ss.fff format
     * Python dt.time
+
+    Methods with _array suffix perform the same conversions for NumPy
+    arrays of LocalTime represented as int64 in hhmmssfff format, and
+    for arrays of NumPy timedelta64 since midnight.
     """
 
     # --- METHODS
@@ -186,6 +191,118 @@ class LocalTime(int, ABC):
             raise Exception(f'LocalTime {value} is not in hhmmssfff format. '
                             f'The millisecond {millisecond} should be in 0 to 999 range.')
 
+    # --- ARRAYS
+
+    @classmethod
+    def from_fields_array(cls, hours: np.ndarray, minutes: np.ndarray, seconds: np.ndarray,
+                          milliseconds: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert arrays of hour to millisecond fields to array of LocalTime
+        represented as int64 in hhmmssfff format.
+
+        Millisecond array is optional. Zero values will be assumed if not specified.
+        """
+
+        # If millisecond is not specified, assume 0
+        if milliseconds is None:
+            milliseconds = 0
+
+        # Convert to LocalTime represented in hhmmssfff format
+        result: np.ndarray = 10_000_000 * np.asarray(hours, dtype=np.int64) + \
+            100_000 * np.asarray(minutes, dtype=np.int64) + 1000 * np.asarray(seconds, dtype=np.int64) + \
+            np.asarray(milliseconds, dtype=np.int64)
+
+        # Validate and return
+        cls.validate_array(result)
+        return result
+
+    @classmethod
+    def to_fields_array(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert array of LocalTime represented in hhmmssfff format to
+        the tuple of arrays (hours, minutes, seconds, milliseconds).
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        # Convert to tuple
+        hours, minutes, seconds, milliseconds = cls.__to_fields_array_lenient(values)
+        return hours, minutes, seconds, milliseconds
+
+    @classmethod
+    def from_timedelta64_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Convert array of NumPy timedelta64 since midnight to array of
+        LocalTime represented as int64 in hhmmssfff format.
+
+        The argument is rounded to whole milliseconds.
+        """
+
+        # Round to whole milliseconds since midnight
+        values = np.asarray(values)
+        unit, count = np.datetime_data(values.dtype)
+        unit_count = np.timedelta64(1, 'ms') // np.timedelta64(count, unit) if unit in ('us', 'ns') else 0
+        if unit_count > 1:
+            ticks, remainders = np.divmod(values.astype(np.int64), unit_count)
+            # Round half to even, as round(...) does for scalar values
+            ticks += (2 * remainders > unit_count) | ((2 * remainders == unit_count) & (ticks % 2 == 1))
+        else:
+            ticks = values.astype('timedelta64[ms]').astype(np.int64)
+
+        invalid_indices = np.flatnonzero((ticks < 0) | (ticks >= 86_400_000))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'Value {values[index]} at index {index} passed to LocalTime.from_timedelta64_array '
+                            f'is not within the day after rounding to whole milliseconds.')
+
+        # Convert to LocalTime represented in hhmmssfff format
+        hours, ticks = np.divmod(ticks, 3_600_000)
+        minutes, ticks = np.divmod(ticks, 60_000)
+        seconds, milliseconds = np.divmod(ticks, 1000)
+        result: np.ndarray = 10_000_000 * hours + 100_000 * minutes + 1000 * seconds + milliseconds
+        return result
+
+    @classmethod
+    def to_timedelta64_array(cls, values: np.ndarray) -> np.ndarray:
+        """Convert array of LocalTime to array of NumPy timedelta64[ms] since midnight."""
+
+        values = np.asarray(values, dtype=np.int64)
+        cls.validate_array(values)
+
+        # Convert to tuple
+        hours, minutes, seconds, milliseconds = cls.__to_fields_array_lenient(values)
+
+        result: np.ndarray = (3_600_000 * hours + 60_000 * minutes + 1000 * seconds + milliseconds) \
+            .astype('timedelta64[ms]')
+        return result
+
+    @classmethod
+    def is_valid_array(cls, values: np.ndarray) -> np.ndarray:
+        """
+        Return boolean array which is true for each value that is
+        in ISO hhmmssfff format.
+        """
+
+        hours, minutes, seconds, milliseconds = cls.__to_fields_array_lenient(np.asarray(values, dtype=np.int64))
+        return (0 <= hours) & (hours <= 23) & (0 <= minutes) & (minutes <= 59) & \
+            (0 <= seconds) & (seconds <= 59) & (0 <= milliseconds) & (milliseconds <= 999)
+
+    @classmethod
+    def validate_array(cls, values: np.ndarray) -> None:
+        """
+        Raise exception for the first value in the array which is
+        not in ISO hhmmssfff format.
+        """
+
+        values = np.asarray(values, dtype=np.int64)
+        invalid_indices = np.flatnonzero(~cls.is_valid_array(values))
+        if len(invalid_indices) > 0:
+            index = invalid_indices[0]
+            raise Exception(f'LocalTime {values[index]} at index {index} is not in hhmmssfff format. '
+                            f'The hour should be in 0 to 23 range, the minute and the second '
+                            f'in 0 to 59 range, and the millisecond in 0 to 999 range.')
+
     @classmethod
     def __to_fields_lenient(cls, value: int) -> Tuple[int, int, int, int]:
         """
@@ -224,3 +341,18 @@ class LocalTime(int, ABC):
             value.tzinfo
         )
         return result
+
+    @classmethod
+    def __to_fields_array_lenient(cls, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert array of LocalTime stored as int in ISO hhmmssfff format to
+        the tuple of arrays (hours, minutes, seconds, milliseconds), without
+        modifying the argument.
+
+        This method does not perform validation of its argument.
+        """
+
+        hours, values = np.divmod(values, 10_000_000)
+        minutes, values = np.divmod(values, 100_000)
+        seconds, milliseconds = np.divmod(values, 1_000)
+        return hours, minutes, seconds, milliseconds
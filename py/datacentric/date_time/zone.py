@@ -14,7 +14,9 @@
 
 import attr
 import datetime as dt
+import numpy as np
 import pytz
+from typing import Dict, Tuple
 
 from datacentric.attributes.configurable_attribute import configurable
 from datacentric.storage.record import Record
@@ -42,6 +44,9 @@ class Zone(Record):
     timezone database precisely. The IANA city timezone code
     has two slash-delimited tokens, the first referencing the
     country and the other the city, for example America/New_York.
+
+    The tzinfo objects and UTC offset transition tables of each
+    timezone are cached for the lifetime of the process.
     """
 
     zone_name: str = attr.ib(default=None, kw_only=True)
@@ -65,6 +70,12 @@ class Zone(Record):
     country and the other the city, for example America/New_York.
     """
 
+    __tzinfo_dict = dict()
+    """Cached tzinfo objects by zone name."""
+
+    __transitions_dict = dict()
+    """Cached UTC transition times and UTC offsets by zone name."""
+
     def to_key(self) -> str:
         """Get Zone key."""
         return 'Zone=' + self.zone_name
@@ -85,4 +96,86 @@ class Zone(Record):
     def get_tzinfo_from_key(cls, key: str) -> dt.tzinfo:
         """Get tzinfo object by parsing key, without loading the zone record."""
         zone_name: str = cls.get_zone_name_from_key(key)
-        return pytz.timezone(zone_name)
+        return cls.__get_tzinfo(zone_name)
+
+    @classmethod
+    def to_local_array(cls, key: str, instants: np.ndarray) -> np.ndarray:
+        """
+        Convert array of Instant represented as NumPy datetime64 in UTC to
+        array of datetime64[ms] in the timezone specified by the key,
+        without loading the zone record.
+
+        The UTC offset of each element is found by binary search in the
+        transition table of the timezone, with the same result as
+        conversion of each element with astimezone(...).
+        """
+
+        utc_millis: np.ndarray = cls.__to_millis(instants)
+        transitions, offsets = cls.__get_transitions(cls.get_zone_name_from_key(key))
+        offset_indices: np.ndarray = np.searchsorted(transitions, utc_millis, side='right') - 1
+        return (utc_millis + offsets[offset_indices]).astype('datetime64[ms]')
+
+    @classmethod
+    def to_utc_array(cls, key: str, local_datetimes: np.ndarray) -> np.ndarray:
+        """
+        Convert array of NumPy datetime64 in the timezone specified by the
+        key to array of Instant represented as datetime64[ms] in UTC,
+        without loading the zone record.
+
+        The result is the same as for conversion of each element with
+        localize(...) followed by astimezone(...). Local time that occurs
+        twice when clocks are moved back, or does not occur when clocks
+        are moved forward, is converted using the UTC offset without
+        daylight saving time.
+        """
+
+        local_millis: np.ndarray = cls.__to_millis(local_datetimes)
+        transitions, offsets = cls.__get_transitions(cls.get_zone_name_from_key(key))
+
+        # Local time at which each UTC offset takes effect. Among the offsets
+        # for local time that occurs twice, this selects the later offset
+        offset_indices: np.ndarray = np.searchsorted(transitions + offsets, local_millis, side='right') - 1
+        return (local_millis - offsets[offset_indices]).astype('datetime64[ms]')
+
+    @classmethod
+    def __get_tzinfo(cls, zone_name: str) -> dt.tzinfo:
+        """Get tzinfo object for the zone name from the process-wide cache."""
+        result: dt.tzinfo = Zone.__tzinfo_dict.get(zone_name)
+        if result is None:
+            result = pytz.timezone(zone_name)
+            Zone.__tzinfo_dict[zone_name] = result
+        return result
+
+    @classmethod
+    def __get_transitions(cls, zone_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the tuple of arrays (transitions, offsets) for the zone name
+        from the process-wide cache, where transitions are the ascending
+        UTC times in milliseconds since Unix epoch from which each UTC
+        offset in milliseconds applies.
+        """
+        result: Tuple[np.ndarray, np.ndarray] = Zone.__transitions_dict.get(zone_name)
+        if result is None:
+            tzinfo: dt.tzinfo = cls.__get_tzinfo(zone_name)
+            utc_transition_times = getattr(tzinfo, '_utc_transition_times', None)
+            if utc_transition_times is not None:
+                # Timezone with daylight saving time or historical changes of UTC offset
+                transitions = np.array(utc_transition_times, dtype='datetime64[ms]').astype(np.int64)
+                offsets = np.array([x[0] // dt.timedelta(milliseconds=1) for x in tzinfo._transition_info],
+                                   dtype=np.int64)
+            else:
+                # Timezone with constant UTC offset
+                transitions = np.array([np.iinfo(np.int64).min], dtype=np.int64)
+                offsets = np.array([tzinfo.utcoffset(dt.datetime(1970, 1, 1)) // dt.timedelta(milliseconds=1)],
+                                   dtype=np.int64)
+            result = (transitions, offsets)
+            Zone.__transitions_dict[zone_name] = result
+        return result
+
+    @classmethod
+    def __to_millis(cls, values: np.ndarray) -> np.ndarray:
+        """Convert array of NumPy datetime64 to milliseconds since Unix epoch."""
+        values = np.asarray(values)
+        if values.dtype.kind != 'M':
+            raise Exception(f'Array of {values.dtype} passed to Zone is not an array of datetime64.')
+        return values.astype('datetime64[ms]').astype(np.int64)
@@ -12,33 +12,75 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import gzip
+import time
+import queue
+import shutil
+import threading
+from typing import List, Optional, Tuple
 from datacentric.file_system.text_writer import TextWriter
 
 
 class FileWriter(TextWriter):
     """
     Implements TextWriter for writing to a file.
+
+    If max_bytes or max_age_seconds is specified, the file is rotated
+    when rotate_if_due() is called after the limit has been reached.
+    Rotation renames the file to path.N, where N is one greater than
+    the index of the previous archive, and opens a new file at path.
+    Unless compress is False, archives are then compressed to path.N.gz
+    by a background thread, so that writing is not delayed. If
+    retention_count is specified, only this number of the most recent
+    archives is kept.
     """
 
-    __slots__ = ('__file',)
+    __slots__ = ('__file', '__path', '__buffering', '__max_bytes', '__max_age_seconds', '__retention_count',
+                 '__compress', '__written_bytes', '__opened_at', '__next_archive_index',
+                 '__archive_queue', '__archive_thread')
 
     # __file: - TODO - specify type
+    __path: str
+    __buffering: int
+    __max_bytes: Optional[int]
+    __max_age_seconds: Optional[float]
+    __retention_count: Optional[int]
+    __compress: bool
+    __written_bytes: int
+    __opened_at: float
+    __next_archive_index: Optional[int]
+    __archive_queue: Optional[queue.Queue]
+    __archive_thread: Optional[threading.Thread]
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, *, buffering: int = -1, max_bytes: int = None, max_age_seconds: float = None,
+                 retention_count: int = None, compress: bool = True):
         """
         Open the specified file for writing.
 
-        The argument is full path to the file.
+        The argument is full path to the file. Buffering has the same
+        meaning as in the built-in open(...). Size of the file for
+        max_bytes is measured in characters written.
         """
 
-        # Open in mode that overwrites the context
-        self.__file = open(file=path, mode="w")
+        self.__path = path
+        self.__buffering = buffering
+        self.__max_bytes = max_bytes
+        self.__max_age_seconds = max_age_seconds
+        self.__retention_count = retention_count
+        self.__compress = compress
+        self.__next_archive_index = None
+        self.__archive_queue = None
+        self.__archive_thread = None
+        self.__open()
 
     def write(self, value: object) -> None:
         """
         Write __str__ of the argument to the output stream.
         """
-        print(value, end='', file=self.__file)
+        text = str(value)
+        self.__file.write(text)
+        self.__written_bytes += len(text)
 
     def write_line(self, value: object) -> None:
         """
@@ -51,7 +93,8 @@ class FileWriter(TextWriter):
         """
         Write EOL to the output stream.
         """
-        print(file=self.__file)
+        self.__file.write('\n')
+        self.__written_bytes += 1
 
     def flush(self) -> None:
         """
@@ -59,8 +102,105 @@ class FileWriter(TextWriter):
         """
         self.__file.flush()
 
+    def rotate_if_due(self) -> None:
+        """
+        Rotate the file if max_bytes or max_age_seconds has been reached.
+
+        This method should be called at a point where splitting
+        the output between files is acceptable, for example
+        after each log entry. An empty file is not rotated.
+        """
+        if self.__written_bytes == 0:
+            return
+        if self.__max_bytes is not None and self.__written_bytes >= self.__max_bytes or \
+                self.__max_age_seconds is not None and \
+                time.monotonic() - self.__opened_at >= self.__max_age_seconds:
+            self.rotate()
+
+    def rotate(self) -> None:
+        """
+        Close the file, rename it to the next archive path and open
+        a new file. The archive is compressed by a background thread.
+        """
+        self.__file.close()
+
+        # Continue numbering from the archives left by previous runs
+        if self.__next_archive_index is None:
+            archive_indices = [index for index, name in self.__list_archives()]
+            self.__next_archive_index = max(archive_indices) + 1 if archive_indices else 1
+        archive_path = f'{self.__path}.{self.__next_archive_index}'
+        self.__next_archive_index += 1
+        os.replace(self.__path, archive_path)
+        self.__open()
+
+        if self.__compress:
+            if self.__archive_thread is None:
+                self.__archive_queue = queue.Queue()
+                self.__archive_thread = threading.Thread(target=self.__run_archive,
+                                                         name=f'FileWriter {self.__path}', daemon=True)
+                self.__archive_thread.start()
+            self.__archive_queue.put(archive_path)
+        else:
+            self.__apply_retention()
+
+    def close(self) -> None:
+        """
+        Close the file and wait until the archives are compressed.
+        """
+        self.__file.close()
+        if self.__archive_thread is not None:
+            self.__archive_queue.put(None)
+            self.__archive_thread.join()
+            self.__archive_thread = None
+
     def __del__(self):
         """
         Close the file.
         """
         self.__file.close()
+
+    def __open(self) -> None:
+        """Open the file in mode that overwrites the content and reset rotation counters."""
+        self.__file = open(file=self.__path, mode="w", buffering=self.__buffering)
+        self.__written_bytes = 0
+        self.__opened_at = time.monotonic()
+
+    def __list_archives(self) -> List[Tuple[int, str]]:
+        """Return (index, file name) for each archive of the file, in ascending order of index."""
+        folder, base_name = os.path.split(os.path.abspath(self.__path))
+        prefix = base_name + '.'
+        result = []
+        for name in os.listdir(folder):
+            if name.startswith(prefix):
+                suffix = name[len(prefix):]
+                if suffix.endswith('.gz'):
+                    suffix = suffix[:-len('.gz')]
+                if suffix.isdigit():
+                    result.append((int(suffix), os.path.join(folder, name)))
+        result.sort()
+        return result
+
+    def __apply_retention(self) -> None:
+        """Delete archives other than the retention_count most recent ones."""
+        if self.__retention_count is not None:
+            archives = self.__list_archives()
+            for index, archive_path in archives[:max(len(archives) - self.__retention_count, 0)]:
+                try:
+                    os.remove(archive_path)
+                except OSError:
+                    pass
+
+    def __run_archive(self) -> None:
+        """Compress archives passed through the queue until None is received."""
+        while True:
+            archive_path = self.__archive_queue.get()
+            if archive_path is None:
+                return
+            try:
+                with open(archive_path, 'rb') as source, gzip.open(archive_path + '.gz', 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                os.remove(archive_path)
+            except OSError:
+                # Keep the uncompressed archive if it cannot be compressed
+                pass
+            self.__apply_retention()
@@ -37,11 +37,18 @@ class StringWriter(TextWriter):
         """
         return self.__str_io.getvalue()
 
+    def clear(self) -> None:
+        """
+        Discard accumulated output, so that the buffer can be reused.
+        """
+        self.__str_io.seek(0)
+        self.__str_io.truncate()
+
     def write(self, value: object) -> None:
         """
         Write __str__ of the argument to the output stream.
         """
-        print(value, end='', file=self.__str_io)
+        self.__str_io.write(str(value))
 
     def write_line(self, value: object) -> None:
         """
@@ -54,7 +61,7 @@ class StringWriter(TextWriter):
         """
         Write EOL to the output stream.
         """
-        print(file=self.__str_io)
+        self.__str_io.write('\n')
 
     def flush(self) -> None:
         """
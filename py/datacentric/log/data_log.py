@@ -12,8 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+import atexit
+import threading
 import attr
+from typing import List, Optional, Tuple
 from datacentric.log.log import Log
+from datacentric.log.log_entry import LogEntry
+from datacentric.storage.context import Context
+from datacentric.storage.class_info import ClassInfo
 
 
 @attr.s(slots=True, auto_attribs=True)
@@ -26,6 +33,201 @@ class DataLog(Log):
     To obtain the entire log, run a query for the Log element
     of the LogEntry record, then sort the entry records by
     their TemporalId.
+
+    Published entries are assigned the log key, dataset and
+    ObjectId in the order of publishing, and queued in memory.
+    A background thread writes queued entries to the data source
+    in chunks of up to max_batch_size when their number reaches
+    max_batch_size, when the oldest queued entry has waited for
+    max_delay_seconds, and when flush() or close() is called,
+    so that publishing never waits for the data source.
+    """
+
+    max_batch_size: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """
+    Queued entries are written when their number reaches this value,
+    which is also the maximum number of entries written in one call
+    to the data source. Defaults to 1000 if not set.
+    """
+
+    max_delay_seconds: float = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """
+    Queued entries are written when the oldest of them has waited
+    for this number of seconds. Defaults to 1 second if not set.
     """
 
-    pass
+    __condition: threading.Condition = attr.ib(default=None, init=False)
+    """Lock and notification for the fields below, shared with the background thread."""
+
+    __pending: List[LogEntry] = attr.ib(default=None, init=False)
+    """Entries that are queued but not yet passed to the data source."""
+
+    __pending_since: Optional[float] = attr.ib(default=None, init=False)
+    """Value of time.monotonic() when the oldest queued entry was published."""
+
+    __published_count: int = attr.ib(default=0, init=False)
+    """Number of entries published to this log."""
+
+    __processed_count: int = attr.ib(default=0, init=False)
+    """Number of published entries that were written or could not be written."""
+
+    __flush_count: int = attr.ib(default=0, init=False)
+    """Entries up to this number are written without waiting for size or time threshold."""
+
+    __errors: List[Tuple[LogEntry, str]] = attr.ib(default=None, init=False)
+    """Entries that could not be written since the last flush, together with error message."""
+
+    __thread: Optional[threading.Thread] = attr.ib(default=None, init=False)
+    """Background thread that writes entries, started when the first entry is published."""
+
+    __closed: bool = attr.ib(default=False, init=False)
+    """True after close() is called."""
+
+    def init(self, context: Context) -> None:
+        """
+        Set Context property and perform validation of the record's data,
+        then initialize any fields or properties that depend on that data.
+
+        This method may be called multiple times for the same instance,
+        possibly with a different context parameter for each subsequent call.
+
+        IMPORTANT - Every override of this method must call base.Init()
+        first, and only then execute the rest of the override method's code.
+        """
+
+        # Initialize base
+        super().init(context)
+
+        if self.max_batch_size is None:
+            self.max_batch_size = 1000
+        if self.max_delay_seconds is None:
+            self.max_delay_seconds = 1.0
+        if self.max_batch_size < 1:
+            raise Exception(f'DataLog max_batch_size={self.max_batch_size} must be positive.')
+
+        # Keep the queue if init is called again
+        if self.__condition is None:
+            self.__condition = threading.Condition()
+            self.__pending = []
+            self.__errors = []
+
+    def flush(self) -> None:
+        """
+        Wait until all entries published before this call are written
+        to the data source. Error message if any of the entries published
+        since the previous flush could not be written.
+        """
+        if not self.__closed:
+            self._publish_span_summary()
+        with self.__condition:
+            self.__flush_count = self.__published_count
+            self.__condition.notify_all()
+            while self.__processed_count < self.__flush_count:
+                self.__condition.wait()
+            errors = self.__errors
+            self.__errors = []
+
+        if errors:
+            log_entry, message = errors[0]
+            raise Exception(f'{len(errors)} log entries could not be written by DataLog {self.log_name}. '
+                            f'First error for entry {log_entry.title}: {message}')
+
+    def close(self) -> None:
+        """
+        Write all published entries to the data source and stop the
+        background thread. Entries cannot be published after this call.
+        """
+        if not self.__closed:
+            self._publish_span_summary()
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+            thread = self.__thread
+        if thread is not None:
+            thread.join()
+            atexit.unregister(self.close)
+        self.flush()
+
+    def publish_entry(self, log_entry: LogEntry) -> None:
+        """
+        Publish the specified entry to the log if log verbosity
+        is the same or high as entry verbosity.
+
+        When log entry data is passed to this method, only the following
+        elements are required:
+
+        * Verbosity
+        * Title (should not have line breaks; if found will be replaced by spaces)
+        * Description (line breaks and formatting will be preserved)
+
+        This method assigns the log key, ObjectId and dataset of the
+        entry and queues it to be written by the background thread.
+        """
+
+        # Do not record the log entry if entry verbosity exceeds log verbosity
+        if log_entry.verbosity > self.verbosity:
+            return
+
+        data_source = self.context.data_source
+        save_to = self.data_set if self.data_set is not None else self.context.data_set
+        with self.__condition:
+            if self.__closed:
+                raise Exception(f'Entry {log_entry.title} is published to DataLog {self.log_name} after close().')
+
+            # ObjectIds are assigned under the lock, so that they are in the order of the queue
+            log_entry.log = self.to_key()
+            log_entry.id_ = data_source.create_ordered_object_id()
+            log_entry.data_set = save_to
+            log_entry.init(self.context)
+
+            if not self.__pending:
+                self.__pending_since = time.monotonic()
+            self.__pending.append(log_entry)
+            self.__published_count += 1
+
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name=f'DataLog {self.log_name}', daemon=True)
+                self.__thread.start()
+                # Write the remaining entries before the interpreter exits
+                atexit.register(self.close)
+            elif len(self.__pending) >= self.max_batch_size:
+                self.__condition.notify_all()
+
+    def __run(self) -> None:
+        """Write queued entries to the data source until the log is closed."""
+        root_type = ClassInfo.get_ultimate_base(LogEntry)
+        while True:
+            with self.__condition:
+                while not self.__is_write_due():
+                    if self.__closed and not self.__pending:
+                        return
+                    timeout = self.__pending_since + self.max_delay_seconds - time.monotonic() \
+                        if self.__pending else None
+                    self.__condition.wait(timeout)
+                entries = self.__pending
+                self.__pending = []
+                self.__pending_since = None
+
+            # Write without holding the lock, so that publishing does not wait
+            errors = []
+            data_source = self.context.data_source
+            for chunk_start in range(0, len(entries), self.max_batch_size):
+                chunk = entries[chunk_start:chunk_start + self.max_batch_size]
+                try:
+                    chunk_errors = data_source.insert_records(root_type, chunk)
+                except Exception as e:
+                    chunk_errors = {index: str(e) for index in range(len(chunk))}
+                errors.extend((chunk[index], message) for index, message in sorted(chunk_errors.items()))
+
+            with self.__condition:
+                self.__processed_count += len(entries)
+                self.__errors.extend(errors)
+                self.__condition.notify_all()
+
+    def __is_write_due(self) -> bool:
+        """Return true if queued entries should be written now, called under the lock."""
+        if not self.__pending:
+            return False
+        return len(self.__pending) >= self.max_batch_size or self.__closed or \
+            self.__flush_count > self.__processed_count or \
+            time.monotonic() - self.__pending_since >= self.max_delay_seconds
@@ -15,16 +15,33 @@
 import attr
 from datacentric.file_system.file_writer import FileWriter
 from datacentric.log.text_log import TextLog
+from datacentric.log.log_entry import LogEntry
 from datacentric.storage.context import Context
 
 
 @attr.s(slots=True, auto_attribs=True)
 class FileLog(TextLog):
-    """Writes log output to the specified text file as it arrives."""
+    """
+    Writes log output to the specified text file as it arrives.
+
+    If max_file_bytes or max_file_age_seconds is specified, the file
+    is rotated after the entry for which the limit is reached, and
+    the previous file is compressed in the background as described
+    in FileWriter.
+    """
 
     log_file_path: str = attr.ib(default=None, kw_only=True)
     """Log file path relative to output folder root."""
 
+    max_file_bytes: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Rotate the file when its size in characters reaches this value, no size limit if not set."""
+
+    max_file_age_seconds: float = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Rotate the file when it has been open for this number of seconds, no age limit if not set."""
+
+    retention_count: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Number of rotated files to keep, all are kept if not set."""
+
     def init(self, context: Context) -> None:
         """
         Set Context property and perform validation of the record's data,
@@ -41,4 +58,20 @@ class FileLog(TextLog):
         super().init(context)
 
         # Assign text writer for the log file
-        self._text_writer = FileWriter(self.log_file_path)
+        self._text_writer = FileWriter(self.log_file_path, max_bytes=self.max_file_bytes,
+                                       max_age_seconds=self.max_file_age_seconds,
+                                       retention_count=self.retention_count)
+
+    def close(self) -> None:
+        """Close the file and wait until rotated files are compressed."""
+        self._publish_span_summary()
+        self._text_writer.close()
+
+    def publish_entry(self, log_entry: LogEntry) -> None:
+        """
+        Publish the specified entry to the log if log verbosity
+        is the same or high as entry verbosity, then rotate
+        the file if a rotation limit has been reached.
+        """
+        super().publish_entry(log_entry)
+        self._text_writer.rotate_if_due()
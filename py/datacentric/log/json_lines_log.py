@@ -0,0 +1,130 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import time
+import attr
+import threading
+from datacentric.date_time.instant import Instant
+from datacentric.file_system.file_writer import FileWriter
+from datacentric.log.log import Log
+from datacentric.log.log_entry import LogEntry
+from datacentric.log.json_lines_log_reader import JsonLinesLogReader
+from datacentric.storage.context import Context
+
+
+@attr.s(slots=True, auto_attribs=True)
+class JsonLinesLog(Log):
+    """
+    Writes log output to the specified file as one compact JSON
+    object per line, with the elements in the following order:
+
+    * Time (Instant in ISO format, never less than the time of the previous entry)
+    * Verbosity (name of LogVerbosity item)
+    * Title
+    * Description (if specified)
+    * Id (ObjectId of the entry, if assigned)
+
+    Example:
+
+    {"Time":"2003-05-01T10:15:30.500Z","Verbosity":"Info","Title":"Sample Title"}
+
+    Use JsonLinesLogReader to find entries by time and verbosity.
+    """
+
+    log_file_path: str = attr.ib(default=None, kw_only=True)
+    """Log file path relative to output folder root."""
+
+    __file_writer: FileWriter = attr.ib(default=None, init=False)
+    """Writer for the log file."""
+
+    __lock: threading.Lock = attr.ib(default=None, init=False)
+    """Lock that keeps the lines in the order of time when entries are published from several threads."""
+
+    __last_unix_millis: int = attr.ib(default=0, init=False)
+    """Time of the previous entry in milliseconds since Unix epoch."""
+
+    def init(self, context: Context) -> None:
+        """
+        Set Context property and perform validation of the record's data,
+        then initialize any fields or properties that depend on that data.
+
+        This method may be called multiple times for the same instance,
+        possibly with a different context parameter for each subsequent call.
+
+        IMPORTANT - Every override of this method must call base.Init()
+        first, and only then execute the rest of the override method's code.
+        """
+
+        # Initialize base
+        super().init(context)
+
+        # Keep the file open if init is called again
+        if self.__file_writer is None:
+            # The log file is overwritten, remove the index for its previous content
+            index_file_path = self.log_file_path + JsonLinesLogReader.index_file_suffix
+            if os.path.exists(index_file_path):
+                os.remove(index_file_path)
+
+            self.__file_writer = FileWriter(self.log_file_path)
+            self.__lock = threading.Lock()
+            self.__last_unix_millis = 0
+
+    def flush(self) -> None:
+        """Flush data to permanent storage."""
+        self._publish_span_summary()
+        self.__file_writer.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._publish_span_summary()
+        self.__file_writer.close()
+
+    def publish_entry(self, log_entry: LogEntry) -> None:
+        """
+        Publish the specified entry to the log if log verbosity
+        is the same or high as entry verbosity.
+
+        When log entry data is passed to this method, only the following
+        elements are required:
+
+        * Verbosity
+        * Title
+        * Description
+
+        ObjectId of the entry is written if assigned.
+        """
+
+        # Do not record the log entry if entry verbosity exceeds log verbosity
+        if log_entry.verbosity > self.verbosity:
+            return
+
+        with self.__lock:
+
+            # Time does not decrease even if the system clock is set back,
+            # so that the reader can search the file by time
+            unix_millis = max(time.time_ns() // 1_000_000, self.__last_unix_millis)
+            self.__last_unix_millis = unix_millis
+
+            dict_ = {'Time': Instant.to_str(Instant.from_unix_millis(unix_millis)),
+                     'Verbosity': log_entry.verbosity.name,
+                     'Title': log_entry.title}
+            if log_entry.description is not None:
+                dict_['Description'] = log_entry.description
+            if log_entry.id_ is not None:
+                dict_['Id'] = str(log_entry.id_)
+
+            # ASCII output, so that positions in the file do not depend on encoding
+            self.__file_writer.write_line(json.dumps(dict_, separators=(',', ':')))
@@ -0,0 +1,193 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import itertools
+import mmap
+import struct
+import numpy as np
+import datetime as dt
+from typing import Any, Dict, Iterable, List, Tuple
+from datacentric.date_time.instant import Instant
+from datacentric.log.log_verbosity import LogVerbosity
+
+
+class JsonLinesLogReader:
+    """
+    Reads the file written by JsonLinesLog using a sidecar index,
+    so that entries for a time window or verbosity can be found
+    without parsing the whole file.
+
+    The index file (log file path followed by .idx) consists of
+    a header with the number of bytes of the log file covered by
+    the index and the number of entries, followed by one fixed
+    width entry per line with the time, position and verbosity
+    of the entry.
+
+    The index is created when the reader is opened, or extended
+    to cover the lines appended to the log file since it was last
+    updated. Because JsonLinesLog writes entries in the order of
+    time, entries for a time window are found by binary search.
+    """
+
+    __slots__ = ('__data_file', '__data', '__index', '__size')
+
+    index_file_suffix: str = '.idx'
+    """Suffix added to log file path to obtain index file path."""
+
+    magic: bytes = b'DCJLOG01'
+    """Signature at the start of index file, includes format version."""
+
+    header_format: struct.Struct = struct.Struct('<8sQQ')
+    """Index file header: magic, number of bytes of the log file covered by the index, and number of entries."""
+
+    entry_dtype: np.dtype = np.dtype([('time', '<i8'), ('position', '<u8'), ('verbosity', 'u1')])
+    """Index entry: milliseconds since Unix epoch, position of the line, and verbosity."""
+
+    __time_prefix: bytes = b'{"Time":"'
+    __verbosity_prefix: bytes = b'","Verbosity":"'
+    __chunk_size: int = 100_000
+
+    def __init__(self, log_file_path: str):
+        """Update the index for the specified log file and memory-map the log file."""
+
+        self.__size, count = self.__update_index(log_file_path)
+        with open(log_file_path + JsonLinesLogReader.index_file_suffix, 'rb') as index_file:
+            index_file.seek(JsonLinesLogReader.header_format.size)
+            self.__index = np.fromfile(index_file, dtype=JsonLinesLogReader.entry_dtype, count=count)
+
+        # Empty files cannot be memory-mapped
+        self.__data_file = open(log_file_path, 'rb')
+        self.__data = None
+        if self.__size > 0:
+            self.__data = mmap.mmap(self.__data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def count(self) -> int:
+        """Number of entries in the log file."""
+        return len(self.__index)
+
+    def read(self, start: dt.datetime = None, end: dt.datetime = None,
+             verbosity: LogVerbosity = None) -> Iterable[Dict[str, Any]]:
+        """
+        Iterate over decoded entries in the order of time, where
+        start <= Time < end and entry verbosity does not exceed
+        the specified verbosity. Each bound is ignored if None.
+
+        Start and end are Instant values, in UTC with whole milliseconds.
+        """
+        times = self.__index['time']
+        lo = 0 if start is None else int(np.searchsorted(times, Instant.to_unix_millis(start), side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, Instant.to_unix_millis(end), side='left'))
+
+        rows = np.arange(lo, max(lo, hi))
+        if verbosity is not None:
+            rows = rows[self.__index['verbosity'][lo:hi] <= verbosity]
+
+        positions = self.__index['position']
+        for row in rows:
+            position = int(positions[row])
+            end_position = int(positions[row + 1]) if row + 1 < len(positions) else self.__size
+            yield json.loads(self.__data[position:end_position])
+
+    def close(self) -> None:
+        """Release memory map and close the file."""
+        if self.__data is not None:
+            self.__data.close()
+        self.__data_file.close()
+
+    @staticmethod
+    def __update_index(log_file_path: str) -> Tuple[int, int]:
+        """
+        Create the index or extend it to the lines appended to the log file,
+        and return the number of bytes of the log file covered by the index
+        and the number of entries.
+        """
+        index_file_path = log_file_path + JsonLinesLogReader.index_file_suffix
+        header_format = JsonLinesLogReader.header_format
+
+        # Continue from the end of the existing index, unless it is for a longer file
+        size, count = 0, 0
+        if os.path.exists(index_file_path):
+            with open(index_file_path, 'rb') as index_file:
+                header = index_file.read(header_format.size)
+            if len(header) == header_format.size:
+                magic, indexed_size, indexed_count = header_format.unpack(header)
+                if magic == JsonLinesLogReader.magic and indexed_size <= os.path.getsize(log_file_path):
+                    size, count = indexed_size, indexed_count
+        if size == 0:
+            with open(index_file_path, 'wb') as index_file:
+                index_file.write(header_format.pack(JsonLinesLogReader.magic, 0, 0))
+
+        with open(log_file_path, 'rb') as data_file, open(index_file_path, 'r+b') as index_file:
+            data_file.seek(size)
+
+            # Entries after the count in the header are left by an interrupted update
+            index_file.seek(header_format.size + count * JsonLinesLogReader.entry_dtype.itemsize)
+            index_file.truncate()
+
+            # Index complete lines only, the last line may be in the process of being written
+            is_complete = False
+            while not is_complete:
+                time_strings: List[str] = []
+                verbosities: List[int] = []
+                positions: List[int] = []
+                for line in itertools.islice(data_file, JsonLinesLogReader.__chunk_size):
+                    if not line.endswith(b'\n'):
+                        break
+                    time_string, verbosity = JsonLinesLogReader.__parse_line(line)
+                    time_strings.append(time_string)
+                    verbosities.append(verbosity)
+                    positions.append(size)
+                    size += len(line)
+                is_complete = len(positions) < JsonLinesLogReader.__chunk_size
+                if not positions:
+                    break
+
+                times, is_valid = Instant.from_str_array(time_strings)
+                if not np.all(is_valid):
+                    index = np.flatnonzero(~is_valid)[0]
+                    raise Exception(f'Line at position {positions[index]} of {log_file_path} has invalid '
+                                    f'Time {time_strings[index]}.')
+                entries = np.empty(len(positions), dtype=JsonLinesLogReader.entry_dtype)
+                entries['time'] = times.astype(np.int64)
+                entries['position'] = positions
+                entries['verbosity'] = verbosities
+                entries.tofile(index_file)
+                count += len(positions)
+
+                # Header is updated after the entries it covers have been written
+                index_file.seek(0)
+                index_file.write(header_format.pack(JsonLinesLogReader.magic, size, count))
+                index_file.seek(0, os.SEEK_END)
+
+        return size, count
+
+    @staticmethod
+    def __parse_line(line: bytes) -> Tuple[str, int]:
+        """Return time string and verbosity value for the line of log file."""
+
+        # Fast path for the layout written by JsonLinesLog, where Time and Verbosity are the first elements
+        time_prefix = JsonLinesLogReader.__time_prefix
+        verbosity_prefix = JsonLinesLogReader.__verbosity_prefix
+        time_end = len(time_prefix) + 24
+        if line.startswith(time_prefix) and line.startswith(verbosity_prefix, time_end):
+            verbosity_start = time_end + len(verbosity_prefix)
+            verbosity_end = line.find(b'"', verbosity_start)
+            verbosity_name = line[verbosity_start:verbosity_end].decode('ascii')
+            if verbosity_name in LogVerbosity.__members__:
+                return line[len(time_prefix):time_end].decode('ascii'), LogVerbosity[verbosity_name].value
+
+        dict_ = json.loads(line)
+        return dict_['Time'], LogVerbosity[dict_['Verbosity']].value
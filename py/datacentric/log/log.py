@@ -13,11 +13,22 @@
 # limitations under the License.
 
 import attr
+import threading
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Sequence, Union
 from datacentric.log.log_entry import LogEntry
 from datacentric.storage.context import Context
 from datacentric.storage.record import Record
 from datacentric.log.log_verbosity import LogVerbosity
+from datacentric.log.log_span import LogSpan
+from datacentric.log.span_counter import SpanCounter
+from datacentric.log.span_log_entry import SpanLogEntry
+
+LogMessage = Union[str, Callable[[], str]]
+"""
+Title or description of a log entry, either a string or a callable
+that returns the string and is only invoked if the entry is published.
+"""
 
 
 @attr.s(slots=True, auto_attribs=True)
@@ -39,6 +50,15 @@ class Log(Record, ABC):
     verbosity: LogVerbosity = attr.ib(default=None, kw_only=True, metadata={'optional': True})
     """Minimal verbosity for which log entry will be displayed."""
 
+    __span_local: threading.local = attr.ib(default=None, init=False)
+    """Thread local list of active spans for each thread."""
+
+    __span_lock: threading.Lock = attr.ib(default=None, init=False)
+    """Lock for the span summary."""
+
+    __span_summary: Dict[str, SpanLogEntry] = attr.ib(default=None, init=False)
+    """Summary of the spans completed since the last flush, by span path."""
+
     def to_key(self) -> str:
         """Get Log key."""
         return 'Log=' + self.log_name
@@ -69,11 +89,40 @@ class Log(Record, ABC):
         if self.verbosity is None:
             self.verbosity = LogVerbosity.Error
 
+        # Keep active spans and summary if init is called again
+        if self.__span_lock is None:
+            self.__span_local = threading.local()
+            self.__span_lock = threading.Lock()
+            self.__span_summary = {}
+
+    def is_enabled(self, verbosity: LogVerbosity) -> bool:
+        """
+        Return true if an entry with the specified verbosity will be
+        published to the log, which is the case if log verbosity is
+        the same or higher than entry verbosity, or if log verbosity
+        is not specified.
+
+        Use this method to skip the code that prepares log output
+        when it will not be published.
+        """
+        return self.verbosity is None or verbosity <= self.verbosity
+
     @abstractmethod
     def flush(self) -> None:
         """Flush data to permanent storage."""
         pass
 
+    def close(self) -> None:
+        """
+        Write all published entries and release the resources held
+        by the log. This method is called by Context.dispose().
+
+        The default implementation calls flush(). Implementations
+        that use a background thread or other resources should
+        override this method to release them.
+        """
+        self.flush()
+
     @abstractmethod
     def publish_entry(self, log_entry: LogEntry) -> None:
         """
@@ -104,11 +153,18 @@ class Log(Record, ABC):
         """
         pass
 
-    def publish(self, verbosity: LogVerbosity, title: str, description: str = None) -> None:
+    def publish(self, verbosity: LogVerbosity, title: LogMessage, description: LogMessage = None, *,
+                format_args: Sequence[Any] = None) -> None:
         """
         Publish a new entry to the log if log verbosity
         is the same or high as entry verbosity.
 
+        Title and description may be passed as callables returning
+        the string, and format_args if specified are substituted into
+        title and description using str.format. The callables are invoked
+        and the strings formatted only if the entry is published,
+        so that no work is done for the entries that are skipped.
+
         In a text log, the first line of each log entry is Verbosity
         followed by semicolon separator and then Title of the log entry.
         Remaining lines are Description of the log entry recorded with
@@ -121,6 +177,20 @@ class Log(Record, ABC):
             Sample Description Line 2
         """
 
+        # Do not create the log entry if entry verbosity exceeds log verbosity
+        if self.verbosity is not None and verbosity > self.verbosity:
+            return
+
+        # Evaluate lazy title and description
+        if callable(title):
+            title = title()
+        if callable(description):
+            description = description()
+        if format_args:
+            title = title.format(*format_args)
+            if description is not None:
+                description = description.format(*format_args)
+
         # Populate only those fields of of the log entry that are passed to this method.
         # The remaining fields will be populated if the log entry is published to a data
         # source. They are not necessary if the log entry is published to a text log.
@@ -132,7 +202,8 @@ class Log(Record, ABC):
         # Publish the log entry to the log
         self.publish_entry(log_entry)
 
-    def error(self, title: str, description: str = None) -> None:
+    def error(self, title: LogMessage, description: LogMessage = None, *,
+              format_args: Sequence[Any] = None) -> None:
         """
         Publish an error message to the log for any log verbosity.
 
@@ -151,9 +222,10 @@ class Log(Record, ABC):
             Sample Description Line 1
             Sample Description Line 2
         """
-        self.publish(LogVerbosity.Error, title, description)
+        self.publish(LogVerbosity.Error, title, description, format_args=format_args)
 
-    def warning(self, title: str, description: str = None) -> None:
+    def warning(self, title: LogMessage, description: LogMessage = None, *,
+                format_args: Sequence[Any] = None) -> None:
         """
         Publish a warning message to the log if log verbosity
         is at least Warning.
@@ -174,9 +246,10 @@ class Log(Record, ABC):
             Sample Description Line 1
             Sample Description Line 2
         """
-        self.publish(LogVerbosity.Warning, title, description)
+        self.publish(LogVerbosity.Warning, title, description, format_args=format_args)
 
-    def info(self, title: str, description: str = None) -> None:
+    def info(self, title: LogMessage, description: LogMessage = None, *,
+             format_args: Sequence[Any] = None) -> None:
         """
         Publish an info message to the log if log verbosity
         is at least Info.
@@ -196,9 +269,10 @@ class Log(Record, ABC):
             Sample Description Line 1
             Sample Description Line 2
         """
-        self.publish(LogVerbosity.Info, title, description)
+        self.publish(LogVerbosity.Info, title, description, format_args=format_args)
 
-    def verify(self, title: str, description: str = None) -> None:
+    def verify(self, title: LogMessage, description: LogMessage = None, *,
+               format_args: Sequence[Any] = None) -> None:
         """
         Publish a verification message to the log if log verbosity
         is at least Verify.
@@ -214,9 +288,10 @@ class Log(Record, ABC):
             Sample Description Line 1
             Sample Description Line 2
         """
-        self.publish(LogVerbosity.Verify, title, description)
+        self.publish(LogVerbosity.Verify, title, description, format_args=format_args)
 
-    def assert_(self, condition: bool, title: str, description: str = None) -> None:
+    def assert_(self, condition: bool, title: LogMessage, description: LogMessage = None, *,
+                format_args: Sequence[Any] = None) -> None:
         """
         If condition is false, record an error message for any
         verbosity. If condition is true, record a verification
@@ -237,6 +312,83 @@ class Log(Record, ABC):
         # Records a log entry for any verbosity if condition is false,
         # but requires at least Verify verbosity if condition is true
         if condition:
-            self.error(title, description)
+            self.error(title, description, format_args=format_args)
         else:
-            self.verify(title, description)
\ No newline at end of file
+            self.verify(title, description, format_args=format_args)
+
+    def span(self, title: str, verbosity: LogVerbosity = LogVerbosity.Info) -> LogSpan:
+        """
+        Return span that measures wall and CPU time of the code
+        inside a with block, and publishes SpanLogEntry when the
+        block exits if log verbosity is the same or higher than
+        span verbosity.
+
+        Spans can be nested, and counters such as the number of
+        records loaded can be added to the span:
+
+        with context.log.span('Load'):
+            with context.log.span('Query') as span:
+                span.add('Records', len(records))
+
+        In addition to the entry for each span, flush() publishes
+        a summary entry for all spans with the same path completed
+        since the previous flush.
+        """
+
+        # Do not measure if the entries will not be published
+        if self.verbosity is not None and verbosity > self.verbosity:
+            return LogSpan.disabled()
+
+        stack = getattr(self.__span_local, 'stack', None)
+        if stack is None:
+            stack = []
+            self.__span_local.stack = stack
+        return LogSpan(self, title, verbosity, stack)
+
+    def _record_span(self, span_entry: SpanLogEntry) -> None:
+        """
+        Publish the entry for a completed span and add it to the summary.
+        This method is called by LogSpan.
+        """
+        with self.__span_lock:
+            summary = self.__span_summary.get(span_entry.span_path)
+            if summary is None:
+                self.__span_summary[span_entry.span_path] = SpanLogEntry(
+                    verbosity=span_entry.verbosity, span_path=span_entry.span_path, depth=span_entry.depth,
+                    span_count=1, wall_seconds=span_entry.wall_seconds, cpu_seconds=span_entry.cpu_seconds,
+                    counters=[SpanCounter(name=x.name, value=x.value) for x in span_entry.counters or []])
+            else:
+                summary.span_count += 1
+                summary.wall_seconds += span_entry.wall_seconds
+                summary.cpu_seconds += span_entry.cpu_seconds
+                for counter in span_entry.counters or []:
+                    summary_counter = next((x for x in summary.counters if x.name == counter.name), None)
+                    if summary_counter is None:
+                        summary.counters.append(SpanCounter(name=counter.name, value=counter.value))
+                    else:
+                        summary_counter.value += counter.value
+
+        self.publish_entry(span_entry)
+
+    def _publish_span_summary(self) -> None:
+        """
+        Publish summary entry for each span path, in the order of path,
+        for the spans completed since the previous call, then reset
+        the summary. Implementations call this method from flush()
+        and close() before writing their output.
+        """
+        if self.__span_lock is None:
+            return
+        with self.__span_lock:
+            span_summary = self.__span_summary
+            self.__span_summary = {}
+
+        for span_path in sorted(span_summary):
+            summary = span_summary[span_path]
+            summary.title = f'Summary of span {span_path}: {summary.span_count} calls, ' \
+                            f'wall {summary.wall_seconds:.6f}s, CPU {summary.cpu_seconds:.6f}s'
+            if summary.counters:
+                summary.description = '\n'.join(f'{x.name}: {x.value}' for x in summary.counters)
+            else:
+                summary.counters = None
+            self.publish_entry(summary)
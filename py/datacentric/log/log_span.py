@@ -0,0 +1,120 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from typing import Dict, List, Optional, TYPE_CHECKING
+from datacentric.log.log_verbosity import LogVerbosity
+from datacentric.log.span_counter import SpanCounter
+from datacentric.log.span_log_entry import SpanLogEntry
+
+if TYPE_CHECKING:
+    from datacentric.log.log import Log
+
+
+class LogSpan:
+    """
+    Measures wall and CPU time of the code inside a with block,
+    created by Log.span(...).
+
+    Spans entered while another span of the same log is active on
+    the same thread are nested in it. When the with block exits,
+    SpanLogEntry with the measured times and counters is published
+    to the log and added to the summary that the log publishes
+    on flush().
+
+    A span whose verbosity exceeds log verbosity does not measure
+    time and ignores counters.
+    """
+
+    __slots__ = ('__log', '__title', '__verbosity', '__stack', '__path', '__depth', '__counters',
+                 '__wall_start', '__cpu_start')
+
+    __log: Optional['Log']
+    __title: str
+    __verbosity: LogVerbosity
+    __stack: List['LogSpan']
+    __path: str
+    __depth: int
+    __counters: Optional[Dict[str, int]]
+    __wall_start: float
+    __cpu_start: float
+
+    __disabled: Optional['LogSpan'] = None
+
+    def __init__(self, log: Optional['Log'], title: str, verbosity: LogVerbosity, stack: List['LogSpan']):
+        """
+        Create span for the specified log, stack is the list
+        of active spans of the log on the current thread.
+        Use Log.span(...) instead of calling this method directly.
+        """
+        self.__log = log
+        self.__title = title
+        self.__verbosity = verbosity
+        self.__stack = stack
+        self.__counters = None
+
+    @classmethod
+    def disabled(cls) -> 'LogSpan':
+        """Span that does not measure time and ignores counters."""
+        if cls.__disabled is None:
+            cls.__disabled = LogSpan(None, None, None, None)
+        return cls.__disabled
+
+    @property
+    def path(self) -> str:
+        """Titles of this span and the spans it is nested in, separated by slash."""
+        return self.__path
+
+    def add(self, name: str, value: int = 1) -> None:
+        """Add value to the counter with the specified name."""
+        if self.__log is not None:
+            if self.__counters is None:
+                self.__counters = {}
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def __enter__(self):
+        """Start measuring time."""
+        if self.__log is not None:
+            stack = self.__stack
+            self.__path = stack[-1].path + '/' + self.__title if stack else self.__title
+            self.__depth = len(stack)
+            stack.append(self)
+            self.__cpu_start = time.thread_time()
+            self.__wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        """Stop measuring time and publish SpanLogEntry."""
+        if self.__log is not None:
+            wall_seconds = time.perf_counter() - self.__wall_start
+            cpu_seconds = time.thread_time() - self.__cpu_start
+            self.__stack.pop()
+
+            title = f'Span {self.__path}: wall {wall_seconds:.6f}s, CPU {cpu_seconds:.6f}s'
+            if type_ is not None:
+                title += f', raised {type_.__name__}'
+            counters = None
+            description = None
+            if self.__counters is not None:
+                counters = [SpanCounter(name=name, value=counter_value)
+                            for name, counter_value in self.__counters.items()]
+                description = '\n'.join(f'{counter.name}: {counter.value}' for counter in counters)
+
+            span_entry = SpanLogEntry(verbosity=self.__verbosity, title=title, description=description,
+                                      span_path=self.__path, depth=self.__depth, span_count=1,
+                                      wall_seconds=wall_seconds, cpu_seconds=cpu_seconds, counters=counters)
+            self.__log._record_span(span_entry)
+
+        # Return False to propagate exception to the caller
+        return False
@@ -0,0 +1,257 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+import queue
+import threading
+from typing import ClassVar, List, Optional, Union
+from datacentric.file_system.string_writer import StringWriter
+from datacentric.file_system.file_writer import FileWriter
+from datacentric.log.text_log import TextLog
+from datacentric.log.log_entry import LogEntry
+from datacentric.log.queue_full_policy import QueueFullPolicy
+from datacentric.storage.context import Context
+
+
+@attr.s(slots=True, auto_attribs=True)
+class QueueFileLog(TextLog):
+    """
+    Writes log output to the specified text file from a background thread.
+
+    Each published entry is formatted on the caller thread into a reusable
+    string buffer and passed through a bounded queue to the writer thread,
+    which joins all queued entries into a single write to a buffered file.
+    The file is flushed by flush() and close(), and also when no entries
+    are published for one second.
+
+    When the queue is full, the caller either waits or the entry
+    is discarded, depending on queue_full_policy.
+
+    If max_file_bytes or max_file_age_seconds is specified, the writer
+    thread rotates the file between batches of entries as described
+    in FileWriter, so that publishers never wait for rotation.
+    """
+
+    log_file_path: str = attr.ib(default=None, kw_only=True)
+    """Log file path relative to output folder root."""
+
+    max_queue_size: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """
+    Maximum number of entries waiting to be written, which
+    bounds the memory used by the log. Defaults to 10000 if not set.
+    """
+
+    queue_full_policy: QueueFullPolicy = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Determines what happens when the queue is full. Defaults to Block if not set."""
+
+    max_file_bytes: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Rotate the file when its size in characters reaches this value, no size limit if not set."""
+
+    max_file_age_seconds: float = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Rotate the file when it has been open for this number of seconds, no age limit if not set."""
+
+    retention_count: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Number of rotated files to keep, all are kept if not set."""
+
+    __lock: threading.Lock = attr.ib(default=None, init=False)
+    """Lock for the string buffer and the counter of dropped entries."""
+
+    __queue: queue.Queue = attr.ib(default=None, init=False)
+    """
+    Formatted entries, threading.Event for each pending flush,
+    and None after close() is called.
+    """
+
+    __thread: Optional[threading.Thread] = attr.ib(default=None, init=False)
+    """Background thread that writes the file."""
+
+    __dropped_count: int = attr.ib(default=0, init=False)
+    """Number of entries discarded because the queue was full."""
+
+    __error: Optional[str] = attr.ib(default=None, init=False)
+    """Message of the error raised by the writer thread, if any."""
+
+    __closed: bool = attr.ib(default=False, init=False)
+    """True after close() is called."""
+
+    __idle_flush_seconds: ClassVar[float] = 1.0
+    __file_buffer_size: ClassVar[int] = 1 << 16
+
+    @property
+    def dropped_count(self) -> int:
+        """Number of entries discarded because the queue was full."""
+        return self.__dropped_count
+
+    def init(self, context: Context) -> None:
+        """
+        Set Context property and perform validation of the record's data,
+        then initialize any fields or properties that depend on that data.
+
+        This method may be called multiple times for the same instance,
+        possibly with a different context parameter for each subsequent call.
+
+        IMPORTANT - Every override of this method must call base.Init()
+        first, and only then execute the rest of the override method's code.
+        """
+
+        # Initialize base
+        super().init(context)
+
+        if self.max_queue_size is None:
+            self.max_queue_size = 10000
+        if self.queue_full_policy is None:
+            self.queue_full_policy = QueueFullPolicy.Block
+
+        # Open the file and start the writer thread once, keep them if init is called again
+        if self.__thread is None:
+            self._text_writer = StringWriter()
+            self.__lock = threading.Lock()
+            self.__queue = queue.Queue(maxsize=self.max_queue_size)
+            file_writer = FileWriter(self.log_file_path, buffering=self.__file_buffer_size,
+                                     max_bytes=self.max_file_bytes, max_age_seconds=self.max_file_age_seconds,
+                                     retention_count=self.retention_count)
+            self.__thread = threading.Thread(target=self.__run, args=(file_writer,),
+                                             name=f'QueueFileLog {self.log_file_path}', daemon=True)
+            self.__thread.start()
+
+    def flush(self) -> None:
+        """
+        Wait until all entries published before this call are written
+        to the file and flush the file. Error message if the writer
+        thread has failed.
+        """
+        if not self.__closed:
+            self._publish_span_summary()
+            flushed = threading.Event()
+            self.__put(flushed)
+            while not flushed.wait(self.__idle_flush_seconds):
+                if not self.__thread.is_alive():
+                    break
+        if self.__error is not None:
+            raise Exception(f'QueueFileLog could not write to {self.log_file_path}: {self.__error}')
+
+    def close(self) -> None:
+        """
+        Write all published entries, stop the writer thread and close
+        the file. Entries cannot be published after this call.
+        """
+        if not self.__closed:
+            self._publish_span_summary()
+        with self.__lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__put(None)
+        self.__thread.join()
+        self.flush()
+
+    def publish_entry(self, log_entry: LogEntry) -> None:
+        """
+        Publish the specified entry to the log if log verbosity
+        is the same or high as entry verbosity.
+
+        When log entry data is passed to this method, only the following
+        elements are required:
+
+        * Verbosity
+        * Title (should not have line breaks; if found will be replaced by spaces)
+        * Description (line breaks and formatting will be preserved)
+
+        The entry is formatted on the caller thread and written to
+        the file by the writer thread.
+        """
+
+        # Do not record the log entry if entry verbosity exceeds log verbosity
+        if log_entry.verbosity > self.verbosity:
+            return
+
+        with self.__lock:
+            if self.__closed:
+                raise Exception(f'Entry {log_entry.title} is published to QueueFileLog '
+                                f'{self.log_file_path} after close().')
+
+            # Format into the reusable buffer
+            super().publish_entry(log_entry)
+            text = str(self._text_writer)
+            self._text_writer.clear()
+
+            if self.queue_full_policy == QueueFullPolicy.Drop:
+                try:
+                    self.__queue.put_nowait(text)
+                except queue.Full:
+                    self.__dropped_count += 1
+            else:
+                self.__put(text)
+
+    def __put(self, item: Union[str, threading.Event, None]) -> None:
+        """Add item to the queue, waiting while the queue is full unless the writer thread has stopped."""
+        while True:
+            try:
+                self.__queue.put(item, timeout=self.__idle_flush_seconds)
+                return
+            except queue.Full:
+                if not self.__thread.is_alive():
+                    raise Exception(f'QueueFileLog could not write to {self.log_file_path}: {self.__error}')
+
+    def __run(self, file_writer: FileWriter) -> None:
+        """Write queued entries to the file until None is received."""
+        reported_dropped_count = 0
+        is_flushed = True
+        try:
+            while True:
+                try:
+                    item = self.__queue.get(timeout=self.__idle_flush_seconds)
+                except queue.Empty:
+                    # Flush when idle, so that the file is not behind for long
+                    if not is_flushed:
+                        file_writer.flush()
+                        is_flushed = True
+                    file_writer.rotate_if_due()
+                    continue
+
+                # Take everything that is already queued, to write it in one call
+                texts: List[str] = []
+                flush_requests: List[Union[threading.Event, None]] = []
+                while True:
+                    if isinstance(item, str):
+                        texts.append(item)
+                    else:
+                        flush_requests.append(item)
+                    try:
+                        item = self.__queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                dropped_count = self.__dropped_count
+                if dropped_count > reported_dropped_count:
+                    texts.append(f'Warning: {dropped_count - reported_dropped_count} log entries '
+                                 f'were dropped because the queue was full.\n')
+                    reported_dropped_count = dropped_count
+
+                if texts:
+                    file_writer.write(''.join(texts))
+                    is_flushed = False
+                    file_writer.rotate_if_due()
+
+                if flush_requests:
+                    file_writer.flush()
+                    is_flushed = True
+                    for flush_request in flush_requests:
+                        if flush_request is not None:
+                            flush_request.set()
+                    if None in flush_requests:
+                        return
+        except Exception as e:
+            self.__error = str(e)
+        finally:
+            file_writer.close()
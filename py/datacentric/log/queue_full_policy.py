@@ -0,0 +1,39 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import IntEnum
+
+
+class QueueFullPolicy(IntEnum):
+    """
+    Determines what happens when an entry is published to a log
+    whose queue of entries waiting to be written is full.
+    """
+
+    Block = 0,
+    """
+    The caller waits until there is space in the queue.
+
+    This is the default policy, used when policy is not set.
+    No entries are lost, but the caller may be slowed down
+    to the speed at which the entries are written.
+    """
+
+    Drop = 1,
+    """
+    The entry is discarded and the caller continues without waiting.
+
+    The number of discarded entries is reported in the log
+    output once the queue has space again.
+    """
@@ -0,0 +1,50 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+from typing import List
+from datacentric.log.log_entry import LogEntry
+from datacentric.log.span_counter import SpanCounter
+
+
+@attr.s(slots=True, auto_attribs=True)
+class SpanLogEntry(LogEntry):
+    """
+    Log entry for a span created by Log.span(...), or for the
+    summary of all spans with the same path published by flush().
+
+    Title and description of the entry contain the same data
+    in text form, so that it is displayed by any log.
+    """
+
+    span_path: str = attr.ib(default=None, kw_only=True)
+    """
+    Titles of the span and the spans it is nested in,
+    starting from the outermost, separated by slash.
+    """
+
+    depth: int = attr.ib(default=None, kw_only=True)
+    """Number of spans the span is nested in, zero for the outermost span."""
+
+    span_count: int = attr.ib(default=None, kw_only=True)
+    """Number of spans included in the entry, one unless this is a summary."""
+
+    wall_seconds: float = attr.ib(default=None, kw_only=True)
+    """Total elapsed time of the spans in seconds."""
+
+    cpu_seconds: float = attr.ib(default=None, kw_only=True)
+    """Total CPU time of the thread in which the spans ran, in seconds."""
+
+    counters: List[SpanCounter] = attr.ib(default=None, kw_only=True, repr=False, metadata={'optional': True})
+    """Counters added to the spans, summed across spans for a summary."""
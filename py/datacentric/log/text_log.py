@@ -37,6 +37,7 @@ class TextLog(Log, ABC):
 
     def flush(self) -> None:
         """Flush data to permanent storage."""
+        self._publish_span_summary()
         self._text_writer.flush()
 
     def publish_entry(self, log_entry: LogEntry) -> None:
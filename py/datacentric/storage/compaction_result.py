@@ -0,0 +1,35 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+
+
+@attr.s(slots=True, auto_attribs=True)
+class CompactionResult:
+    """Outcome of compacting one collection, returned by VersionCompactor."""
+
+    collection_name: str = attr.ib(default=None, kw_only=True)
+    """Name of the compacted collection."""
+
+    versions_scanned: int = attr.ib(default=0, kw_only=True)
+    """Number of versions older than the retention horizon that were examined."""
+
+    versions_deleted: int = attr.ib(default=0, kw_only=True)
+    """Number of versions permanently deleted."""
+
+    bytes_reclaimed: int = attr.ib(default=0, kw_only=True)
+    """
+    Total serialized size of the deleted versions. The storage space
+    actually released depends on the data store.
+    """
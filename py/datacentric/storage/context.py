@@ -123,8 +123,12 @@ class Context:
         IMPORTANT - Every override of this method must call base.dispose()
         after executing its own code.
         """
-        # TODO - implement
-        pass
+
+        # Write entries that are buffered by the log
+        if self.__log is not None:
+            self.__log.close()
+
+        # TODO - release data source resources
 
     def configure(self, module) -> None:
         """
@@ -13,16 +13,23 @@
 # limitations under the License.
 
 import attr
+import asyncio
+import datetime as dt
 from abc import ABC, abstractmethod
-from typing import Optional, TypeVar, Iterable, List, Type
+from typing import Optional, TypeVar, Iterable, List, Type, Dict, Tuple
 from bson import ObjectId
 
 from datacentric.attributes.pinned_attribute import pinned
 from datacentric.storage.record import Record
 from datacentric.storage.data_set import DataSet
+from datacentric.storage.deleted_record import DeletedRecord
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.change_type import ChangeType
+from datacentric.storage.record_change import RecordChange
 from datacentric.storage.env_type import EnvType
 from datacentric.storage.context import Context
 from datacentric.storage.versioning_method import VersioningMethod
+from datacentric.storage.write_behind_buffer import WriteBehindBuffer
 
 TRecord = TypeVar('TRecord', bound=Record)
 
@@ -92,6 +99,16 @@ class DataSource(Record, ABC):
     Data source may also be readonly because CutoffTime is set.
     """
 
+    # --- CLASS VARIABLES
+
+    __diff_batch_size = 1000
+    """Number of changed keys for which the versions are resolved together by diff(...)."""
+
+    # --- INSTANCE VARIABLES
+
+    __write_behind_buffer: WriteBehindBuffer = attr.ib(default=None, init=False)
+    """Active write-behind buffer, or None if save_one and delete write immediately."""
+
     # --- METHODS
 
     def init(self, context: Context) -> None:
@@ -177,6 +194,21 @@ class DataSource(Record, ABC):
         """
         pass
 
+    def load_many(self, record_type: Type[TRecord], keys: Iterable[str],
+                  load_from: ObjectId) -> List[Optional[TRecord]]:
+        """Lookup of multiple records by string key using the same
+        lookup rules as load_or_null_by_key(...).
+
+        Returns a list with one element for each key in the order of
+        keys, where the element is None if the record is not found or
+        is a DeletedRecord.
+
+        The default implementation calls load_or_null_by_key(...) for
+        each key. Data sources where each lookup is a roundtrip to the
+        server override this method to resolve all keys in one batch.
+        """
+        return [self.load_or_null_by_key(record_type, key_, load_from) for key_ in keys]
+
     @abstractmethod
     def get_query(self, record_type: Type[TRecord], load_from: ObjectId):
         """Get query for the specified type.
@@ -249,6 +281,206 @@ class DataSource(Record, ABC):
         """Save new version of the dataset and update in-memory cache to the saved dataset."""
         pass
 
+    def insert_records(self, record_type: Type[TRecord], records: List[TRecord]) -> Dict[int, str]:
+        """Insert records for which ObjectId and dataset have already been
+        assigned into the collection for record_type, without validation.
+
+        A record that cannot be written does not prevent the remaining
+        records from being written. Returns error message for each
+        record that could not be written by its index in the list,
+        or empty dict if all records were written.
+
+        This method is used by WriteBehindBuffer and should not be called
+        by application code. Data sources that do not override it do not
+        support write-behind.
+        """
+        raise NotImplementedError()
+
+    def load_versions(self, record_type: Type[TRecord], key_: str, load_from: ObjectId,
+                      from_id: ObjectId = None, to_id: ObjectId = None) -> Iterable[Record]:
+        """Iterate over all versions of the record with the specified key
+        in load_from dataset and its imports, in ascending order of ObjectId.
+
+        Only versions where from_id <= ObjectId < to_id are returned,
+        each bound is ignored if None. Versions excluded by CutoffTime
+        and ImportsCutoffTime are not returned. DeletedRecord versions
+        are included.
+
+        Data sources that do not override this method do not
+        support version history.
+        """
+        raise NotImplementedError()
+
+    def get_history(self, record_type: Type[TRecord], key_: str, load_from: ObjectId,
+                    from_time: dt.datetime = None, to_time: dt.datetime = None,
+                    stride: dt.timedelta = None) -> Iterable[Record]:
+        """Iterate over all versions of the record with the specified key
+        in load_from dataset and its imports, in the order they were saved.
+
+        Only versions created at or after from_time and before to_time are
+        returned, each bound is ignored if None. Because ObjectIds have one
+        second resolution, both bounds are rounded down to whole seconds.
+
+        DeletedRecord is returned for each version where the record was
+        deleted, use isinstance(version, DeletedRecord) to detect it.
+
+        If stride is specified, the time range is divided into intervals
+        of this length starting from from_time, or from the first version
+        if from_time is None, and only the last version within each
+        interval is returned.
+        """
+        if stride is not None and stride <= dt.timedelta(0):
+            raise Exception(f'History stride {stride} must be positive.')
+
+        from_id = ObjectId.from_datetime(from_time) if from_time is not None else None
+        to_id = ObjectId.from_datetime(to_time) if to_time is not None else None
+
+        versions = self.load_versions(record_type, key_, load_from, from_id, to_id)
+        if stride is None:
+            return versions
+        else:
+            return DataSource._sample_versions(versions, from_time, stride)
+
+    def get_changed_keys(self, record_type: Type[TRecord], load_from: ObjectId,
+                         from_id: Optional[ObjectId], to_id: ObjectId) -> Iterable[str]:
+        """Iterate in ascending order over distinct keys, without the collection
+        name prefix, that have at least one version where from_id <= ObjectId < to_id
+        in load_from dataset or its imports. The from_id bound is ignored if None.
+
+        Data sources that do not override this method do not support diff(...).
+        """
+        raise NotImplementedError()
+
+    def get_latest_versions(self, record_type: Type[TRecord], key_values: List[str], load_from: ObjectId,
+                            to_id: ObjectId) -> Dict[str, Tuple[ObjectId, bool]]:
+        """For each key without the collection name prefix, return ObjectId of the
+        version selected by the lookup rules among versions where ObjectId < to_id
+        and a flag that is True if this version is DeletedRecord. Keys for which
+        there is no such version are not included.
+
+        Data sources that do not override this method do not support diff(...).
+        """
+        raise NotImplementedError()
+
+    def diff(self, record_type: Type[TRecord], load_from: ObjectId,
+             cutoff_a: Optional[ObjectId], cutoff_b: ObjectId) -> Iterable[RecordChange]:
+        """Iterate in the order of keys over records in load_from dataset and its
+        imports that were added, changed, or deleted between cutoff_a and cutoff_b.
+
+        The cutoff times have the same meaning as CutoffTime of the data source,
+        so the state as of each cutoff time includes the versions where ObjectId
+        is less than the cutoff time. If cutoff_a is None, all records that exist
+        as of cutoff_b are returned as added.
+
+        Only the keys that have versions in the range of ObjectIds between the
+        two cutoff times are examined, so the cost is proportional to the number
+        of changes rather than the size of the collection. The lookup list of
+        load_from dataset as of cutoff_b is used for both cutoff times.
+        """
+        if cutoff_a is not None and cutoff_a >= cutoff_b:
+            raise Exception(f'Diff cutoff_a={cutoff_a} must be less than cutoff_b={cutoff_b}.')
+
+        collection_name = ClassInfo.get_ultimate_base(record_type).__name__
+
+        batch: List[str] = []
+        for key_value in self.get_changed_keys(record_type, load_from, cutoff_a, cutoff_b):
+            batch.append(key_value)
+            if len(batch) == DataSource.__diff_batch_size:
+                yield from self._diff_batch(record_type, collection_name, batch, load_from, cutoff_a, cutoff_b)
+                batch = []
+        if batch:
+            yield from self._diff_batch(record_type, collection_name, batch, load_from, cutoff_a, cutoff_b)
+
+    def get_version_infos(self, record_type: Type[TRecord], to_id: ObjectId, after_key: Optional[str],
+                          max_keys: int) -> List[Tuple[str, ObjectId, ObjectId, int]]:
+        """Return (key, dataset, id, size in bytes) for all versions where
+        ObjectId < to_id, in all datasets, for up to max_keys distinct keys
+        that follow after_key in ascending order of keys, or for the first
+        keys if after_key is None. Keys do not include the collection name
+        prefix. The result is sorted by key, dataset, and id.
+
+        This method is used by VersionCompactor and should not be called
+        by application code. Data sources that do not override it do not
+        support compaction.
+        """
+        raise NotImplementedError()
+
+    def purge_versions(self, record_type: Type[TRecord], ids: List[ObjectId]) -> None:
+        """Permanently delete the record versions with the specified ObjectIds
+        from the collection for record_type without writing DeletedRecord.
+
+        This method is used by VersionCompactor and should not be called
+        by application code. Data sources that do not override it do not
+        support compaction.
+        """
+        raise NotImplementedError()
+
+    def get_max_id(self, record_type: Type[TRecord]) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the collection for record_type
+        across all datasets, or None if the collection is empty.
+
+        Because every save and delete writes a version with a new ObjectId,
+        this value is used as a watermark that changes whenever the data in
+        the collection changes. Data sources that do not override this
+        method do not support QueryCache.
+        """
+        raise NotImplementedError()
+
+    def load_many_by_id(self, record_type: Type[TRecord], ids: Iterable[ObjectId]) -> List[Optional[TRecord]]:
+        """Load records by ObjectId using the same rules as load_or_null(...).
+
+        Returns a list with one element for each ObjectId in the order
+        of ids, where the element is None if the record is not found.
+
+        The default implementation calls load_or_null(...) for each
+        ObjectId. Data sources where each load is a roundtrip to the
+        server override this method to load all records in one batch.
+        """
+        return [self.load_or_null(record_type, id_) for id_ in ids]
+
+    async def aload_or_null_by_key(self, record_type: Type[TRecord], key_: str,
+                                   load_from: ObjectId) -> Optional[TRecord]:
+        """Asynchronous version of load_or_null_by_key(...) for use with asyncio.
+
+        The default implementation calls load_or_null_by_key(...) directly,
+        which is appropriate for in-process data sources that do not wait
+        on network I/O. Data sources with a non-blocking driver override
+        this method so that concurrent lookups share one connection pool.
+        """
+        return self.load_or_null_by_key(record_type, key_, load_from)
+
+    async def aload_many(self, record_type: Type[TRecord], keys: Iterable[str],
+                         load_from: ObjectId) -> List[Optional[TRecord]]:
+        """Asynchronous lookup of multiple records by string key using
+        the same lookup rules as load_or_null_by_key(...).
+
+        Returns a list with one element for each key in the order of
+        keys, where the element is None if the record is not found or
+        is a DeletedRecord.
+
+        The default implementation runs aload_or_null_by_key(...)
+        for each key concurrently.
+        """
+        return list(await asyncio.gather(*[self.aload_or_null_by_key(record_type, key_, load_from)
+                                           for key_ in keys]))
+
+    async def asave_many(self, record_type: Type[TRecord], records: Iterable[TRecord], save_to: ObjectId) -> None:
+        """Asynchronous version of save_many(...) for use with asyncio.
+
+        The default implementation calls save_many(...) directly, see
+        aload_or_null_by_key(...) for details.
+        """
+        self.save_many(record_type, records, save_to)
+
+    async def aclose(self) -> None:
+        """Release resources used by the asynchronous methods in the running
+        event loop. Call before the event loop is closed.
+
+        The default implementation does nothing, which is appropriate
+        for data sources that do not hold resources tied to the loop.
+        """
+        pass
+
     # From extensions:
     def load(self, record_type: Type[TRecord], id_: ObjectId) -> TRecord:
         """Load record by its ObjectId.
@@ -287,8 +519,121 @@ class DataSource(Record, ABC):
 
         This method guarantees that ObjectIds of the saved records will be in
         strictly increasing order.
+
+        If write-behind buffer is active, the record is added to the buffer
+        and written when the buffer is flushed.
+        """
+        if self.__write_behind_buffer is not None:
+            self.__write_behind_buffer.save_one(record_type, record, save_to)
+        else:
+            self.save_many(record_type, [record], save_to)
+
+    @property
+    def write_behind_buffer(self) -> Optional[WriteBehindBuffer]:
+        """Active write-behind buffer, or None if save_one and delete write immediately."""
+        return self.__write_behind_buffer
+
+    def write_behind(self, max_batch_size: int = 1000, max_delay_seconds: float = 1.0) -> WriteBehindBuffer:
+        """Create write-behind buffer for use in a with statement.
+
+        Within the with statement, save_one(...) and delete(...) assign
+        ObjectIds at the time of the call, in strictly increasing order,
+        but records are written in chunks of up to max_batch_size records
+        when the buffer reaches max_batch_size records, on the next call
+        after more than max_delay_seconds since the oldest buffered record,
+        and on exit from the with statement.
+
+        Example:
+
+        with data_source.write_behind(max_batch_size=500):
+            for record in records:
+                data_source.save_one(RecordType, record, data_set)
+        """
+        return WriteBehindBuffer(self, max_batch_size, max_delay_seconds)
+
+    @staticmethod
+    def _sample_versions(versions: Iterable[Record], from_time: Optional[dt.datetime],
+                         stride: dt.timedelta) -> Iterable[Record]:
+        """Yield the last version within each stride interval, streaming in ObjectId order."""
+        # Naive datetime is treated as UTC, the same way as by ObjectId.from_datetime
+        origin = from_time
+        if origin is not None and origin.tzinfo is None:
+            origin = origin.replace(tzinfo=dt.timezone.utc)
+        pending: Optional[Record] = None
+        pending_interval: Optional[int] = None
+        for version in versions:
+            created_time = version.id_.generation_time
+            if origin is None:
+                origin = created_time
+            interval = (created_time - origin) // stride
+            if pending is not None and interval != pending_interval:
+                yield pending
+            pending = version
+            pending_interval = interval
+        if pending is not None:
+            yield pending
+
+    def _diff_batch(self, record_type: type, collection_name: str, key_values: List[str], load_from: ObjectId,
+                    cutoff_a: Optional[ObjectId], cutoff_b: ObjectId) -> Iterable[RecordChange]:
+        """Compare versions selected by the lookup rules at the two cutoff times for a batch of keys."""
+        if cutoff_a is not None:
+            previous_versions = self.get_latest_versions(record_type, key_values, load_from, cutoff_a)
+        else:
+            previous_versions = dict()
+        current_versions = self.get_latest_versions(record_type, key_values, load_from, cutoff_b)
+
+        for key_value in key_values:
+            previous_id, previous_deleted = previous_versions.get(key_value, (None, True))
+            current_id, current_deleted = current_versions.get(key_value, (None, True))
+
+            if previous_deleted and current_deleted:
+                continue
+            elif previous_deleted:
+                change_type = ChangeType.Added
+            elif current_deleted:
+                change_type = ChangeType.Deleted
+            elif previous_id != current_id:
+                change_type = ChangeType.Changed
+            else:
+                continue
+
+            yield RecordChange(key=collection_name + '=' + key_value, change_type=change_type,
+                               previous_id=previous_id, current_id=current_id)
+
+    def _init_version(self, version: Record, record_type: type, key_: str) -> Record:
+        """Check and initialize version returned by load_versions(...)."""
+        if not isinstance(version, DeletedRecord):
+            if not isinstance(version, record_type):
+                raise Exception(f'Stored type {type(version).__name__} for Key={key_} with '
+                                f'ObjectId={version.id_} is not an instance of '
+                                f'the requested type {record_type.__name__}.')
+            version.init(self.context)
+        return version
+
+    def _set_write_behind_buffer(self, buffer: Optional[WriteBehindBuffer]) -> None:
+        """Activate or deactivate write-behind buffer, called by the buffer."""
+        if buffer is not None and self.__write_behind_buffer is not None:
+            raise Exception(f'Write-behind buffer is already active for data source {self.data_source_name}.')
+        self.__write_behind_buffer = buffer
+
+    def _check_not_readonly(self):
+        """Error message if ReadOnly flag is set for the data source.
+
+        Override in data sources that have additional conditions
+        under which writing is not permitted.
         """
-        self.save_many(record_type, [record], save_to)
+        if self.read_only:
+            raise Exception(f'Attempting write operation for data source {self.data_source_name} '
+                            f'where ReadOnly flag is set.')
+
+    def _check_process_shareable(self):
+        """Error message if an equivalent data source cannot be created
+        in another process from the values of its fields.
+
+        Override in data sources that keep their data in the memory
+        of the current process.
+        """
+        pass
 
     def get_data_set(self, data_set_name: str) -> ObjectId:
         """Get ObjectId of the dataset with the specified name.
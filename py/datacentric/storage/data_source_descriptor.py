@@ -0,0 +1,73 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+from typing import Dict, Any, Optional
+from bson import ObjectId
+from datacentric.storage.context import Context
+from datacentric.storage.data_source import DataSource
+from datacentric.log.console_log import ConsoleLog
+
+
+class DataSourceDescriptor:
+    """
+    Picklable description of a data source, used to create an equivalent
+    data source and context in another process.
+
+    The descriptor holds the type of the data source and the values of its
+    fields, such as environment, server and CutoffTime, but not the client
+    connections or caches, which are created again in the other process.
+    """
+
+    __slots__ = ('__data_source_type', '__field_values')
+
+    __data_source_type: type
+    __field_values: Dict[str, Any]
+
+    def __init__(self, data_source: DataSource):
+        """
+        Create descriptor from the data source. Error message if the data
+        source cannot be accessed from other processes, for example because
+        it keeps its data in the memory of the current process.
+        """
+        data_source._check_process_shareable()
+
+        self.__data_source_type = type(data_source)
+        """Type of the data source."""
+
+        self.__field_values = {field.name: getattr(data_source, field.name)
+                               for field in attr.fields(type(data_source)) if field.init}
+        """Values of the data source fields that are passed to the constructor."""
+
+    @property
+    def data_source_type(self) -> type:
+        """Type of the data source."""
+        return self.__data_source_type
+
+    def create_data_source(self) -> DataSource:
+        """Create data source from the descriptor, it must be initialized with a context before use."""
+        return self.__data_source_type(**self.__field_values)
+
+    def create_context(self, data_set: Optional[ObjectId] = None) -> Context:
+        """
+        Create context with console log and the data source created from
+        the descriptor. The data_set property of the context is set if
+        data_set is specified.
+        """
+        context = Context()
+        context.log = ConsoleLog()
+        context.data_source = self.create_data_source()
+        if data_set is not None:
+            context.data_set = data_set
+        return context
@@ -0,0 +1,145 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+from typing import Dict, Any, List, Tuple, Iterable, Optional
+from bson import ObjectId
+
+
+class MemoryCollection:
+    """
+    In-process collection of serialized records used by the
+    temporal memory data source.
+
+    Documents are stored in the same dictionary format that is
+    written to MongoDB by the serializer. In addition to the
+    primary index by ObjectId, the collection maintains a key
+    index where each key maps to the list of its versions as
+    (dataset, id) tuples sorted in ascending order. The lookup
+    order of the temporal data source is obtained by iterating
+    this list in reverse. The ObjectId index is kept as a sorted
+    list to select documents in a range of ObjectIds.
+    """
+
+    __slots__ = ('__name', '__documents', '__key_index', '__id_index')
+
+    __name: str
+    __documents: Dict[ObjectId, Dict[str, Any]]
+    __key_index: Dict[str, List[Tuple[ObjectId, ObjectId]]]
+    __id_index: List[ObjectId]
+
+    def __init__(self, name: str):
+        """Create empty collection with the specified name."""
+
+        self.__name = name
+        """Collection name."""
+
+        self.__documents = dict()
+        """Serialized documents by ObjectId, in the order of insertion."""
+
+        self.__key_index = dict()
+        """Versions of each key as (dataset, id) tuples in ascending order."""
+
+        self.__id_index = []
+        """ObjectIds of all documents in ascending order."""
+
+    @property
+    def name(self) -> str:
+        """Collection name."""
+        return self.__name
+
+    def insert_many(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """
+        Insert serialized documents into the collection and
+        update the key index.
+
+        Each document must have _id, _dataset, and _key elements.
+        """
+        for document in documents:
+            id_: ObjectId = document['_id']
+            if id_ in self.__documents:
+                raise Exception(f'Document with ObjectId={id_} already exists in collection {self.__name}.')
+            self.__documents[id_] = document
+
+            versions = self.__key_index.get(document['_key'])
+            if versions is None:
+                self.__key_index[document['_key']] = [(document['_dataset'], id_)]
+            else:
+                bisect.insort(versions, (document['_dataset'], id_))
+
+            # ObjectIds are usually inserted in increasing order
+            if not self.__id_index or self.__id_index[-1] < id_:
+                self.__id_index.append(id_)
+            else:
+                bisect.insort(self.__id_index, id_)
+
+    def find_one(self, id_: ObjectId) -> Optional[Dict[str, Any]]:
+        """Return serialized document for the specified ObjectId, or None if not found."""
+        return self.__documents.get(id_)
+
+    def find_versions(self, key_value: str) -> List[Tuple[ObjectId, ObjectId]]:
+        """
+        Return (dataset, id) tuples for all versions of the specified
+        key, sorted in ascending order. Key value must not include
+        the collection name prefix.
+
+        The returned list must not be modified by the caller.
+        """
+        return self.__key_index.get(key_value, [])
+
+    def find_range(self, from_id: Optional[ObjectId], to_id: Optional[ObjectId]) -> Iterable[Dict[str, Any]]:
+        """
+        Iterate over serialized documents where from_id <= ObjectId < to_id
+        in ascending order of ObjectId, each bound is ignored if None.
+        """
+        start = bisect.bisect_left(self.__id_index, from_id) if from_id is not None else 0
+        end = bisect.bisect_left(self.__id_index, to_id) if to_id is not None else len(self.__id_index)
+        for id_ in self.__id_index[start:end]:
+            yield self.__documents[id_]
+
+    def find_max_id(self) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the collection, or None if the collection is empty."""
+        return self.__id_index[-1] if self.__id_index else None
+
+    def find_keys(self) -> Iterable[str]:
+        """Iterate over distinct keys in the collection in arbitrary order."""
+        return self.__key_index.keys()
+
+    def find_all(self) -> Iterable[Dict[str, Any]]:
+        """Iterate over all serialized documents in the order of insertion."""
+        return self.__documents.values()
+
+    def delete_many(self, ids: Iterable[ObjectId]) -> None:
+        """Permanently remove documents with the specified ObjectIds, ignoring ObjectIds that are not found."""
+        for id_ in ids:
+            document = self.__documents.pop(id_, None)
+            if document is None:
+                continue
+
+            versions = self.__key_index[document['_key']]
+            versions.remove((document['_dataset'], id_))
+            if not versions:
+                del self.__key_index[document['_key']]
+
+            del self.__id_index[bisect.bisect_left(self.__id_index, id_)]
+
+    def count(self) -> int:
+        """Number of documents in the collection, including all versions."""
+        return len(self.__documents)
+
+    def clear(self) -> None:
+        """Remove all documents from the collection."""
+        self.__documents.clear()
+        self.__key_index.clear()
+        self.__id_index.clear()
@@ -0,0 +1,533 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+import bson
+import copy
+from typing import Dict, Optional, TypeVar, Set, Iterable, Type, List, Tuple
+from bson import ObjectId
+from datacentric.storage.record import Record
+from datacentric.storage.deleted_record import DeletedRecord
+from datacentric.storage.data_set import DataSet
+from datacentric.storage.data_source import DataSource
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.memory.memory_collection import MemoryCollection
+from datacentric.storage.memory.temporal_memory_query import TemporalMemoryQuery
+from datacentric.serialization.serializer import serialize, deserialize
+from datacentric.storage.temporal_id import empty_id
+from datacentric.storage.versioning_method import VersioningMethod
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+@attr.s(slots=True, auto_attribs=True)
+class TemporalMemoryDataSource(DataSource):
+    """
+    Temporal data source with datasets based on in-process memory.
+
+    This data source follows the same temporal and dataset lookup rules
+    as TemporalMongoDataSource, but keeps serialized records in memory
+    with an index where each key maps to the list of its versions sorted
+    by dataset and record ObjectIds. It is intended for use in tests and
+    as a local cache tier; the data does not persist after the data
+    source instance is released.
+
+    The term Temporal applied means the data source stores complete revision
+    history including copies of all previous versions of each record.
+
+    In addition to being temporal, this data source is also hierarchical; the
+    records are looked up across a hierarchy of datasets, including the dataset
+    itself, its direct Imports, Imports of Imports, etc., ordered by dataset's
+    TemporalId.
+    """
+
+    cutoff_time: ObjectId = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """
+    Records with TemporalId that is greater than or equal to CutoffTime
+    will be ignored by load methods and queries, and the latest available
+    record where TemporalId is less than CutoffTime will be returned instead.
+
+    CutoffTime applies to both the records stored in the dataset itself,
+    and the reports loaded through the Imports list.
+    """
+
+    __collection_dict: Dict[str, MemoryCollection] = attr.ib(factory=dict, init=False)
+    __data_set_dict: Dict[str, ObjectId] = attr.ib(factory=dict, init=False)
+    __import_dict: Dict[ObjectId, Set[ObjectId]] = attr.ib(factory=dict, init=False)
+    __imports_cutoff_dict: Dict[ObjectId, Optional[ObjectId]] = attr.ib(factory=dict, init=False)
+
+    __prev_object_id: ObjectId = attr.ib(default=empty_id, init=False)
+    """
+    Previous ObjectId generated by this instance of the data source.
+
+    This variable is used to ensure generation of ObjectIds in
+    strictly increasing order.
+    """
+
+    def create_ordered_object_id(self) -> ObjectId:
+        """The returned ObjectIds have the following order guarantees:
+
+        * For this data source instance, to arbitrary resolution; and
+        * Across all processes and machines, to one second resolution
+        """
+        result = ObjectId()
+        while result <= self.__prev_object_id:
+            result = ObjectId()
+
+        self.__prev_object_id = result
+        return result
+
+    def load_or_null(self, record_type: Type[TRecord], id_: ObjectId) -> Optional[TRecord]:
+        """Load record by its ObjectId.
+
+        Return None if if argument ObjectId is greater than
+        or equal to CutoffTime.
+        """
+        if self.cutoff_time is not None:
+            if id_ >= self.cutoff_time:
+                return None
+
+        collection = self._get_or_create_collection(record_type)
+        document = collection.find_one(id_)
+        if document is not None:
+            result: TRecord = deserialize(copy.deepcopy(document))
+
+            if result is not None and not isinstance(result, DeletedRecord):
+
+                is_requested_instance = isinstance(result, record_type)
+                if not is_requested_instance:
+                    raise Exception(f'Stored type {type(result).__name__} for ObjectId={id_} and '
+                                    f'Key={result.to_key()} is not an instance of the requested type '
+                                    f'{record_type.__name__}.')
+                result.init(self.context)
+                return result
+        return None
+
+    def load_or_null_by_key(self, type_: Type[TRecord], key_: str, load_from: ObjectId) -> Optional[TRecord]:
+        """Load record by string key from the specified dataset or
+        its list of imports. The lookup occurs first in descending
+        order of dataset ObjectIds, and then in the descending
+        order of record ObjectIds within the first dataset that
+        has at least one record. Both dataset and record ObjectIds
+        are ordered chronologically to one second resolution,
+        and are unique within the database server or cluster.
+
+        The root dataset has empty ObjectId value that is less
+        than any other ObjectId value. Accordingly, the root
+        dataset is the last one in the lookup order of datasets.
+
+        The first record in this lookup order is returned, or null
+        if no records are found or if DeletedRecord is the first
+        record.
+
+        Return None if there is no record for the specified ObjectId;
+        however an exception will be thrown if the record exists but
+        is not derived from TRecord.
+        """
+        collection_name, key_value = key_.split('=', 1)
+
+        collection = self._get_or_create_collection(type_)
+        latest_id = self.get_latest_id(collection, key_value, load_from)
+        if latest_id is not None:
+            result: TRecord = deserialize(copy.deepcopy(collection.find_one(latest_id)))
+
+            if result is not None and not isinstance(result, DeletedRecord):
+
+                is_proper_record = isinstance(result, type_)
+                if not is_proper_record:
+                    raise Exception(f'Stored type {type(result).__name__} for Key={key_} in '
+                                    f'data_set={load_from} is not an instance of '
+                                    f'the requested type {type_.__name__}.')
+                result.init(self.context)
+                return result
+        return None
+
+    def get_query(self, record_type: Type[TRecord], load_from: ObjectId) -> TemporalMemoryQuery:
+        """Get query for the specified type.
+
+        After applying query parameters, the lookup occurs first in
+        descending order of dataset ObjectIds, and then in the descending
+        order of record ObjectIds within the first dataset that
+        has at least one record. Both dataset and record ObjectIds
+        are ordered chronologically to one second resolution,
+        and are unique within the database server or cluster.
+
+        The root dataset has empty ObjectId value that is less
+        than any other ObjectId value. Accordingly, the root
+        dataset is the last one in the lookup order of datasets.
+        """
+        collection = self._get_or_create_collection(record_type)
+        return TemporalMemoryQuery(record_type, self, collection, load_from)
+
+    def save_many(self, record_type: Type[TRecord], records: Iterable[TRecord], save_to: ObjectId):
+        """Save multiple records to the specified dataset. After the method exits,
+        for each record the property record.data_set will be set to the value of
+        the save_to parameter.
+
+        All save methods ignore the value of record.data_set before the
+        save method is called. When dataset is not specified explicitly,
+        the value of dataset from the context, not from the record, is used.
+        The reason for this behavior is that the record may be stored from
+        a different dataset than the one where it is used.
+
+        This method guarantees that ObjectIds of the saved records will be in
+        strictly increasing order.
+        """
+        self._check_not_readonly()
+
+        collection = self._get_or_create_collection(record_type)
+        if records is None:
+            return None
+
+        # Records are iterated twice, convert to list in case a generator is passed
+        records = list(records)
+        for record in records:
+            record_id = self.create_ordered_object_id()
+            if record_id <= save_to:
+                raise Exception(f'TemporalId={record_id} of a record must be greater than '
+                                f'TemporalId={save_to} of the dataset where it is being saved.')
+            record.id_ = record_id
+            record.data_set = save_to
+            record.init(self.context)
+
+        versioning_method = self.get_versioning_method(record_type)
+        if versioning_method in [VersioningMethod.Temporal, VersioningMethod.NonTemporal,
+                                 VersioningMethod.NonOverriding]:
+            collection.insert_many([serialize(x) for x in records])
+        else:
+            raise Exception(f'Unknown versioning method {versioning_method}.')
+
+    def delete(self, record_type: Type[TRecord], key: str, delete_in: ObjectId) -> None:
+        """Write a DeletedRecord in delete_in dataset for the specified key
+        instead of actually deleting the record. This ensures that
+        a record in another dataset does not become visible during
+        lookup in a sequence of datasets.
+
+        The delete marker is written even when the record does not exist.
+        """
+        self._check_not_readonly()
+
+        if self.write_behind_buffer is not None:
+            self.write_behind_buffer.delete(record_type, key, delete_in)
+            return
+
+        record = DeletedRecord()
+        record.key = key
+
+        record.id_ = self.create_ordered_object_id()
+        record.data_set = delete_in
+
+        collection = self._get_or_create_collection(record_type)
+
+        collection.insert_many([serialize(record)])
+
+    def insert_records(self, record_type: Type[TRecord], records: List[TRecord]) -> Dict[int, str]:
+        """Insert records for which ObjectId and dataset have already been
+        assigned into the collection for record_type, without validation.
+
+        Returns error message for each record that could not be written
+        by its index in the list.
+        """
+        errors: Dict[int, str] = dict()
+        collection = self._get_or_create_collection(record_type)
+        for index, record in enumerate(records):
+            try:
+                collection.insert_many([serialize(record)])
+            except Exception as e:
+                errors[index] = str(e)
+        return errors
+
+    def delete_db(self) -> None:
+        """Permanently deletes all records held by this data source
+        without the possibility to recover them later.
+
+        ATTENTION - THIS METHOD WILL DELETE ALL DATA WITHOUT
+        THE POSSIBILITY OF RECOVERY. USE WITH CAUTION.
+        """
+        if self.read_only is not None and self.read_only:
+            raise Exception(f'Attempting to drop (delete) database for the data source {self.data_source_name} '
+                            f'where ReadOnly flag is set.')
+
+        self.__collection_dict.clear()
+        self.__data_set_dict.clear()
+        self.__import_dict.clear()
+        self.__imports_cutoff_dict.clear()
+
+    def get_latest_id(self, collection: MemoryCollection, key_value: str, load_from: ObjectId,
+                      to_id: ObjectId = None) -> Optional[ObjectId]:
+        """Return ObjectId of the first version of the key in the lookup order
+        of load_from dataset and its imports, or None if not found. Key value
+        must not include the collection name prefix.
+
+        If to_id is specified, only versions where ObjectId < to_id are
+        considered. The returned ObjectId may belong to a DeletedRecord.
+        """
+        data_set_lookup_list = self.get_data_set_lookup_list(load_from)
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+
+        # Versions are sorted by dataset and then record ObjectIds in
+        # ascending order, iterate in reverse to get the lookup order
+        for data_set, record_id in reversed(collection.find_versions(key_value)):
+            if to_id is not None and record_id >= to_id:
+                continue
+            if self._is_visible(data_set, record_id, load_from, data_set_lookup_list, imports_cutoff):
+                return record_id
+        return None
+
+    def load_versions(self, record_type: Type[TRecord], key_: str, load_from: ObjectId,
+                      from_id: ObjectId = None, to_id: ObjectId = None) -> Iterable[Record]:
+        """Iterate over all versions of the record with the specified key
+        in load_from dataset and its imports, in ascending order of ObjectId.
+
+        Only versions where from_id <= ObjectId < to_id are returned,
+        each bound is ignored if None. Versions excluded by CutoffTime
+        and ImportsCutoffTime are not returned. DeletedRecord versions
+        are included.
+        """
+        collection_name, key_value = key_.split('=', 1)
+
+        collection = self._get_or_create_collection(record_type)
+        data_set_lookup_list = self.get_data_set_lookup_list(load_from)
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+
+        version_ids = sorted(record_id for data_set, record_id in collection.find_versions(key_value)
+                             if (from_id is None or record_id >= from_id) and (to_id is None or record_id < to_id)
+                             and self._is_visible(data_set, record_id, load_from, data_set_lookup_list, imports_cutoff))
+        for record_id in version_ids:
+            version: Record = deserialize(copy.deepcopy(collection.find_one(record_id)))
+            yield self._init_version(version, record_type, key_)
+
+    def get_changed_keys(self, record_type: Type[TRecord], load_from: ObjectId,
+                         from_id: Optional[ObjectId], to_id: ObjectId) -> Iterable[str]:
+        """Iterate in ascending order over distinct keys, without the collection
+        name prefix, that have at least one version where from_id <= ObjectId < to_id
+        in load_from dataset or its imports. The from_id bound is ignored if None.
+        """
+        collection = self._get_or_create_collection(record_type)
+        data_set_lookup_list = self.get_data_set_lookup_list(load_from)
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+
+        return sorted(set(document['_key'] for document in collection.find_range(from_id, to_id)
+                          if self._is_visible(document['_dataset'], document['_id'], load_from,
+                                              data_set_lookup_list, imports_cutoff)))
+
+    def get_latest_versions(self, record_type: Type[TRecord], key_values: List[str], load_from: ObjectId,
+                            to_id: ObjectId) -> Dict[str, Tuple[ObjectId, bool]]:
+        """For each key without the collection name prefix, return ObjectId of the
+        version selected by the lookup rules among versions where ObjectId < to_id
+        and a flag that is True if this version is DeletedRecord. Keys for which
+        there is no such version are not included.
+        """
+        collection = self._get_or_create_collection(record_type)
+
+        result: Dict[str, Tuple[ObjectId, bool]] = dict()
+        for key_value in key_values:
+            latest_id = self.get_latest_id(collection, key_value, load_from, to_id)
+            if latest_id is not None:
+                is_deleted = collection.find_one(latest_id)['_t'][-1] == DeletedRecord.__name__
+                result[key_value] = (latest_id, is_deleted)
+        return result
+
+    def get_version_infos(self, record_type: Type[TRecord], to_id: ObjectId, after_key: Optional[str],
+                          max_keys: int) -> List[Tuple[str, ObjectId, ObjectId, int]]:
+        """Return (key, dataset, id, size in bytes) for all versions where
+        ObjectId < to_id, in all datasets, for up to max_keys distinct keys
+        that follow after_key in ascending order of keys, or for the first
+        keys if after_key is None. Keys do not include the collection name
+        prefix. The result is sorted by key, dataset, and id.
+
+        The size of each version is the size of its BSON representation.
+        """
+        collection = self._get_or_create_collection(record_type)
+
+        result: List[Tuple[str, ObjectId, ObjectId, int]] = []
+        key_count = 0
+        for key_value in sorted(collection.find_keys()):
+            if after_key is not None and key_value <= after_key:
+                continue
+            versions = [(data_set, record_id) for data_set, record_id in collection.find_versions(key_value)
+                        if record_id < to_id]
+            if versions:
+                result.extend((key_value, data_set, record_id, len(bson.encode(collection.find_one(record_id))))
+                              for data_set, record_id in versions)
+                key_count += 1
+                if key_count == max_keys:
+                    break
+        return result
+
+    def purge_versions(self, record_type: Type[TRecord], ids: List[ObjectId]) -> None:
+        """Permanently delete the record versions with the specified ObjectIds
+        from the collection for record_type without writing DeletedRecord.
+        """
+        self._check_not_readonly()
+        collection = self._get_or_create_collection(record_type)
+        collection.delete_many(ids)
+
+    def get_max_id(self, record_type: Type[TRecord]) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the collection for record_type
+        across all datasets, or None if the collection is empty."""
+        return self._get_or_create_collection(record_type).find_max_id()
+
+    def get_data_set_or_none(self, data_set_name: str) -> Optional[ObjectId]:
+        """Get ObjectId of the dataset with the specified name.
+        Returns null if not found.
+        """
+        if data_set_name in self.__data_set_dict:
+            return self.__data_set_dict[data_set_name]
+
+        data_set_record = self.load_or_null_by_key(DataSet, DataSet.create_key(data_set_name=data_set_name), empty_id)
+
+        if data_set_record is None:
+            return None
+
+        self.__data_set_dict[data_set_name] = data_set_record.id_
+
+        if data_set_record.id_ not in self.__import_dict:
+            import_set = self._build_data_set_lookup_list(data_set_record)
+            self.__import_dict[data_set_record.id_] = import_set
+
+        return data_set_record.id_
+
+    def save_data_set(self, data_set: DataSet) -> None:
+        """Save new version of the dataset and update in-memory cache to the saved dataset."""
+        self.save_one(DataSet, data_set, empty_id)
+        self.__data_set_dict[data_set.data_set_name] = data_set.id_
+
+        lookup_set = self._build_data_set_lookup_list(data_set)
+        self.__import_dict[data_set.id_] = lookup_set
+
+    def get_data_set_lookup_list(self, load_from: ObjectId) -> Iterable[ObjectId]:
+        """Returns enumeration of import datasets for specified dataset data,
+        including imports of imports to unlimited depth with cyclic
+        references and duplicates removed.
+        """
+        if load_from == empty_id:
+            return [empty_id]
+
+        if load_from in self.__import_dict:
+            return self.__import_dict[load_from]
+
+        else:
+            data_set_data: DataSet = self.load_or_null(DataSet, load_from)
+            if data_set_data is None:
+                raise Exception(f'Dataset with ObjectId={load_from} is not found.')
+            if data_set_data.data_set != empty_id:
+                raise Exception(f'Dataset with ObjectId={load_from} is not stored in root dataset.')
+            result = self._build_data_set_lookup_list(data_set_data)
+            self.__import_dict[load_from] = result
+            return result
+
+    def get_versioning_method(self, record_type: Type[TRecord]) -> VersioningMethod:
+        """Gets the method of record or dataset versioning.
+
+        Versioning method is a required field for the data source. Its
+        value can be overridden for specific record types via an attribute.
+        """
+        if hasattr(record_type, 'versioning_method'):
+            return getattr(record_type, 'versioning_method')
+
+        return self.versioning_method
+
+    def get_imports_cutoff_time(self, data_set_id: ObjectId) -> Optional[ObjectId]:
+        """Gets ImportsCutoffTime from the dataset detail record.
+        Returns None if dataset detail record is not found.
+
+        Imported records (records loaded through the imports list)
+        where ObjectId is greater than or equal to cutoff_time
+        will be ignored by load methods and queries, and the latest
+        available record where ObjectId is less than cutoff_time will
+        be returned instead.
+
+        This setting only affects records loaded through the imports
+        list. It does not affect records stored in the dataset itself.
+        """
+        if data_set_id == empty_id:
+            return None
+
+        # Each version of the dataset has its own ObjectId,
+        # so the cached value never becomes stale
+        if data_set_id not in self.__imports_cutoff_dict:
+            data_set_data: DataSet = self.load_or_null(DataSet, data_set_id)
+            imports_cutoff = data_set_data.imports_cutoff_time if data_set_data is not None else None
+            self.__imports_cutoff_dict[data_set_id] = imports_cutoff
+
+        return self.__imports_cutoff_dict[data_set_id]
+
+    def _is_visible(self, data_set: ObjectId, record_id: ObjectId, load_from: ObjectId,
+                    data_set_lookup_list: Iterable[ObjectId], imports_cutoff: Optional[ObjectId]) -> bool:
+        """True if the version is not excluded by dataset lookup list, CutoffTime or ImportsCutoffTime."""
+        if data_set not in data_set_lookup_list:
+            return False
+        if self.cutoff_time is not None and record_id >= self.cutoff_time:
+            return False
+        if imports_cutoff is not None and data_set != load_from and record_id >= imports_cutoff:
+            return False
+        return True
+
+    def _get_or_create_collection(self, type_: type) -> MemoryCollection:
+        root_type = ClassInfo.get_ultimate_base(type_)
+        collection_name = root_type.__name__
+        collection = self.__collection_dict.get(collection_name)
+        if collection is None:
+            collection = MemoryCollection(collection_name)
+            self.__collection_dict[collection_name] = collection
+        return collection
+
+    def _build_data_set_lookup_list(self, data_set_record: DataSet) -> Set[ObjectId]:
+        result: Set[ObjectId] = set()
+
+        self._fill_data_set_lookup_set(data_set_record, result)
+
+        return result
+
+    def _fill_data_set_lookup_set(self, data_set_record: DataSet, result: Set[ObjectId]) -> None:
+        if data_set_record is None:
+            return
+
+        if not ObjectId.is_valid(data_set_record.id_):
+            raise Exception('Required ObjectId value is not set.')
+        if data_set_record.data_set_name == '':
+            raise Exception('Required string value is not set.')
+
+        if self.cutoff_time is not None and data_set_record.id_ >= self.cutoff_time:
+            return
+
+        result.add(data_set_record.id_)
+
+        if data_set_record.imports is not None:
+            for data_set_id in data_set_record.imports:
+                if data_set_record.id_ == data_set_id:
+                    raise Exception(f'Dataset {data_set_record.to_key()} with ObjectId={data_set_record.id_} '
+                                    f'includes itself in the list of its imports.')
+                if data_set_id not in result:
+                    result.add(data_set_id)
+                    cached_import_list = self.get_data_set_lookup_list(data_set_id)
+                    for import_id in cached_import_list:
+                        result.add(import_id)
+
+    def _check_not_readonly(self):
+        """Error message if either ReadOnly flag or CutoffTime is set
+        for the data source."""
+        if self.read_only:
+            raise Exception(f'Attempting write operation for data source {self.data_source_name} '
+                            f'where ReadOnly flag is set.')
+
+        if self.cutoff_time is not None:
+            raise Exception(f'Attempting write operation for data source {self.data_source_name} where '
+                            f'CutoffTime is set. Historical view of the data cannot be written to.')
+
+    def _check_process_shareable(self):
+        """Error message because the data is held in the memory of the current process."""
+        raise Exception(f'Data source {self.data_source_name} keeps its data in the memory of the current '
+                        f'process and cannot be accessed from other processes.')
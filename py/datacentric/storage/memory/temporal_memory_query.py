@@ -0,0 +1,241 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import re
+import copy
+import datetime as dt
+from typing import Iterable, AsyncIterator, Dict, Any, List, TypeVar, Optional, TYPE_CHECKING
+from bson import ObjectId
+
+from datacentric.storage.record import Record
+from datacentric.storage.mongo.temporal_mongo_query import TemporalMongoQuery
+from datacentric.serialization.serializer import deserialize
+
+if TYPE_CHECKING:
+    from datacentric.storage.memory.memory_collection import MemoryCollection
+    from datacentric.storage.memory.temporal_memory_data_source import TemporalMemoryDataSource
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+class TemporalMemoryQuery(TemporalMongoQuery):
+    """Implements query methods for temporal memory data source.
+
+    This class shares the query builder of TemporalMongoQuery, including
+    the conversion of where(...) predicates and sort_by(...) attributes
+    to MongoDB aggregation stages. Instead of sending the pipeline to the
+    server, the $match and $sort stages are evaluated against serialized
+    documents held in memory, and only the version of each record selected
+    by the dataset lookup rules is returned.
+    """
+
+    def __init__(self, record_type: type, data_source: TemporalMemoryDataSource, collection: MemoryCollection,
+                 load_from: ObjectId):
+        super().__init__(record_type, data_source, collection, load_from)
+
+    def _get_records(self) -> Iterable[TRecord]:
+        """Evaluates the pipeline on in-memory collection and returns its result as Iterable."""
+        predicates = [stage['$match'] for stage in self._pipeline if '$match' in stage]
+        if self._resume_after is not None:
+            predicates.append(self._get_resume_predicate('_id'))
+        sort_spec = next((stage['$sort'] for stage in self._pipeline if '$sort' in stage), None)
+
+        selected: List[Dict[str, Any]] = []
+        for document in self._select_documents():
+            if not self._is_in_key_partition(document['_key']) or not self._is_in_id_range(document['_id']):
+                continue
+            if not all(_match_document(document, predicate) for predicate in predicates):
+                continue
+
+            if sort_spec is None:
+                # Stream in the order of selection when sort is not specified
+                yield self._to_record(document)
+            else:
+                selected.append(document)
+
+        if sort_spec is not None:
+            # Python sort is stable, so sorting by each attribute in reverse
+            # order of precedence produces sort by all of them, followed by
+            # ObjectId which is the order of selection
+            for field_name, direction in reversed(list(sort_spec.items())):
+                selected.sort(key=lambda x: _sort_key(_resolve_path(x, field_name)), reverse=direction < 0)
+            for document in selected:
+                yield self._to_record(document)
+
+    def _get_split_points(self, partition_count: int) -> List[ObjectId]:
+        """Return up to partition_count - 1 ascending ObjectIds that split
+        the versions matching the query into ranges of similar size,
+        sampled from ObjectIds of the versions selected by the query."""
+        predicates = [stage['$match'] for stage in self._pipeline if '$match' in stage]
+        ids = sorted(document['_id'] for document in self._select_documents()
+                     if self._is_in_key_partition(document['_key']) and self._is_in_id_range(document['_id'])
+                     and all(_match_document(document, predicate) for predicate in predicates))
+
+        # Single unbounded partition when the query has no records
+        if len(ids) == 0:
+            return []
+
+        # Remove repeated split points when there are fewer ids than partitions
+        split_points = set(ids[len(ids) * x // partition_count] for x in range(1, partition_count))
+        return sorted(x for x in split_points if x > ids[0])
+
+    async def as_async_iterable(self) -> AsyncIterator[TRecord]:
+        """Returns the result of as_iterable() as async iterator.
+
+        In-memory evaluation does not wait on I/O, so the records are
+        produced without suspending the coroutine.
+        """
+        for record in self.as_iterable():
+            yield record
+
+    def _select_documents(self) -> Iterable[Dict[str, Any]]:
+        """
+        Iterate over serialized documents for the version of each key
+        selected by the dataset lookup rules, before applying the query
+        predicates, in the order of ObjectIds.
+        """
+
+        # Cache the ObjectId of the version selected by lookup rules for each key,
+        # so that earlier versions of the same key are rejected without a lookup
+        latest_id_dict: Dict[str, Optional[ObjectId]] = dict()
+
+        for document in self._collection.find_range(None, None):
+            key_value = document['_key']
+            if key_value not in latest_id_dict:
+                latest_id_dict[key_value] = self._data_source.get_latest_id(
+                    self._collection, key_value, self._load_from)
+            if latest_id_dict[key_value] == document['_id']:
+                yield document
+
+    def _to_record(self, document: Dict[str, Any]) -> TRecord:
+        """Deserialize a copy of the stored document, leaving the stored document intact."""
+        result: TRecord = deserialize(copy.deepcopy(document))
+        result.init(self._data_source.context)
+        return result
+
+
+# Evaluation of MongoDB query predicates
+
+_type_rank: Dict[type, int] = {
+    type(None): 0, int: 1, float: 1, str: 2, dict: 3, list: 4, ObjectId: 5, bool: 6, dt.datetime: 7}
+"""Relative order of types when sorting values of different types, follows MongoDB comparison order."""
+
+
+def _sort_key(values: List[Any]):
+    """Sort key for the values resolved from the document, missing values are sorted first."""
+    value = values[0] if len(values) == 1 else (values if values else None)
+    rank = _type_rank.get(type(value), 1)
+    if rank in (0, 3, 4):
+        return rank, 0
+    return rank, value
+
+
+def _resolve_path(document: Dict[str, Any], path: str) -> List[Any]:
+    """
+    Return the values at the specified dot delimited path, empty list if
+    not found. When an intermediate element is a list, the remainder of
+    the path is resolved for each of its items.
+    """
+    values: List[Any] = [document]
+    for token in path.split('.'):
+        next_values = []
+        for value in values:
+            if isinstance(value, dict):
+                if token in value:
+                    next_values.append(value[token])
+            elif isinstance(value, list):
+                next_values.extend(x[token] for x in value if isinstance(x, dict) and token in x)
+        values = next_values
+    return values
+
+
+def _match_document(document: Dict[str, Any], predicate: Dict[str, Any]) -> bool:
+    """Return true if document satisfies MongoDB style predicate of the $match stage."""
+    for key, condition in predicate.items():
+        if key == '$and':
+            if not all(_match_document(document, x) for x in condition):
+                return False
+        elif key == '$or':
+            if not any(_match_document(document, x) for x in condition):
+                return False
+        elif key == '$nor':
+            if any(_match_document(document, x) for x in condition):
+                return False
+        elif key.startswith('$'):
+            raise Exception(f'Query operator {key} is not supported by temporal memory data source.')
+        elif not _match_values(_resolve_path(document, key), condition):
+            return False
+    return True
+
+
+def _match_values(values: List[Any], condition: Any) -> bool:
+    """Return true if values resolved from the document satisfy the condition."""
+    if isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition.keys()):
+        return all(_match_operator(values, op, arg) for op, arg in condition.items())
+    return _match_operator(values, '$eq', condition)
+
+
+def _candidates(values: List[Any]) -> List[Any]:
+    """
+    Expand values for comparison, where an array matches if either the
+    array itself or any of its elements matches. Missing value is None.
+    """
+    if not values:
+        return [None]
+    result = []
+    for value in values:
+        result.append(value)
+        if isinstance(value, list):
+            result.extend(value)
+    return result
+
+
+def _compare(op: str, value: Any, arg: Any) -> bool:
+    """Compare two values, values of incompatible types do not match."""
+    if value is None or arg is None:
+        return False
+    try:
+        if op == '$gt':
+            return value > arg
+        if op == '$gte':
+            return value >= arg
+        if op == '$lt':
+            return value < arg
+        return value <= arg
+    except TypeError:
+        return False
+
+
+def _match_operator(values: List[Any], op: str, arg: Any) -> bool:
+    """Return true if values resolved from the document satisfy a single operator."""
+    if op == '$eq':
+        return any(x == arg for x in _candidates(values))
+    elif op == '$ne':
+        return not _match_operator(values, '$eq', arg)
+    elif op in ('$gt', '$gte', '$lt', '$lte'):
+        return any(_compare(op, x, arg) for x in _candidates(values))
+    elif op == '$in':
+        return any(x == y for x in _candidates(values) for y in arg)
+    elif op == '$nin':
+        return not _match_operator(values, '$in', arg)
+    elif op == '$exists':
+        return bool(values) == bool(arg)
+    elif op == '$not':
+        return not _match_values(values, arg)
+    elif op == '$regex':
+        pattern = re.compile(arg)
+        return any(isinstance(x, str) and pattern.search(x) is not None for x in _candidates(values))
+    else:
+        raise Exception(f'Query operator {op} is not supported by temporal memory data source.')
@@ -0,0 +1,49 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datacentric.storage.temporal_id import empty_id
+from datacentric.storage.unit_test_context import UnitTestContext
+from datacentric.storage.memory.temporal_memory_data_source import TemporalMemoryDataSource
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.versioning_method import VersioningMethod
+
+
+class TemporalMemoryUnitTestContext(UnitTestContext):
+    """
+    TemporalMemoryUnitTestContext is the context for use in test fixtures
+    that require a temporal data source but not a running database server.
+
+    It extends UnitTestContext by creating an empty temporal memory
+    data source specific to the test method. The data is released
+    when the context is released.
+
+    For tests that must run against MongoDB, use TemporalMongoUnitTestContext.
+    For tests that do not require a data source, use UnitTestContext.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        """Inspect call stack to set properties."""
+        super().__init__()
+
+        # Create and initialize data source with TEST environment type
+        self.data_source = TemporalMemoryDataSource(
+            env_type=EnvType.Test,
+            env_group=self.test_module_name,
+            env_name=self.test_method_name,
+            versioning_method=VersioningMethod.Temporal
+        )
+
+        # Assign root dataset to data_set property of this context
+        self.data_set = empty_id
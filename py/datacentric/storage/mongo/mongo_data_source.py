@@ -13,11 +13,14 @@
 # limitations under the License.
 
 import attr
+import asyncio
+import weakref
 import stringcase
 from abc import ABC
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import MongoClient, AsyncMongoClient
 from pymongo.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 from datacentric.storage.context import Context
 from datacentric.storage.data_source import DataSource
 from datacentric.storage.env_type import EnvType
@@ -58,6 +61,12 @@ class MongoDataSource(DataSource, ABC):
     __client: MongoClient = attr.ib(default=None, init=False)
     """PyMongo database client."""
 
+    __async_clients: weakref.WeakKeyDictionary = attr.ib(factory=weakref.WeakKeyDictionary, init=False)
+    """
+    PyMongo asyncio database client for each event loop, created on first
+    use in that loop. The entry is removed when the loop is garbage collected.
+    """
+
     __prev_object_id: ObjectId = attr.ib(default=empty_id, init=False)
     """
     Previous ObjectId generated by this instance of the data source.
@@ -132,6 +141,34 @@ class MongoDataSource(DataSource, ABC):
         """Interface to Mongo database in PyMongo driver."""
         return self.__db
 
+    @property
+    def async_db(self) -> AsyncDatabase:
+        """Interface to Mongo database in PyMongo asyncio driver
+        for the running event loop.
+
+        The asyncio client is bound to the event loop where it was
+        created, so a separate client is created on first access in
+        each event loop. All coroutines running in the same loop share
+        its connection pool. Call aclose() before the loop is closed
+        to close the client.
+        """
+        loop = asyncio.get_running_loop()
+        async_client = self.__async_clients.get(loop)
+        if async_client is None:
+            if self.mongo_server is None:
+                async_client = AsyncMongoClient()
+            else:
+                async_client = AsyncMongoClient(self.mongo_server.split('=', 1)[1])
+            self.__async_clients[loop] = async_client
+        return async_client.get_database(self.__db_name)
+
+    async def aclose(self) -> None:
+        """Close PyMongo asyncio client for the running event loop, if created.
+        A new client is created if async_db is accessed again in this loop."""
+        async_client = self.__async_clients.pop(asyncio.get_running_loop(), None)
+        if async_client is not None:
+            await async_client.close()
+
     def create_ordered_object_id(self) -> ObjectId:
         result = ObjectId()
 
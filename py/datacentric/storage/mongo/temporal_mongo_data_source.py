@@ -13,9 +13,12 @@
 # limitations under the License.
 
 import attr
-from typing import Dict, Optional, TypeVar, Set, Iterable, Type
+from typing import Dict, Optional, TypeVar, Set, Iterable, Type, List, Any, Tuple
 from bson import ObjectId
 from pymongo.collection import Collection
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
 from datacentric.storage.mongo.temporal_mongo_query import TemporalMongoQuery
 from datacentric.storage.record import Record
 from datacentric.storage.deleted_record import DeletedRecord
@@ -60,9 +63,17 @@ class TemporalMongoDataSource(MongoDataSource):
     two values will be used.
     """
 
-    __collection_dict: Dict[type, Collection] = attr.ib(factory=dict, init=False)
+    # --- CLASS VARIABLES
+
+    __version_index = [('_key', 1), ('_dataset', 1), ('_id', 1)]
+    """Index of the versions collection by key, dataset and id."""
+
+    # --- INSTANCE VARIABLES
+
+    __collection_dict: Dict[Tuple[type, bool], Collection] = attr.ib(factory=dict, init=False)
     __data_set_dict: Dict[str, ObjectId] = attr.ib(factory=dict, init=False)
     __import_dict: Dict[ObjectId, Set[ObjectId]] = attr.ib(factory=dict, init=False)
+    __indexed_set: Set[type] = attr.ib(factory=set, init=False)
 
     __codec_options = DEFAULT_CODEC_OPTIONS.with_options(tz_aware=True)
     """
@@ -128,35 +139,143 @@ class TemporalMongoDataSource(MongoDataSource):
         """
         collection_name, key_value = key_.split('=', 1)
 
-        base_pipe = [{"$match": {"_key": key_value}}]
-        pipe_with_constraints = self.apply_final_constraints(base_pipe, load_from)
-        ordered_pipe = pipe_with_constraints
-        ordered_pipe.extend(
-            [
-                {"$sort": {"_dataset": -1}},
-                {"$sort": {"_id": -1}},
-                {'$limit': 1}
-            ]
-        )
+        # Use head collection if available, it has one version per dataset
+        head_collection = self.get_head_collection_or_none(type_, load_from)
+        if head_collection is not None:
+            for head_document in head_collection.aggregate(self._get_head_load_pipeline([key_value], load_from)):
+                return self._to_loaded_record(self.from_head_document(head_document), type_, key_, load_from)
+            return None
+
+        ordered_pipe = self._get_load_by_key_pipeline(key_value, load_from)
 
         collection = self._get_or_create_collection(type_)
 
         cursor = collection.aggregate(ordered_pipe)
         if cursor.alive:
             cursor_next = cursor.next()
-            result: TRecord = deserialize(cursor_next)
+            return self._to_loaded_record(cursor_next, type_, key_, load_from)
+        return None
 
-            if result is not None and not isinstance(result, DeletedRecord):
+    async def aload_or_null_by_key(self, type_: Type[TRecord], key_: str,
+                                   load_from: ObjectId) -> Optional[TRecord]:
+        """Asynchronous version of load_or_null_by_key(...) using
+        PyMongo asyncio driver, with the same lookup rules.
 
-                is_proper_record = isinstance(result, type_)
-                if not is_proper_record:
-                    raise Exception(f'Stored type {type(result).__name__} for Key={key_} in '
-                                    f'data_set={load_from} is not an instance of '
-                                    f'the requested type {type_.__name__}.')
-                result.init(self.context)
-                return result
+        Concurrent calls from the same event loop share the connection
+        pool of the asyncio client and do not require a thread per call.
+        Head collection is used under the same conditions as in
+        load_or_null_by_key(...).
+        """
+        collection_name, key_value = key_.split('=', 1)
+
+        head_collection = self.get_async_head_collection_or_none(type_, load_from)
+        if head_collection is not None:
+            cursor = await head_collection.aggregate(self._get_head_load_pipeline([key_value], load_from))
+            head_documents = await cursor.to_list(1)
+            if head_documents:
+                return self._to_loaded_record(self.from_head_document(head_documents[0]), type_, key_, load_from)
+            return None
+
+        ordered_pipe = self._get_load_by_key_pipeline(key_value, load_from)
+
+        collection = self._get_or_create_async_collection(type_)
+
+        cursor = await collection.aggregate(ordered_pipe)
+        documents = await cursor.to_list(1)
+        if documents:
+            return self._to_loaded_record(documents[0], type_, key_, load_from)
         return None
 
+    async def aload_many(self, type_: Type[TRecord], keys: Iterable[str],
+                         load_from: ObjectId) -> List[Optional[TRecord]]:
+        """Asynchronous lookup of multiple records by string key using
+        the same lookup rules as load_or_null_by_key(...).
+
+        Returns a list with one element for each key in the order of
+        keys, where the element is None if the record is not found or
+        is a DeletedRecord. Repeated keys return the same record instance.
+
+        All keys are resolved by a single aggregation that returns the
+        latest version of each key, rather than one roundtrip per key,
+        or by a single query to head collection when it is available.
+        """
+        keys = list(keys)
+        key_values = [key_.split('=', 1)[1] for key_ in keys]
+        if not key_values:
+            return []
+
+        documents: Dict[str, Dict[str, Any]] = dict()
+        head_collection = self.get_async_head_collection_or_none(type_, load_from)
+        if head_collection is not None:
+            # Head collection has one version per dataset, the first in lookup order is selected
+            async for head_document in await head_collection.aggregate(
+                    self._get_head_load_pipeline(key_values, load_from)):
+                if head_document['_key'] not in documents:
+                    documents[head_document['_key']] = self.from_head_document(head_document)
+            return self._to_loaded_records(documents, type_, keys, key_values, load_from)
+
+        collection = self._get_or_create_async_collection(type_)
+
+        # Select the first version of each key in lookup order
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+        record_ids: Dict[str, ObjectId] = dict()
+        async for obj in await collection.aggregate(self._get_load_many_pipeline(key_values, load_from)):
+            obj_key = obj['Key']
+            if obj_key not in record_ids:
+                if imports_cutoff is None or obj['DataSet'] == load_from or obj['Id'] < imports_cutoff:
+                    record_ids[obj_key] = obj['Id']
+
+        if record_ids:
+            async for document in await collection.aggregate(
+                    [{'$match': {'_id': {'$in': list(record_ids.values())}}}]):
+                documents[document['_key']] = document
+
+        return self._to_loaded_records(documents, type_, keys, key_values, load_from)
+
+    def load_many(self, type_: Type[TRecord], keys: Iterable[str],
+                  load_from: ObjectId) -> List[Optional[TRecord]]:
+        """Lookup of multiple records by string key using the same
+        lookup rules as load_or_null_by_key(...).
+
+        Returns a list with one element for each key in the order of
+        keys, where the element is None if the record is not found or
+        is a DeletedRecord. Repeated keys return the same record instance.
+
+        All keys are resolved by one aggregation that selects the version
+        of each key followed by one query for the selected versions, or
+        by a single query to head collection when it is available.
+        """
+        keys = list(keys)
+        key_values = [key_.split('=', 1)[1] for key_ in keys]
+        if not key_values:
+            return []
+
+        documents: Dict[str, Dict[str, Any]] = dict()
+        head_collection = self.get_head_collection_or_none(type_, load_from)
+        if head_collection is not None:
+            # Head collection has one version per dataset, the first in lookup order is selected
+            for head_document in head_collection.aggregate(self._get_head_load_pipeline(key_values, load_from)):
+                if head_document['_key'] not in documents:
+                    documents[head_document['_key']] = self.from_head_document(head_document)
+            return self._to_loaded_records(documents, type_, keys, key_values, load_from)
+
+        collection = self._get_or_create_collection(type_)
+
+        # Select the first version of each key in lookup order
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+        record_ids: Dict[str, ObjectId] = dict()
+        for obj in collection.aggregate(self._get_load_many_pipeline(key_values, load_from)):
+            obj_key = obj['Key']
+            if obj_key not in record_ids:
+                if imports_cutoff is None or obj['DataSet'] == load_from or obj['Id'] < imports_cutoff:
+                    record_ids[obj_key] = obj['Id']
+
+        if record_ids:
+            for document in collection.aggregate([{'$match': {'_id': {'$in': list(record_ids.values())}}}]):
+                documents[document['_key']] = document
+
+        return self._to_loaded_records(documents, type_, keys, key_values, load_from)
+
     def get_query(self, record_type: Type[TRecord], load_from: ObjectId) -> TemporalMongoQuery:
         """Get query for the specified type.
 
@@ -189,29 +308,59 @@ class TemporalMongoDataSource(MongoDataSource):
         strictly increasing order.
         """
         self._check_not_readonly()
+        self.ensure_indexes(record_type)
 
         collection = self._get_or_create_collection(record_type)
         if records is None:
             return None
 
-        for record in records:
-            record_id = self.create_ordered_object_id()
-            if record_id <= save_to:
-                raise Exception(f'TemporalId={record_id} of a record must be greater than '
-                                f'TemporalId={save_to} of the dataset where it is being saved.')
-            record.id_ = record_id
-            record.data_set = save_to
-            record.init(self.context)
+        records = self._assign_temporal_ids(records, save_to)
 
         versioning_method = self.get_versioning_method(record_type)
         if versioning_method == VersioningMethod.Temporal:
-            collection.insert_many([serialize(x) for x in records])
+            documents = [serialize(x) for x in records]
+            collection.insert_many(documents)
         elif (versioning_method == VersioningMethod.NonTemporal) or (
                 versioning_method == VersioningMethod.NonOverriding):
-            collection.insert_many([serialize(x) for x in records])  # TODO: replace by upsert
+            documents = [serialize(x) for x in records]
+            collection.insert_many(documents)  # TODO: replace by upsert
         else:
             raise Exception(f'Unknown versioning method {versioning_method}.')
 
+        self._update_head_collection(record_type, documents)
+
+    async def asave_many(self, record_type: Type[TRecord], records: Iterable[TRecord], save_to: ObjectId) -> None:
+        """Asynchronous version of save_many(...) using PyMongo asyncio driver.
+
+        ObjectIds are assigned when the method is called, before the
+        first await, so that they are in strictly increasing order
+        of calls even when several saves run concurrently.
+        """
+        self._check_not_readonly()
+        self.ensure_indexes(record_type)
+
+        if records is None:
+            return None
+
+        records = self._assign_temporal_ids(records, save_to)
+
+        versioning_method = self.get_versioning_method(record_type)
+        if versioning_method not in [VersioningMethod.Temporal, VersioningMethod.NonTemporal,
+                                     VersioningMethod.NonOverriding]:
+            raise Exception(f'Unknown versioning method {versioning_method}.')
+
+        if records:
+            documents = [serialize(x) for x in records]
+            collection = self._get_or_create_async_collection(record_type)
+            await collection.insert_many(documents)
+
+            if self.has_head_collection(record_type):
+                head_collection = self._get_or_create_async_collection(record_type, head=True)
+                try:
+                    await head_collection.bulk_write(self._get_head_requests(documents), ordered=False)
+                except BulkWriteError as e:
+                    self._check_head_write_errors(e)
+
     def delete(self, record_type: Type[TRecord], key: str, delete_in: ObjectId) -> None:
         """Write a DeletedRecord in delete_in dataset for the specified key
         instead of actually deleting the record. This ensures that
@@ -223,15 +372,57 @@ class TemporalMongoDataSource(MongoDataSource):
         """
         self._check_not_readonly()
 
+        if self.write_behind_buffer is not None:
+            self.write_behind_buffer.delete(record_type, key, delete_in)
+            return
+
         record = DeletedRecord()
         record.key = key
 
         record.id_ = self.create_ordered_object_id()
         record.data_set = delete_in
 
+        self.ensure_indexes(record_type)
         collection = self._get_or_create_collection(record_type)
 
-        collection.insert_one(record)
+        document = serialize(record)
+        collection.insert_one(document)
+        self._update_head_collection(record_type, [document])
+
+    def insert_records(self, record_type: Type[TRecord], records: List[TRecord]) -> Dict[int, str]:
+        """Insert records for which ObjectId and dataset have already been
+        assigned into the collection for record_type, without validation.
+
+        Records are inserted using a single unordered insert_many call,
+        so that a record that cannot be written does not prevent the
+        remaining records from being written. Returns error message for
+        each record that could not be written by its index in the list.
+        """
+        errors: Dict[int, str] = dict()
+        documents = []
+        document_indices = []
+        for index, record in enumerate(records):
+            try:
+                documents.append(serialize(record))
+                document_indices.append(index)
+            except Exception as e:
+                errors[index] = str(e)
+
+        if documents:
+            self.ensure_indexes(record_type)
+            collection = self._get_or_create_collection(record_type)
+            try:
+                collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details['writeErrors']:
+                    errors[document_indices[write_error['index']]] = write_error['errmsg']
+
+            # Head collection is updated only for the records that were written
+            failed_positions = set(index for index, record_index in enumerate(document_indices)
+                                   if record_index in errors)
+            self._update_head_collection(record_type, [document for index, document in enumerate(documents)
+                                                       if index not in failed_positions])
+        return errors
 
     def apply_final_constraints(self, pipeline, load_from: ObjectId):
         """Apply the final constraints after all prior where clauses but before sort_by clause:
@@ -247,6 +438,164 @@ class TemporalMongoDataSource(MongoDataSource):
 
         return pipeline
 
+    def load_versions(self, record_type: Type[TRecord], key_: str, load_from: ObjectId,
+                      from_id: ObjectId = None, to_id: ObjectId = None) -> Iterable[Record]:
+        """Iterate over all versions of the record with the specified key
+        in load_from dataset and its imports, in ascending order of ObjectId.
+
+        Only versions where from_id <= ObjectId < to_id are returned,
+        each bound is ignored if None. Versions excluded by CutoffTime
+        and ImportsCutoffTime are not returned. DeletedRecord versions
+        are included.
+        """
+        collection_name, key_value = key_.split('=', 1)
+
+        id_range: Dict[str, ObjectId] = dict()
+        if from_id is not None:
+            id_range['$gte'] = from_id
+        if to_id is not None:
+            id_range['$lt'] = to_id
+
+        pipeline: List[Dict[str, Any]] = [{'$match': {'_key': key_value}}]
+        if id_range:
+            pipeline.append({'$match': {'_id': id_range}})
+        pipeline = self._apply_lookup_constraints(pipeline, load_from)
+        pipeline.append({'$sort': {'_id': 1}})
+
+        collection = self._get_or_create_collection(record_type)
+        for document in collection.aggregate(pipeline):
+            version: Record = deserialize(document)
+            yield self._init_version(version, record_type, key_)
+
+    def get_changed_keys(self, record_type: Type[TRecord], load_from: ObjectId,
+                         from_id: Optional[ObjectId], to_id: ObjectId) -> Iterable[str]:
+        """Iterate in ascending order over distinct keys, without the collection
+        name prefix, that have at least one version where from_id <= ObjectId < to_id
+        in load_from dataset or its imports. The from_id bound is ignored if None.
+
+        The versions are selected using the index on _id.
+        """
+        id_range: Dict[str, ObjectId] = {'$lt': to_id}
+        if from_id is not None:
+            id_range['$gte'] = from_id
+
+        pipeline: List[Dict[str, Any]] = [{'$match': {'_id': id_range}}]
+        pipeline = self._apply_lookup_constraints(pipeline, load_from)
+        pipeline.extend([
+            {'$group': {'_id': '$_key'}},
+            {'$sort': {'_id': 1}}
+        ])
+
+        collection = self._get_or_create_collection(record_type)
+        for document in collection.aggregate(pipeline, allowDiskUse=True):
+            yield document['_id']
+
+    def get_latest_versions(self, record_type: Type[TRecord], key_values: List[str], load_from: ObjectId,
+                            to_id: ObjectId) -> Dict[str, Tuple[ObjectId, bool]]:
+        """For each key without the collection name prefix, return ObjectId of the
+        version selected by the lookup rules among versions where ObjectId < to_id
+        and a flag that is True if this version is DeletedRecord. Keys for which
+        there is no such version are not included.
+        """
+        pipeline: List[Dict[str, Any]] = [{'$match': {'_key': {'$in': key_values}, '_id': {'$lt': to_id}}}]
+        pipeline = self._apply_lookup_constraints(pipeline, load_from)
+        pipeline.extend([
+            {'$sort': {'_key': 1, '_dataset': -1, '_id': -1}},
+            {'$group': {'_id': '$_key', 'Id': {'$first': '$_id'}, 'Type': {'$first': '$_t'}}}
+        ])
+
+        collection = self._get_or_create_collection(record_type)
+        result: Dict[str, Tuple[ObjectId, bool]] = dict()
+        for document in collection.aggregate(pipeline):
+            result[document['_id']] = (document['Id'], document['Type'][-1] == DeletedRecord.__name__)
+        return result
+
+    def get_version_infos(self, record_type: Type[TRecord], to_id: ObjectId, after_key: Optional[str],
+                          max_keys: int) -> List[Tuple[str, ObjectId, ObjectId, int]]:
+        """Return (key, dataset, id, size in bytes) for all versions where
+        ObjectId < to_id, in all datasets, for up to max_keys distinct keys
+        that follow after_key in ascending order of keys, or for the first
+        keys if after_key is None. Keys do not include the collection name
+        prefix. The result is sorted by key, dataset, and id.
+
+        The size of each version is its BSON size reported by the server.
+
+        Versions are read in a single pass in the order of the index on key,
+        dataset and id created by ensure_indexes(...), starting after after_key
+        and stopping at the first version of the key that follows the last of
+        max_keys keys, so that the cost of each call depends only on the number
+        of versions it returns.
+        """
+        version_match: Dict[str, Any] = {'_id': {'$lt': to_id}}
+        if after_key is not None:
+            version_match['_key'] = {'$gt': after_key}
+
+        collection = self._get_or_create_collection(record_type)
+        version_pipeline = [
+            {'$match': version_match},
+            {'$sort': {'_key': 1, '_dataset': 1, '_id': 1}},
+            {'$project': {'Key': '$_key', 'DataSet': '$_dataset', 'Size': {'$bsonSize': '$$ROOT'}}}
+        ]
+
+        result: List[Tuple[str, ObjectId, ObjectId, int]] = []
+        key_count = 0
+        current_key = None
+        with collection.aggregate(version_pipeline) as cursor:
+            for version_info in cursor:
+                key_value = version_info['Key']
+                if key_value != current_key:
+                    if key_count == max_keys:
+                        break
+                    key_count += 1
+                    current_key = key_value
+                result.append((key_value, version_info['DataSet'], version_info['_id'], version_info['Size']))
+        return result
+
+    def purge_versions(self, record_type: Type[TRecord], ids: List[ObjectId]) -> None:
+        """Permanently delete the record versions with the specified ObjectIds
+        from the collection for record_type without writing DeletedRecord.
+        """
+        self._check_not_readonly()
+        self.ensure_indexes(record_type)
+        collection = self._get_or_create_collection(record_type)
+        collection.delete_many({'_id': {'$in': ids}})
+
+    def get_max_id(self, record_type: Type[TRecord]) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the collection for record_type
+        across all datasets, or None if the collection is empty.
+
+        The value is obtained from the _id index.
+        """
+        collection = self._get_or_create_collection(record_type)
+        document = collection.find_one({}, projection={'_id': 1}, sort=[('_id', -1)])
+        return document['_id'] if document is not None else None
+
+    def load_many_by_id(self, record_type: Type[TRecord], ids: Iterable[ObjectId]) -> List[Optional[TRecord]]:
+        """Load records by ObjectId using the same rules as load_or_null(...),
+        with a single query for all ObjectIds.
+
+        Returns a list with one element for each ObjectId in the order
+        of ids, where the element is None if the record is not found.
+        """
+        ids = list(ids)
+        distinct_ids = [x for x in dict.fromkeys(ids) if self.cutoff_time is None or x < self.cutoff_time]
+
+        loaded: Dict[ObjectId, TRecord] = dict()
+        if distinct_ids:
+            collection = self._get_or_create_collection(record_type)
+            for document in collection.aggregate([{'$match': {'_id': {'$in': distinct_ids}}}]):
+                result: TRecord = deserialize(document)
+                if isinstance(result, DeletedRecord):
+                    continue
+                if not isinstance(result, record_type):
+                    raise Exception(f'Stored type {type(result).__name__} for ObjectId={result.id_} and '
+                                    f'Key={result.to_key()} is not an instance of the requested type '
+                                    f'{record_type.__name__}.')
+                result.init(self.context)
+                loaded[result.id_] = result
+
+        return [loaded.get(id_) for id_ in ids]
+
     def get_data_set_or_none(self, data_set_name: str) -> Optional[ObjectId]:
         """Get ObjectId of the dataset with the specified name.
         Returns null if not found.
@@ -314,6 +663,72 @@ class TemporalMongoDataSource(MongoDataSource):
 
         return False
 
+    def has_head_collection(self, record_type: Type[TRecord]) -> bool:
+        """Returns true if the base class of the collection has HeadCollection attribute."""
+        root_type = ClassInfo.get_ultimate_base(record_type)
+        if hasattr(root_type, 'has_head_collection') and getattr(root_type, 'has_head_collection'):
+            return True
+
+        return False
+
+    def get_head_collection_or_none(self, record_type: Type[TRecord], load_from: ObjectId) -> Optional[Collection]:
+        """Returns head collection for record_type if it can be used to load
+        from load_from dataset, or None if the collection does not have
+        head collection, or if CutoffTime or ImportsCutoffTime is set
+        and lookup requires earlier versions.
+
+        Head collection holds the latest version of each key in each dataset.
+        Its documents use {Key, DataSet} as _id and keep the ObjectId of the
+        version in _vid, use from_head_document(...) to restore the version
+        document.
+        """
+        if not self._can_use_head_collection(record_type, load_from):
+            return None
+        return self._get_or_create_collection(record_type, head=True)
+
+    def get_async_head_collection_or_none(self, record_type: Type[TRecord],
+                                          load_from: ObjectId) -> Optional[AsyncCollection]:
+        """Version of get_head_collection_or_none(...) for PyMongo asyncio driver,
+        returns head collection under the same conditions."""
+        if not self._can_use_head_collection(record_type, load_from):
+            return None
+        return self._get_or_create_async_collection(record_type, head=True)
+
+    @staticmethod
+    def from_head_document(head_document: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert document from head collection to version document by restoring its _id."""
+        head_document['_id'] = head_document.pop('_vid')
+        return head_document
+
+    def rebuild_head_collection(self, record_type: Type[TRecord]) -> None:
+        """Recreate head collection for record_type from all versions.
+
+        Use this method after adding HeadCollection attribute to the
+        record type of an existing collection, or to repair the head
+        collection after a failure between writing the versions and
+        updating the head collection. Because head updates are
+        idempotent, the collection remains usable during rebuild.
+        """
+        self._check_not_readonly()
+        if not self.has_head_collection(record_type):
+            raise Exception(f'Collection {ClassInfo.get_ultimate_base(record_type).__name__} '
+                            f'does not have HeadCollection attribute.')
+
+        pipeline = [
+            {'$sort': {'_key': 1, '_dataset': 1, '_id': -1}},
+            {'$group': {'_id': {'Key': '$_key', 'DataSet': '$_dataset'}, 'Document': {'$first': '$$ROOT'}}},
+            {'$replaceRoot': {'newRoot': '$Document'}}
+        ]
+        self.ensure_indexes(record_type)
+        collection = self._get_or_create_collection(record_type)
+        documents = []
+        for document in collection.aggregate(pipeline, allowDiskUse=True):
+            documents.append(document)
+            if len(documents) == 1000:
+                self._update_head_collection(record_type, documents)
+                documents = []
+        self._update_head_collection(record_type, documents)
+
     def get_imports_cutoff_time(self, data_set_id: ObjectId) -> Optional[ObjectId]:
         """Gets ImportsCutoffTime from the dataset detail record.
         Returns None if dataset detail record is not found.
@@ -335,15 +750,172 @@ class TemporalMongoDataSource(MongoDataSource):
         # TODO: implement when stored in dataset
         return None
 
-    def _get_or_create_collection(self, type_: type) -> Collection:
-        if type_ in self.__collection_dict:
-            return self.__collection_dict[type_]
-        root_type = ClassInfo.get_ultimate_base(type_)
-        collection_name = root_type.__name__
+    def _apply_lookup_constraints(self, pipeline: List[Dict[str, Any]],
+                                  load_from: ObjectId) -> List[Dict[str, Any]]:
+        """Apply final constraints and exclude imported records where
+        ObjectId is greater than or equal to ImportsCutoffTime."""
+        pipeline = self.apply_final_constraints(pipeline, load_from)
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+        if imports_cutoff is not None:
+            pipeline.append({'$match': {'$or': [{'_dataset': load_from}, {'_id': {'$lt': imports_cutoff}}]}})
+        return pipeline
+
+    def _can_use_head_collection(self, record_type: Type[TRecord], load_from: ObjectId) -> bool:
+        """Returns true if the collection has head collection and lookup
+        from load_from does not require versions before the latest."""
+        if self.cutoff_time is not None or not self.has_head_collection(record_type):
+            return False
+        return self.get_imports_cutoff_time(load_from) is None
+
+    def _get_head_load_pipeline(self, key_values: List[str], load_from: ObjectId) -> List[Dict[str, Any]]:
+        """Pipeline returning head documents of the keys in lookup order,
+        key values must not include the collection name prefix."""
+        return [
+            {'$match': {'_key': {'$in': list(set(key_values))},
+                        '_dataset': {'$in': list(self.get_data_set_lookup_list(load_from))}}},
+            {'$sort': {'_key': 1, '_dataset': -1}}
+        ]
+
+    def _get_load_by_key_pipeline(self, key_value: str, load_from: ObjectId) -> List[Dict[str, Any]]:
+        """Pipeline returning the first version of the key in lookup order,
+        key value must not include the collection name prefix."""
+        base_pipe = [{"$match": {"_key": key_value}}]
+        pipe_with_constraints = self.apply_final_constraints(base_pipe, load_from)
+        ordered_pipe = pipe_with_constraints
+        ordered_pipe.extend(
+            [
+                {"$sort": {"_dataset": -1, "_id": -1}},
+                {'$limit': 1}
+            ]
+        )
+        return ordered_pipe
+
+    def _get_load_many_pipeline(self, key_values: List[str], load_from: ObjectId) -> List[Dict[str, Any]]:
+        """Pipeline returning ObjectId, dataset and key of the versions of the keys
+        in lookup order, key values must not include the collection name prefix."""
+        pipeline: List[Dict[str, Any]] = [{'$match': {'_key': {'$in': list(set(key_values))}}}]
+        pipeline = self.apply_final_constraints(pipeline, load_from)
+        pipeline.append({'$sort': {'_key': 1, '_dataset': -1, '_id': -1}})
+        pipeline.append({'$project': {'Id': '$_id', 'DataSet': '$_dataset', 'Key': '$_key', '_id': 0}})
+        return pipeline
+
+    def _to_loaded_records(self, documents: Dict[str, Dict[str, Any]], type_: Type[TRecord], keys: List[str],
+                           key_values: List[str], load_from: ObjectId) -> List[Optional[TRecord]]:
+        """Deserialize documents by key value in the order of keys, repeated keys get the same record."""
+        # Deserialization consumes the document, so each document is deserialized once
+        loaded: Dict[str, Optional[TRecord]] = dict()
+        for key_, key_value in zip(keys, key_values):
+            if key_value not in loaded:
+                document = documents.get(key_value)
+                loaded[key_value] = self._to_loaded_record(document, type_, key_, load_from) \
+                    if document is not None else None
+        return [loaded[key_value] for key_value in key_values]
+
+    def _to_loaded_record(self, document: Dict[str, Any], type_: Type[TRecord], key_: str,
+                          load_from: ObjectId) -> Optional[TRecord]:
+        """Deserialize and initialize record loaded by key, return None for DeletedRecord."""
+        result: TRecord = deserialize(document)
+
+        if result is not None and not isinstance(result, DeletedRecord):
+
+            is_proper_record = isinstance(result, type_)
+            if not is_proper_record:
+                raise Exception(f'Stored type {type(result).__name__} for Key={key_} in '
+                                f'data_set={load_from} is not an instance of '
+                                f'the requested type {type_.__name__}.')
+            result.init(self.context)
+            return result
+        return None
+
+    def _assign_temporal_ids(self, records: Iterable[TRecord], save_to: ObjectId) -> List[TRecord]:
+        """Assign ordered ObjectId and dataset to each record and return records as list."""
+        records = list(records)
+        for record in records:
+            record_id = self.create_ordered_object_id()
+            if record_id <= save_to:
+                raise Exception(f'TemporalId={record_id} of a record must be greater than '
+                                f'TemporalId={save_to} of the dataset where it is being saved.')
+            record.id_ = record_id
+            record.data_set = save_to
+            record.init(self.context)
+        return records
+
+    def _update_head_collection(self, record_type: type, documents: List[Dict[str, Any]]) -> None:
+        """Replace head documents for the keys and datasets of the written
+        versions unless head collection already has a later version."""
+        if documents and self.has_head_collection(record_type):
+            head_collection = self._get_or_create_collection(record_type, head=True)
+            try:
+                head_collection.bulk_write(self._get_head_requests(documents), ordered=False)
+            except BulkWriteError as e:
+                self._check_head_write_errors(e)
+
+    @staticmethod
+    def _get_head_requests(documents: List[Dict[str, Any]]) -> List[ReplaceOne]:
+        """
+        Conditional upserts of head documents. If head collection already
+        has the same or later version for the key and dataset, the filter
+        does not match and the upsert fails with duplicate key error, which
+        makes the update idempotent and independent of the order of writes.
+        """
+        result = []
+        for document in documents:
+            head_document = dict(document)
+            head_document['_vid'] = document['_id']
+            head_document['_id'] = {'Key': document['_key'], 'DataSet': document['_dataset']}
+            result.append(ReplaceOne({'_id': head_document['_id'], '_vid': {'$lt': document['_id']}},
+                                     head_document, upsert=True))
+        return result
+
+    @staticmethod
+    def _check_head_write_errors(e: BulkWriteError) -> None:
+        """Ignore duplicate key errors, which mean a later version is already in head collection."""
+        other_errors = [x for x in e.details['writeErrors'] if x['code'] != 11000]
+        if other_errors:
+            raise Exception(f'Head collection update failed: {other_errors[0]["errmsg"]}')
+
+    def ensure_indexes(self, record_type: Type[TRecord]) -> None:
+        """Create the indexes for the collection of record_type if they
+        do not exist yet. This requires write permission and is called
+        by the methods that write to the collection, so that reading
+        does not modify the database.
+        """
+        root_type = ClassInfo.get_ultimate_base(record_type)
+        if root_type in self.__indexed_set:
+            return
+
+        # Index for lookup of the key across datasets and for reading versions in the order of keys
+        collection = self._get_or_create_collection(record_type)
+        collection.create_index(TemporalMongoDataSource.__version_index)
+        if self.has_head_collection(record_type):
+            # Indexes for lookup of the key across datasets and for queries in the order of versions
+            head_collection = self._get_or_create_collection(record_type, head=True)
+            head_collection.create_index([('_key', 1), ('_dataset', -1)])
+            head_collection.create_index([('_vid', 1)])
+        self.__indexed_set.add(root_type)
+
+    def _get_or_create_async_collection(self, type_: type, head: bool = False) -> AsyncCollection:
+        # Not cached because the collection belongs to the client for the running event loop
+        collection_name = self._get_collection_name(type_, head)
+        return self.async_db.get_collection(collection_name, self.__codec_options)
+
+    def _get_or_create_collection(self, type_: type, head: bool = False) -> Collection:
+        if (type_, head) in self.__collection_dict:
+            return self.__collection_dict[(type_, head)]
+        collection_name = self._get_collection_name(type_, head)
         collection = self.db.get_collection(collection_name, self.__codec_options)
-        self.__collection_dict[type_] = collection
+        self.__collection_dict[(type_, head)] = collection
         return collection
 
+    @staticmethod
+    def _get_collection_name(type_: type, head: bool) -> str:
+        """Collection name is the name of the base class, head collection adds .Head suffix."""
+        root_type = ClassInfo.get_ultimate_base(type_)
+        if head:
+            return root_type.__name__ + '.Head'
+        else:
+            return root_type.__name__
+
     def _build_data_set_lookup_list(self, data_set_record: DataSet) -> Set[ObjectId]:
         result: Set[ObjectId] = set()
 
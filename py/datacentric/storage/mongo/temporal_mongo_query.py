@@ -13,9 +13,14 @@
 # limitations under the License.
 
 from __future__ import annotations
+import zlib
+import bson
+import hashlib
+import base64
 import numpy as np
 from enum import IntEnum
-from typing import Iterable, Dict, Any, List, TypeVar, Set, TYPE_CHECKING
+from typing import Iterable, AsyncIterator, Callable, Dict, Any, List, TypeVar, Set, Tuple, Optional, \
+    TYPE_CHECKING
 from bson import ObjectId
 from pymongo.collection import Collection
 from pymongo.command_cursor import CommandCursor
@@ -30,6 +35,7 @@ from datacentric.serialization.serializer import deserialize
 
 if TYPE_CHECKING:
     from datacentric.storage.mongo.temporal_mongo_data_source import TemporalMongoDataSource
+    from datacentric.storage.query_cache import QueryCache
 
 TRecord = TypeVar('TRecord', bound=Record)
 
@@ -41,6 +47,12 @@ class TemporalMongoQuery:
     of the record across multiple datasets.
     """
 
+    __include_batch_size: int = 1000
+    """Number of query results for which referenced records are resolved together."""
+
+    __checkpoint_interval: int = 1000
+    """Number of query results after which the checkpoint is updated."""
+
     def __init__(self, record_type: type, data_source: TemporalMongoDataSource, collection: Collection,
                  load_from: ObjectId):
 
@@ -49,6 +61,13 @@ class TemporalMongoQuery:
         self._collection = collection
         self._load_from = load_from
         self._pipeline: List[Dict[str, Any]] = [{'$match': {'_t': self._type.__name__}}]
+        self._include_fields: Tuple[str, ...] = ()
+        self._included: Dict[str, Optional[Record]] = dict()
+        self._key_partition: Optional[Tuple[int, int]] = None
+        self._id_range: Optional[Tuple[Optional[ObjectId], Optional[ObjectId]]] = None
+        self._resume_after: Optional[Dict[str, Any]] = None
+        self._checkpoint: Optional[str] = None
+        self._cache: Optional[QueryCache] = None
 
     def __has_sort(self) -> bool:
         stage_names = [stage_name
@@ -56,6 +75,313 @@ class TemporalMongoQuery:
                        for stage_name in stage.keys()]
         return '$sort' in stage_names
 
+    def _copy(self) -> TemporalMongoQuery:
+        """Create a copy of this query to which further stages can be added."""
+        query = type(self)(self._type, self._data_source, self._collection, self._load_from)
+        query._pipeline = self._pipeline.copy()
+        query._include_fields = self._include_fields
+        query._key_partition = self._key_partition
+        query._id_range = self._id_range
+        query._resume_after = self._resume_after
+        query._cache = self._cache
+        return query
+
+    def include(self, *field_names: str) -> TemporalMongoQuery:
+        """Load records referenced by the specified key fields together with the query results.
+
+        As the query results are iterated, the keys referenced by these fields
+        are collected for each batch of results and resolved using batched
+        lookups in the same dataset as the query. Referenced records are
+        available from the included dictionary, where the record is None if
+        it is not found or is deleted:
+
+        query = data_source.get_query(LogEntry, data_set).include('log')
+        for entry in query.as_iterable():
+            log = query.included[entry.log]
+        """
+        query = self._copy()
+        query._include_fields = self._include_fields + field_names
+        return query
+
+    def parallel_map(self, fn: Callable[[TRecord], Any], workers: int = None, ordered: bool = True,
+                     chunk_size: int = 100) -> Iterable[Any]:
+        """Apply fn to each record returned by the query in worker processes
+        and return the results as Iterable.
+
+        The records are split into one partition per worker by the hash of
+        their key. Each worker process creates its own context and data
+        source from a picklable descriptor of this data source, runs the
+        query for its partition, and sends the results back in chunks of
+        chunk_size, so that the records are loaded, deserialized and passed
+        to fn in parallel without the GIL of the current process.
+
+        If ordered is true, results are returned in the order of the query,
+        by merging the results of the partitions, each of which is in the
+        order of the query. Otherwise the results are returned as soon as
+        they are received from any worker. In both cases, each worker can
+        get at most a few chunks ahead of the caller before it waits, so
+        that memory use does not depend on the number of records.
+
+        The function fn and its results must be picklable, for example fn
+        can be a module level function. The number of workers defaults
+        to the number of CPUs.
+        """
+        from datacentric.storage.parallel_map import parallel_map
+        return parallel_map(self, fn, workers, ordered, chunk_size)
+
+    def with_cache(self, cache: QueryCache) -> TemporalMongoQuery:
+        """Reuse the ObjectIds of records returned by the same query from
+        the specified cache, see QueryCache for details:
+
+        cache = QueryCache(max_bytes=16 * 1024 * 1024)
+        query = data_source.get_query(BaseSample, data_set).where({'version': 1}).with_cache(cache)
+
+        When the cached result is reused, the records are loaded by ObjectId
+        in batches instead of running the query. The cache is used by
+        as_iterable(), and the asynchronous MongoDB driver path of
+        as_async_iterable() always runs the query.
+        """
+        query = self._copy()
+        query._cache = cache
+        return query
+
+    @property
+    def checkpoint(self) -> Optional[str]:
+        """Token from which the query can be resumed after the records
+        iterated so far, or None before the first checkpoint.
+
+        The token is updated after every batch of records and after the
+        last record, once the caller has finished processing the record
+        that completes the batch. It holds the values of sort_by(...)
+        attributes and ObjectId of that record as a string which can
+        be persisted, for example to a file, and passed to resume_from(...)
+        of the same query in another process.
+        """
+        return self._checkpoint
+
+    def resume_from(self, checkpoint: str) -> TemporalMongoQuery:
+        """Continue the query after the record at which the checkpoint was
+        taken, without reading the records returned before it:
+
+        query = data_source.get_query(BaseSample, data_set).sort_by('record_name')
+        if checkpoint is not None:
+            query = query.resume_from(checkpoint)
+        for record in query.as_iterable():
+            process(record)
+            checkpoint = query.checkpoint
+
+        Records are returned in the order of sort_by(...) attributes followed
+        by ObjectId, or in the order of ObjectId if the query is not sorted,
+        so that the position of each record is fixed. The query must have
+        the same sort_by(...) attributes as the query where the checkpoint
+        was taken.
+        """
+        token_doc = bson.decode(base64.urlsafe_b64decode(checkpoint.encode('ascii')))
+        sort_fields = list(self.__get_sort_spec().keys())
+        if token_doc['SortFields'] != sort_fields:
+            raise Exception(f'Checkpoint was taken for a query sorted by {token_doc["SortFields"]} and cannot '
+                            f'be used to resume a query sorted by {sort_fields}.')
+
+        query = self._copy()
+        query._resume_after = token_doc
+        return query
+
+    def partitions(self, partition_count: int) -> List[TemporalMongoQuery]:
+        """Split the query into up to partition_count independent sub-queries
+        by ranges of ObjectId of the version returned for each record.
+
+        Split points are chosen so that the ranges hold approximately the
+        same number of versions that match the query, using $bucketAuto for
+        MongoDB and sampled ObjectIds for other data sources. Because each
+        record is returned by the sub-query whose range contains ObjectId of
+        the version selected by the dataset lookup rules, the sub-queries
+        together return the same records as this query, each exactly once.
+
+        Sub-queries can be iterated concurrently from separate threads, or
+        pickled and sent to other processes where they reconnect to the
+        data source, provided it can be accessed from other processes.
+        Any sort_by(...) order applies within each sub-query.
+        """
+        if partition_count < 1:
+            raise Exception(f'Query partition_count={partition_count} must be positive.')
+
+        lower_bound, upper_bound = self._id_range if self._id_range is not None else (None, None)
+        split_points = self._get_split_points(partition_count) if partition_count > 1 else []
+        bounds = [lower_bound] + split_points + [upper_bound]
+
+        result = []
+        for range_start, range_end in zip(bounds[:-1], bounds[1:]):
+            query = self._copy()
+            query._id_range = (range_start, range_end)
+            result.append(query)
+        return result
+
+    def _get_split_points(self, partition_count: int) -> List[ObjectId]:
+        """Return up to partition_count - 1 ascending ObjectIds that split
+        the versions matching the query into ranges of similar size."""
+        head_collection = self._data_source.get_head_collection_or_none(self._type, self._load_from)
+        collection = head_collection if head_collection is not None else self._collection
+        id_field = '_vid' if head_collection is not None else '_id'
+
+        # Sort stages do not affect split points
+        pipeline = [stage for stage in self._get_filter_pipeline(id_field) if '$sort' not in stage]
+        pipeline = self._data_source.apply_final_constraints(pipeline, self._load_from)
+        pipeline.append({'$bucketAuto': {'groupBy': '$' + id_field, 'buckets': partition_count}})
+
+        buckets = list(collection.aggregate(pipeline, allowDiskUse=True))
+        return [bucket['_id']['min'] for bucket in buckets[1:]]
+
+    def _get_filter_pipeline(self, id_field: str) -> List[Dict[str, Any]]:
+        """Return a copy of the query pipeline with the ObjectId range of the
+        partition inserted before where(...) and sort_by(...) stages."""
+        pipeline = list(self._pipeline)
+        if self._id_range is not None:
+            range_start, range_end = self._id_range
+            id_condition = dict()
+            if range_start is not None:
+                id_condition['$gte'] = range_start
+            if range_end is not None:
+                id_condition['$lt'] = range_end
+            if id_condition:
+                pipeline.insert(1, {'$match': {id_field: id_condition}})
+        return pipeline
+
+    def _get_scan_pipeline(self, id_field: str) -> List[Dict[str, Any]]:
+        """Return the pipeline that selects candidate versions in the order
+        in which records are returned, by sort_by(...) attributes followed
+        by ObjectId, and after the checkpoint if the query is resumed."""
+        pipeline = [stage for stage in self._get_filter_pipeline(id_field) if '$sort' not in stage]
+        sort_spec = self.__get_sort_spec()
+        if not sort_spec:
+            pipeline = self._data_source.apply_final_constraints(pipeline, self._load_from)
+        if self._resume_after is not None:
+            pipeline.append({'$match': self._get_resume_predicate(id_field)})
+        sort_spec[id_field] = 1
+        pipeline.append({'$sort': sort_spec})
+        return pipeline
+
+    def _get_resume_predicate(self, id_field: str) -> Dict[str, Any]:
+        """Predicate that selects documents that follow the checkpoint in the order of the query."""
+        sort_items = list(self.__get_sort_spec().items()) + [(id_field, 1)]
+        values = list(self._resume_after['SortValues']) + [self._resume_after['Id']]
+
+        # Lexicographic comparison, equal on the leading attributes and following on the next one.
+        # Null and missing values are before all other values, as in MongoDB sort order, and are
+        # matched explicitly because comparison operators do not match null
+        conditions = []
+        for index, (field_name, direction) in enumerate(sort_items):
+            value = values[index]
+            if value is None:
+                following = [{'$ne': None}] if direction > 0 else []
+            elif direction > 0:
+                following = [{'$gt': value}]
+            else:
+                following = [{'$lt': value}, None]
+            for following_condition in following:
+                condition = {sort_items[x][0]: values[x] for x in range(index)}
+                condition[field_name] = following_condition
+                conditions.append(condition)
+        return {'$or': conditions}
+
+    def __get_sort_spec(self) -> Dict[str, int]:
+        """Return a copy of the sort specification of the query, empty if the query is not sorted."""
+        return dict(next((stage['$sort'] for stage in self._pipeline if '$sort' in stage), {}))
+
+    def _get_position(self, record: TRecord) -> Tuple[List[Any], ObjectId]:
+        """Values of sort_by(...) attributes and ObjectId of the record,
+        which determine its position in the order of the query."""
+        sort_values = []
+        for field_name in self.__get_sort_spec().keys():
+            # Attribute values are converted the same way as the values in where(...) predicates
+            value = record
+            for token_str in field_name.split('.'):
+                value = getattr(value, StringUtil.to_snake_case(token_str), None) if value is not None else None
+            sort_values.append(TemporalMongoQuery.__process_element(value))
+        return sort_values, record.id_
+
+    def _get_sort_directions(self) -> List[int]:
+        """Direction of each sort_by(...) attribute, 1 for ascending and -1 for descending."""
+        return list(self.__get_sort_spec().values())
+
+    def __take_checkpoint(self, record: TRecord) -> None:
+        """Set checkpoint to the position of the record in the order of the query."""
+        sort_values, record_id = self._get_position(record)
+        token_doc = {'SortFields': list(self.__get_sort_spec().keys()), 'SortValues': sort_values, 'Id': record_id}
+        self._checkpoint = base64.urlsafe_b64encode(bson.encode(token_doc)).decode('ascii')
+
+    def __with_checkpoints(self, records: Iterable[TRecord]) -> Iterable[TRecord]:
+        """Take checkpoint after each batch of records has been processed by the caller."""
+        count = 0
+        record = None
+        for record in records:
+            yield record
+            count += 1
+            if count % TemporalMongoQuery.__checkpoint_interval == 0:
+                self.__take_checkpoint(record)
+        if record is not None and count % TemporalMongoQuery.__checkpoint_interval != 0:
+            self.__take_checkpoint(record)
+
+    async def __awith_checkpoints(self, records: AsyncIterator[TRecord]) -> AsyncIterator[TRecord]:
+        """Asynchronous version of __with_checkpoints(...)."""
+        count = 0
+        record = None
+        async for record in records:
+            yield record
+            count += 1
+            if count % TemporalMongoQuery.__checkpoint_interval == 0:
+                self.__take_checkpoint(record)
+        if record is not None and count % TemporalMongoQuery.__checkpoint_interval != 0:
+            self.__take_checkpoint(record)
+
+    def _is_in_id_range(self, id_: ObjectId) -> bool:
+        """Returns true if ObjectId belongs to the ObjectId range of the query."""
+        if self._id_range is None:
+            return True
+        range_start, range_end = self._id_range
+        return (range_start is None or id_ >= range_start) and (range_end is None or id_ < range_end)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the query together with a descriptor of its data source,
+        from which the data source is created when the query is unpickled
+        in another process."""
+        from datacentric.storage.data_source_descriptor import DataSourceDescriptor
+        return {'descriptor': DataSourceDescriptor(self._data_source), 'type': self._type,
+                'load_from': self._load_from, 'pipeline': self._pipeline, 'include_fields': self._include_fields,
+                'key_partition': self._key_partition, 'id_range': self._id_range,
+                'resume_after': self._resume_after}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Create context and data source from the descriptor and restore the query."""
+        context = state['descriptor'].create_context(state['load_from'])
+        query = context.data_source.get_query(state['type'], state['load_from'])
+        self.__dict__.update(query.__dict__)
+        self._pipeline = state['pipeline']
+        self._include_fields = state['include_fields']
+        self._key_partition = state['key_partition']
+        self._id_range = state['id_range']
+        self._resume_after = state['resume_after']
+
+    def _with_key_partition(self, partition_index: int, partition_count: int) -> TemporalMongoQuery:
+        """Restrict the query to records where the hash of the key
+        modulo partition_count is equal to partition_index."""
+        query = self._copy()
+        query._key_partition = (partition_index, partition_count)
+        return query
+
+    def _is_in_key_partition(self, key_value: str) -> bool:
+        """Returns true if the key without collection name prefix belongs to the key partition of the query."""
+        if self._key_partition is None:
+            return True
+        partition_index, partition_count = self._key_partition
+        # Use a hash function that does not depend on the process, unlike hash(...) for str
+        return zlib.crc32(key_value.encode('utf-8')) % partition_count == partition_index
+
+    @property
+    def included(self) -> Dict[str, Optional[Record]]:
+        """Records referenced by the fields passed to include(...), by key,
+        for the query results that have already been iterated."""
+        return self._included
+
     def where(self, predicate: Dict[str, Any]) -> TemporalMongoQuery:
         """Filters a sequence of values based on passed dictionary parameter.
         Corresponds to appending $match stage to the pipeline.
@@ -68,8 +394,7 @@ class TemporalMongoQuery:
 
             TemporalMongoQuery.__fix_predicate_query(renamed_keys)
 
-            query = TemporalMongoQuery(self._type, self._data_source, self._collection, self._load_from)
-            query._pipeline = self._pipeline.copy()
+            query = self._copy()
             query._pipeline.append({'$match': renamed_keys})
             return query
         else:
@@ -136,16 +461,14 @@ class TemporalMongoQuery:
         """Sorts the elements of a sequence in ascending order according to provided attribute name."""
         # Adding sort argument since sort stage is already present.
         if self.__has_sort():
-            query = TemporalMongoQuery(self._type, self._data_source, self._collection, self._load_from)
-            query._pipeline = self._pipeline.copy()
+            query = self._copy()
             sorts = next(stage['$sort'] for stage in query._pipeline
                          if '$sort' in stage)
             sorts[StringUtil.to_pascal_case(attr)] = 1
             return query
         # append sort stage
         else:
-            query = TemporalMongoQuery(self._type, self._data_source, self._collection, self._load_from)
-            query._pipeline = self._pipeline.copy()
+            query = self._copy()
             query._pipeline.append({'$sort': {StringUtil.to_pascal_case(attr): 1}})
             return query
 
@@ -153,30 +476,88 @@ class TemporalMongoQuery:
         """Sorts the elements of a sequence in descending order according to provided attribute name."""
         # Adding sort argument since sort stage is already present.
         if self.__has_sort():
-            query = TemporalMongoQuery(self._type, self._data_source, self._collection, self._load_from)
-            query._pipeline = self._pipeline.copy()
+            query = self._copy()
             sorts = next(stage['$sort'] for stage in query._pipeline
                          if '$sort' in stage)
             sorts[StringUtil.to_pascal_case(attr)] = -1
             return query
         # append sort stage
         else:
-            query = TemporalMongoQuery(self._type, self._data_source, self._collection, self._load_from)
-            query._pipeline = self._pipeline.copy()
+            query = self._copy()
             query._pipeline.append({'$sort': {StringUtil.to_pascal_case(attr): -1}})
             return query
 
     def as_iterable(self) -> Iterable[TRecord]:
         """Applies aggregation on collection and returns its result as Iterable."""
-        if not self.__has_sort():
-            batch_queryable = self._data_source.apply_final_constraints(self._pipeline, self._load_from)
+        records = self._get_records() if self._cache is None else self.__get_cached_records()
+        if self._include_fields:
+            records = self.__with_includes(records)
+        return self.__with_checkpoints(records)
+
+    def __get_cached_records(self) -> Iterable[TRecord]:
+        """Load records for the ObjectIds cached for this query if the
+        watermark has not changed, otherwise run the query and cache
+        the ObjectIds of its records after they have all been iterated."""
+
+        # Watermark is taken before the query, so that any write
+        # during the query invalidates the cached result
+        watermark = self._data_source.get_max_id(self._type)
+        cache_key = self.__get_cache_key()
+        ids = self._cache.get(cache_key, watermark)
+
+        if ids is not None:
+            batch_size = TemporalMongoQuery.__include_batch_size
+            for batch_start in range(0, len(ids), batch_size):
+                batch = ids[batch_start:batch_start + batch_size]
+                for record in self._data_source.load_many_by_id(self._type, batch):
+                    if record is not None:
+                        yield record
+        else:
+            ids = []
+            for record in self._get_records():
+                ids.append(record.id_)
+                yield record
+            self._cache.put(cache_key, watermark, ids)
+
+    def __get_cache_key(self) -> str:
+        """Hash of everything that determines the result of the query,
+        where the order of fields within $match stages is normalized."""
+        pipeline = [stage if '$sort' in stage else TemporalMongoQuery.__normalize(stage)
+                    for stage in self._pipeline]
+        key_elements = (type(self._data_source).__name__, self._data_source.data_source_name,
+                        getattr(self._data_source, 'cutoff_time', None), self._type.__name__,
+                        self._load_from, pipeline, self._key_partition, self._id_range, self._resume_after)
+        return hashlib.sha256(repr(key_elements).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __normalize(value: Any) -> Any:
+        """Sort dictionary elements by name recursively, preserving the order of list items."""
+        if type(value) is dict:
+            return sorted((k, TemporalMongoQuery.__normalize(v)) for k, v in value.items())
+        elif type(value) is list:
+            return [TemporalMongoQuery.__normalize(x) for x in value]
+        else:
+            return value
+
+    def _get_records(self) -> Iterable[TRecord]:
+        """Applies aggregation on collection and returns its result as Iterable.
+
+        If the collection has head collection and it can be used for
+        the query, the aggregation is applied to the head collection
+        which has one version of each key per dataset.
+        """
+        head_collection = self._data_source.get_head_collection_or_none(self._type, self._load_from)
+        if head_collection is not None:
+            collection = head_collection
+            id_field = '_vid'
         else:
-            batch_queryable = self._pipeline
+            collection = self._collection
+            id_field = '_id'
 
-        projected_batch_queryable = batch_queryable
-        projected_batch_queryable.append({'$project': {'Id': '$_id', 'Key': '$_key', '_id': 0}})
+        projected_batch_queryable = self._get_scan_pipeline(id_field)
+        projected_batch_queryable.append({'$project': {'Id': '$' + id_field, 'Key': '$_key', '_id': 0}})
 
-        with self._collection.aggregate(projected_batch_queryable) as cursor:  # type: CommandCursor
+        with collection.aggregate(projected_batch_queryable, allowDiskUse=True) as cursor:  # type: CommandCursor
             batch_size = 1000
             continue_query = True
 
@@ -191,6 +572,8 @@ class TemporalMongoQuery:
                     if continue_query:
                         record_info = cursor.next()
                         batch_key = record_info['Key']
+                        if not self._is_in_key_partition(batch_key):
+                            continue
                         batch_id = record_info['Id']
                         if batch_key not in batch_keys_hash_set:
                             batch_keys_hash_set.add(batch_key)
@@ -206,17 +589,17 @@ class TemporalMongoQuery:
 
                 id_queryable: List[Dict[str, Any]] = [{'$match': {'_key': {'$in': list(batch_keys_hash_set)}}}]
                 id_queryable = self._data_source.apply_final_constraints(id_queryable, self._load_from)
-                id_queryable.append({'$sort': {'_key': 1, '_dataset': -1, '_id': -1}})
+                id_queryable.append({'$sort': {'_key': 1, '_dataset': -1, id_field: -1}})
 
                 projected_id_queryable = id_queryable
                 projected_id_queryable.append(
-                    {'$project': {'Id': '$_id', 'DataSet': '$_dataset', 'Key': '$_key', '_id': 0}})
+                    {'$project': {'Id': '$' + id_field, 'DataSet': '$_dataset', 'Key': '$_key', '_id': 0}})
 
                 imports_cutoff = self._data_source.get_imports_cutoff_time(self._load_from)
 
                 record_ids = []
                 current_key = None
-                for obj in self._collection.aggregate(projected_id_queryable):
+                for obj in collection.aggregate(projected_id_queryable):
                     obj_key = obj['Key']
                     if current_key == obj_key:
                         pass
@@ -229,14 +612,141 @@ class TemporalMongoQuery:
                                 record_ids.append(record_id)
 
                 if len(record_ids) == 0:
+                    # All versions in the batch are superseded, continue with the next batch
+                    continue
+
+                record_queryable = [{'$match': {id_field: {'$in': record_ids}}}]
+                record_dict = dict()
+                for record in collection.aggregate(record_queryable):
+                    if head_collection is not None:
+                        record = self._data_source.from_head_document(record)
+                    rec: TRecord = deserialize(record)
+                    record_dict[rec.id_] = rec
+
+                for batch_id in batch_ids_list:
+                    if batch_id in record_dict:
+                        yield record_dict[batch_id]
+
+    def __aiter__(self) -> AsyncIterator[TRecord]:
+        """Supports async for over the query, see as_async_iterable()."""
+        return self.as_async_iterable()
+
+    async def as_async_iterable(self) -> AsyncIterator[TRecord]:
+        """Applies aggregation on collection using PyMongo asyncio driver
+        and returns its result as async iterator."""
+        records = self._aget_records()
+        if self._include_fields:
+            records = self.__awith_includes(records)
+        async for record in self.__awith_checkpoints(records):
+            yield record
+
+    async def _aget_records(self) -> AsyncIterator[TRecord]:
+        """Applies aggregation on collection using PyMongo asyncio driver
+        and returns its result as async iterator.
+
+        Uses the same batched lookup as as_iterable() to select the
+        version of each record across multiple datasets, including
+        the use of head collection when it is available.
+        """
+        head_collection = self._data_source.get_async_head_collection_or_none(self._type, self._load_from)
+        if head_collection is not None:
+            collection = head_collection
+            id_field = '_vid'
+        else:
+            collection = self._data_source._get_or_create_async_collection(self._type)
+            id_field = '_id'
+
+        batch_queryable = self._get_scan_pipeline(id_field)
+        batch_queryable.append({'$project': {'Id': '$' + id_field, 'Key': '$_key', '_id': 0}})
+
+        imports_cutoff = self._data_source.get_imports_cutoff_time(self._load_from)
+        batch_size = 1000
+
+        cursor = await collection.aggregate(batch_queryable, allowDiskUse=True)
+        async with cursor:
+            continue_query = True
+            while continue_query:
+                batch_keys_hash_set: Set[str] = set()
+                batch_ids_hash_set: Set[ObjectId] = set()
+                batch_ids_list: List[ObjectId] = []
+
+                continue_query = False
+                async for record_info in cursor:
+                    if not self._is_in_key_partition(record_info['Key']):
+                        continue
+                    batch_keys_hash_set.add(record_info['Key'])
+                    batch_ids_hash_set.add(record_info['Id'])
+                    batch_ids_list.append(record_info['Id'])
+                    if len(batch_keys_hash_set) == batch_size:
+                        continue_query = True
+                        break
+                if not batch_ids_list:
                     break
 
-                record_queryable = [{'$match': {'_id': {'$in': record_ids}}}]
+                id_queryable: List[Dict[str, Any]] = [{'$match': {'_key': {'$in': list(batch_keys_hash_set)}}}]
+                id_queryable = self._data_source.apply_final_constraints(id_queryable, self._load_from)
+                id_queryable.append({'$sort': {'_key': 1, '_dataset': -1, id_field: -1}})
+                id_queryable.append(
+                    {'$project': {'Id': '$' + id_field, 'DataSet': '$_dataset', 'Key': '$_key', '_id': 0}})
+
+                record_ids = []
+                current_key = None
+                async for obj in await collection.aggregate(id_queryable):
+                    obj_key = obj['Key']
+                    if current_key != obj_key:
+                        record_id = obj['Id']
+                        record_data_set = obj['DataSet']
+                        if imports_cutoff is None or record_data_set == self._load_from or record_id < imports_cutoff:
+                            current_key = obj_key
+                            if record_id in batch_ids_hash_set:
+                                record_ids.append(record_id)
+
+                if len(record_ids) == 0:
+                    continue
+
                 record_dict = dict()
-                for record in self._collection.aggregate(record_queryable):
+                async for record in await collection.aggregate([{'$match': {id_field: {'$in': record_ids}}}]):
+                    if head_collection is not None:
+                        record = self._data_source.from_head_document(record)
                     rec: TRecord = deserialize(record)
                     record_dict[rec.id_] = rec
 
                 for batch_id in batch_ids_list:
                     if batch_id in record_dict:
                         yield record_dict[batch_id]
+
+    def __with_includes(self, records: Iterable[TRecord]) -> Iterable[TRecord]:
+        """Resolve referenced records for each batch of records before yielding the batch."""
+        from datacentric.storage.prefetch import prefetch
+
+        batch: List[TRecord] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == TemporalMongoQuery.__include_batch_size:
+                self._included.update(prefetch(batch, *self._include_fields, load_from=self._load_from,
+                                               data_source=self._data_source))
+                yield from batch
+                batch = []
+        if batch:
+            self._included.update(prefetch(batch, *self._include_fields, load_from=self._load_from,
+                                           data_source=self._data_source))
+            yield from batch
+
+    async def __awith_includes(self, records: AsyncIterator[TRecord]) -> AsyncIterator[TRecord]:
+        """Asynchronous version of __with_includes(...)."""
+        from datacentric.storage.prefetch import aprefetch
+
+        batch: List[TRecord] = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) == TemporalMongoQuery.__include_batch_size:
+                self._included.update(await aprefetch(batch, *self._include_fields, load_from=self._load_from,
+                                                      data_source=self._data_source))
+                for batch_record in batch:
+                    yield batch_record
+                batch = []
+        if batch:
+            self._included.update(await aprefetch(batch, *self._include_fields, load_from=self._load_from,
+                                                  data_source=self._data_source))
+            for batch_record in batch:
+                yield batch_record
@@ -0,0 +1,176 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import os
+import heapq
+import queue
+import traceback
+import multiprocessing
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datacentric.storage.mongo.temporal_mongo_query import TemporalMongoQuery
+
+_poll_seconds: float = 1.0
+"""Interval at which the parent process checks that workers are alive while waiting for results."""
+
+_queue_chunks: int = 4
+"""Number of chunks per worker that can wait in the queue before the worker waits for the parent process."""
+
+
+def parallel_map(query: TemporalMongoQuery, fn: Callable[[Any], Any], workers: Optional[int] = None,
+                 ordered: bool = True, chunk_size: int = 100) -> Iterable[Any]:
+    """
+    Apply fn to each record returned by the query in worker processes,
+    one process per partition of the key space. See the documentation
+    of TemporalMongoQuery.parallel_map(...) for details.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise Exception(f'Parallel map requires at least one worker, workers={workers}.')
+    if chunk_size < 1:
+        raise Exception(f'Parallel map chunk_size={chunk_size} must be positive.')
+
+    # Error message for data sources that cannot be accessed from other
+    # processes before any worker is started
+    query._data_source._check_process_shareable()
+
+    # Spawn starts workers without copying the state of the current
+    # process, including database clients that are not fork-safe
+    mp_context = multiprocessing.get_context('spawn')
+
+    # Queues are bounded, so that a worker can get at most a few chunks
+    # ahead of the caller before it waits. In ordered mode, each worker
+    # has its own queue, so that the parent can read the partition that
+    # holds the next result in the order of the query
+    if ordered:
+        result_queues = [mp_context.Queue(maxsize=_queue_chunks) for _ in range(workers)]
+    else:
+        result_queues = [mp_context.Queue(maxsize=_queue_chunks * workers)] * workers
+
+    # Each query is pickled together with the descriptor of its data source
+    processes = [mp_context.Process(target=_run_partition, daemon=True,
+                                    args=(query._with_key_partition(partition_index, workers), partition_index,
+                                          fn, chunk_size, ordered, result_queues[partition_index]))
+                 for partition_index in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        if ordered:
+            # Each partition is in the order of the query, merge them by
+            # the position of the record in that order
+            sort_directions = query._get_sort_directions()
+            partitions = [_receive(result_queues[x], processes, [x]) for x in range(workers)]
+            for position, result in heapq.merge(*partitions, key=lambda x: _OrderKey(x[0], sort_directions)):
+                yield result
+        else:
+            yield from _receive(result_queues[0], processes, list(range(workers)))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        for result_queue in set(result_queues):
+            result_queue.close()
+
+
+def _receive(result_queue: multiprocessing.Queue, processes: List[multiprocessing.Process],
+             partition_indices: List[int]) -> Iterable[Any]:
+    """Yield results sent to the queue by the specified partitions until all of them are done."""
+    remaining = set(partition_indices)
+
+    # A worker is reported as failed only if it was found to have exited
+    # without done message on two consecutive polls, because its last
+    # messages may still be in transit when it exits
+    exited = set()
+
+    while remaining:
+        try:
+            partition_index, message_type, payload = result_queue.get(timeout=_poll_seconds)
+        except queue.Empty:
+            for partition_index in sorted(remaining):
+                process = processes[partition_index]
+                if not process.is_alive():
+                    if partition_index in exited:
+                        raise Exception(f'Worker process for partition {partition_index} of parallel map '
+                                        f'exited with code {process.exitcode} before completing.')
+                    exited.add(partition_index)
+            continue
+
+        if message_type == 'error':
+            raise Exception(f'Parallel map failed in partition {partition_index}: {payload}')
+        elif message_type == 'done':
+            remaining.discard(partition_index)
+        else:
+            yield from payload
+
+
+class _OrderKey:
+    """
+    Position of the record in the order of the query, compared by sort
+    values in the direction of each sort_by(...) attribute, then by
+    ascending ObjectId. Null values are before all other values, and
+    values of different types that cannot be compared are compared
+    by type name.
+    """
+
+    __slots__ = ('sort_values', 'record_id', 'sort_directions')
+
+    def __init__(self, position: Tuple[List[Any], Any], sort_directions: List[int]):
+        self.sort_values, self.record_id = position
+        self.sort_directions = sort_directions
+
+    def __lt__(self, other: _OrderKey) -> bool:
+        for value, other_value, direction in zip(self.sort_values, other.sort_values, self.sort_directions):
+            comparison = _compare(value, other_value)
+            if comparison != 0:
+                return comparison * direction < 0
+        return self.record_id < other.record_id
+
+
+def _compare(value: Any, other_value: Any) -> int:
+    """Return -1, 0, or 1 depending on whether value is before, equal, or after other value."""
+    if value is None or other_value is None:
+        return (value is not None) - (other_value is not None)
+    try:
+        return (value > other_value) - (value < other_value)
+    except TypeError:
+        value_type, other_type = type(value).__name__, type(other_value).__name__
+        return (value_type > other_type) - (value_type < other_type)
+
+
+def _run_partition(query: TemporalMongoQuery, partition_index: int, fn: Callable[[Any], Any], chunk_size: int,
+                   ordered: bool, result_queue: multiprocessing.Queue) -> None:
+    """
+    Entry point of the worker process, sends results in chunks followed by
+    done or error message. In ordered mode, each result is sent together
+    with the position of its record in the order of the query.
+    """
+    try:
+        chunk = []
+        for record in query.as_iterable():
+            result = fn(record)
+            chunk.append((query._get_position(record), result) if ordered else result)
+            if len(chunk) == chunk_size:
+                result_queue.put((partition_index, 'results', chunk))
+                chunk = []
+        if chunk:
+            result_queue.put((partition_index, 'results', chunk))
+        result_queue.put((partition_index, 'done', None))
+    except BaseException:
+        result_queue.put((partition_index, 'error', traceback.format_exc()))
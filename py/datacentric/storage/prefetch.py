@@ -0,0 +1,122 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+from typing import Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+from datacentric.storage.record import Record
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.data_source import DataSource
+
+_prefetch_batch_size: int = 1000
+"""Maximum number of keys passed to one load_many(...) call."""
+
+
+def prefetch(records: Iterable[Record], *field_names: str, load_from: ObjectId = None,
+             data_source: DataSource = None) -> Dict[str, Optional[Record]]:
+    """
+    Load records referenced by key fields of the specified records and
+    return a dictionary from each referenced key to the loaded record,
+    or to None if the referenced record is not found or is deleted.
+
+    Each field name must refer to an element declared with key metadata,
+    for example LogEntry.log with metadata={'key': 'Log'}, which holds
+    either a single key or a list of keys. Distinct referenced keys are
+    collected for each target collection and resolved in batches using
+    load_many(...), instead of one load_by_key(...) call for each record:
+
+    referenced = prefetch(entries, 'log')
+    for entry in entries:
+        log = referenced[entry.log]
+
+    The lookup uses load_from dataset and data_source if specified,
+    otherwise context.data_set and context.data_source of the first
+    record.
+    """
+    records = list(records)
+    if not records:
+        return dict()
+
+    data_source, load_from = _get_lookup_source(records, data_source, load_from)
+    result: Dict[str, Optional[Record]] = dict()
+    for record_type, batch in _get_key_batches(records, field_names):
+        result.update(zip(batch, data_source.load_many(record_type, batch, load_from)))
+    return result
+
+
+async def aprefetch(records: Iterable[Record], *field_names: str, load_from: ObjectId = None,
+                    data_source: DataSource = None) -> Dict[str, Optional[Record]]:
+    """Asynchronous version of prefetch(...) for use with asyncio,
+    resolves referenced keys in batches using aload_many(...).
+    """
+    records = list(records)
+    if not records:
+        return dict()
+
+    data_source, load_from = _get_lookup_source(records, data_source, load_from)
+    result: Dict[str, Optional[Record]] = dict()
+    for record_type, batch in _get_key_batches(records, field_names):
+        result.update(zip(batch, await data_source.aload_many(record_type, batch, load_from)))
+    return result
+
+
+def _get_lookup_source(records: List[Record], data_source: Optional[DataSource],
+                       load_from: Optional[ObjectId]) -> Tuple[DataSource, ObjectId]:
+    """Return data source and dataset for the lookup, taking defaults from the context of the first record."""
+    if data_source is None or load_from is None:
+        context = records[0].context
+        if context is None:
+            raise Exception(f'Record {records[0].to_key()} does not have context, specify '
+                            f'data_source and load_from to prefetch referenced records.')
+        if data_source is None:
+            data_source = context.data_source
+        if load_from is None:
+            load_from = context.data_set
+    return data_source, load_from
+
+
+def _get_key_batches(records: List[Record], field_names: Tuple[str, ...]) -> Iterable[Tuple[type, List[str]]]:
+    """
+    Collect distinct keys referenced by the fields for each target
+    collection, and yield them in batches together with the type
+    of the target collection.
+    """
+    # Keys for each collection in the order of first reference, dict is used as ordered set
+    collection_keys: Dict[str, Dict[str, None]] = dict()
+    for field_name in field_names:
+        for record in records:
+            collection_name = _get_key_collection(type(record), field_name)
+            value = getattr(record, field_name)
+            if value is None:
+                continue
+            keys = value if isinstance(value, list) else [value]
+            collection_keys.setdefault(collection_name, dict()).update((x, None) for x in keys if x is not None)
+
+    for collection_name, keys in collection_keys.items():
+        record_type = ClassInfo.get_type(collection_name)
+        keys = list(keys)
+        for batch_start in range(0, len(keys), _prefetch_batch_size):
+            yield record_type, keys[batch_start:batch_start + _prefetch_batch_size]
+
+
+def _get_key_collection(record_type: type, field_name: str) -> str:
+    """Return collection name from key metadata of the field, error message if not a key field."""
+    field = attr.fields_dict(record_type).get(field_name)
+    if field is None:
+        raise Exception(f'Type {record_type.__name__} does not have field {field_name}.')
+    collection_name = field.metadata.get('key')
+    if collection_name is None:
+        raise Exception(f'Field {field_name} of type {record_type.__name__} is not a key field, '
+                        f'declare it with key metadata to prefetch referenced records.')
+    return collection_name
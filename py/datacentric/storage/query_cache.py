@@ -0,0 +1,177 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
+from bson import ObjectId
+
+
+class QueryCache:
+    """
+    Least recently used cache of query results, stored as the list
+    of ObjectIds of the records returned by each query.
+
+    Use query.with_cache(cache) to opt in. The cache key is a hash of
+    the normalized query pipeline together with the record type, data
+    source, load_from dataset, cutoff time and partition of the query.
+    Each entry also holds the greatest ObjectId in the collection at the
+    time the query was run. Because every save and delete writes a version
+    with a new ObjectId, the entry is reused only if this watermark has
+    not changed, which is checked with one indexed lookup before reuse.
+    Otherwise the entry is discarded and the query is run again.
+
+    Entries are evicted in least recently used order when the estimated
+    memory size of the cached ObjectId lists exceeds max_bytes.
+
+    The cache can be shared by queries from multiple threads.
+    """
+
+    __slots__ = ('__max_bytes', '__entries', '__size_bytes', '__lock',
+                 '__hits', '__misses', '__invalidations', '__evictions')
+
+    __max_bytes: int
+    __entries: OrderedDict
+    __size_bytes: int
+    __lock: threading.Lock
+    __hits: int
+    __misses: int
+    __invalidations: int
+    __evictions: int
+
+    __id_size: int = sys.getsizeof(ObjectId()) + sys.getsizeof(ObjectId().binary)
+    """Estimated memory size of one ObjectId including its binary value."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """Create cache where the estimated size of cached results does not exceed max_bytes."""
+
+        if max_bytes < 1:
+            raise Exception(f'Query cache max_bytes={max_bytes} must be positive.')
+
+        self.__max_bytes = max_bytes
+        """Entries are evicted when the estimated size of cached results exceeds this value."""
+
+        self.__entries = OrderedDict()
+        """Watermark, ObjectIds and estimated size by cache key, in least recently used order."""
+
+        self.__size_bytes = 0
+        """Estimated memory size of all cached results."""
+
+        self.__lock = threading.Lock()
+        """Lock for access from multiple threads."""
+
+        self.__hits = 0
+        """Number of lookups where the cached result was reused."""
+
+        self.__misses = 0
+        """Number of lookups where the result was not cached or was invalidated."""
+
+        self.__invalidations = 0
+        """Number of entries discarded because the watermark has changed."""
+
+        self.__evictions = 0
+        """Number of entries discarded to stay within max_bytes."""
+
+    @property
+    def max_bytes(self) -> int:
+        """Entries are evicted when the estimated size of cached results exceeds this value."""
+        return self.__max_bytes
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated memory size of all cached results."""
+        return self.__size_bytes
+
+    @property
+    def entry_count(self) -> int:
+        """Number of cached results."""
+        return len(self.__entries)
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups where the cached result was reused."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups where the result was not cached or was invalidated."""
+        return self.__misses
+
+    @property
+    def invalidations(self) -> int:
+        """Number of entries discarded because the watermark has changed."""
+        return self.__invalidations
+
+    @property
+    def evictions(self) -> int:
+        """Number of entries discarded to stay within max_bytes."""
+        return self.__evictions
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return cache metrics as dictionary, for example to write them to the log."""
+        with self.__lock:
+            return {'Hits': self.__hits, 'Misses': self.__misses, 'Invalidations': self.__invalidations,
+                    'Evictions': self.__evictions, 'Entries': len(self.__entries),
+                    'SizeBytes': self.__size_bytes}
+
+    def get(self, key: str, watermark: Optional[ObjectId]) -> Optional[List[ObjectId]]:
+        """
+        Return cached ObjectIds for the key, or None if the result is not
+        cached or was cached for a different watermark, in which case
+        the entry is discarded.
+        """
+        with self.__lock:
+            entry: Optional[Tuple[Optional[ObjectId], List[ObjectId], int]] = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            entry_watermark, ids, size = entry
+            if entry_watermark != watermark:
+                del self.__entries[key]
+                self.__size_bytes -= size
+                self.__invalidations += 1
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return ids
+
+    def put(self, key: str, watermark: Optional[ObjectId], ids: List[ObjectId]) -> None:
+        """
+        Cache ObjectIds for the key and watermark, evicting least recently
+        used entries as necessary. Results larger than max_bytes are not cached.
+        """
+        size = sys.getsizeof(ids) + len(ids) * QueryCache.__id_size
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size_bytes -= previous[2]
+            if size > self.__max_bytes:
+                return
+
+            self.__entries[key] = (watermark, ids, size)
+            self.__size_bytes += size
+            while self.__size_bytes > self.__max_bytes:
+                evicted_key, (evicted_watermark, evicted_ids, evicted_size) = self.__entries.popitem(last=False)
+                self.__size_bytes -= evicted_size
+                self.__evictions += 1
+
+    def clear(self) -> None:
+        """Discard all cached results without resetting the metrics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size_bytes = 0
@@ -0,0 +1,46 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+from typing import Optional
+from bson import ObjectId
+from datacentric.storage.change_type import ChangeType
+
+
+@attr.s(slots=True, auto_attribs=True)
+class RecordChange:
+    """
+    Change to the record for one key between two cutoff times,
+    returned by DataSource.diff(...).
+    """
+
+    key: str = attr.ib(default=None, kw_only=True)
+    """Record key including the collection name prefix."""
+
+    change_type: ChangeType = attr.ib(default=None, kw_only=True)
+    """Specifies whether the record was added, changed, or deleted."""
+
+    previous_id: Optional[ObjectId] = attr.ib(default=None, kw_only=True)
+    """
+    TemporalId of the version selected by the lookup rules as of the
+    earlier cutoff time, which may be a DeletedRecord, or None if
+    there was no version of the record.
+    """
+
+    current_id: Optional[ObjectId] = attr.ib(default=None, kw_only=True)
+    """
+    TemporalId of the version selected by the lookup rules as of the
+    later cutoff time, which may be a DeletedRecord, or None if
+    there is no version of the record.
+    """
@@ -0,0 +1,204 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import bson
+import mmap
+import struct
+from typing import Dict, Any, Iterable, Optional, List, Tuple
+from bson import ObjectId
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+
+
+class SnapshotCollection:
+    """
+    Read-only access to one collection of a dataset snapshot.
+
+    The collection is stored in two files:
+
+    * Data file (.bson) with concatenated BSON documents, one for each key
+    * Index file (.idx) with fixed width entries sorted by key, followed by
+      fixed width entries sorted by ObjectId, followed by UTF-8 key bytes
+
+    Both files are memory-mapped in read-only mode, so that opening
+    the collection does not read the data and the pages are shared
+    across processes via the OS page cache. Documents are decoded
+    only when accessed.
+    """
+
+    __slots__ = ('__name', '__data_file', '__index_file', '__data', '__index', '__count')
+
+    manifest_file_name: str = 'snapshot.bson'
+    """Name of the file with snapshot dataset, cutoff time, and the list of collections."""
+
+    magic: bytes = b'DCSNAP01'
+    """Signature at the start of index file, includes format version."""
+
+    header_format: struct.Struct = struct.Struct('<8sQ')
+    """Index file header: magic and the number of documents."""
+
+    key_entry_format: struct.Struct = struct.Struct('<QIQI')
+    """Key index entry: key position, key length, document position, document length."""
+
+    id_entry_format: struct.Struct = struct.Struct('<12sQI')
+    """ObjectId index entry: ObjectId bytes, document position, document length."""
+
+    codec_options = DEFAULT_CODEC_OPTIONS.with_options(tz_aware=True)
+    """Decode UTC datetime as timezone aware, the same way as MongoDB data source."""
+
+    def __init__(self, folder_path: str, name: str):
+        """Memory-map data and index files for the collection with the specified name."""
+
+        self.__name = name
+        self.__data_file = open(os.path.join(folder_path, name + '.bson'), 'rb')
+        self.__index_file = open(os.path.join(folder_path, name + '.idx'), 'rb')
+
+        # Empty files cannot be memory-mapped
+        self.__data = None
+        if os.fstat(self.__data_file.fileno()).st_size > 0:
+            self.__data = mmap.mmap(self.__data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__index = mmap.mmap(self.__index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.__count = SnapshotCollection.header_format.unpack_from(self.__index, 0)
+        if magic != SnapshotCollection.magic:
+            raise Exception(f'Index file for snapshot collection {name} has unknown format.')
+
+    @property
+    def name(self) -> str:
+        """Collection name."""
+        return self.__name
+
+    def count(self) -> int:
+        """Number of documents in the collection."""
+        return self.__count
+
+    def find_one(self, id_: ObjectId) -> Optional[Dict[str, Any]]:
+        """Return decoded document for the specified ObjectId, or None if not found."""
+        id_bytes = id_.binary
+        id_section = SnapshotCollection.header_format.size + self.__count * SnapshotCollection.key_entry_format.size
+        entry_size = SnapshotCollection.id_entry_format.size
+
+        # Binary search in ObjectId section of the index
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry_id, position, length = SnapshotCollection.id_entry_format.unpack_from(
+                self.__index, id_section + mid * entry_size)
+            if entry_id < id_bytes:
+                lo = mid + 1
+            elif entry_id > id_bytes:
+                hi = mid
+            else:
+                return self.__decode(position, length)
+        return None
+
+    def find_by_key(self, key_value: str) -> Optional[Dict[str, Any]]:
+        """
+        Return decoded document for the specified key, or None if not found.
+        Key value must not include the collection name prefix.
+        """
+        key_bytes = key_value.encode('utf-8')
+
+        # Binary search in key section of the index, keys are sorted as UTF-8 bytes
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry_key, position, length = self.__read_key_entry(mid)
+            if entry_key < key_bytes:
+                lo = mid + 1
+            elif entry_key > key_bytes:
+                hi = mid
+            else:
+                return self.__decode(position, length)
+        return None
+
+    def find_all(self) -> Iterable[Dict[str, Any]]:
+        """Iterate over decoded documents in the order of keys."""
+        for i in range(self.__count):
+            entry_key, position, length = self.__read_key_entry(i)
+            yield self.__decode(position, length)
+
+    def find_all_by_id(self) -> Iterable[Dict[str, Any]]:
+        """Iterate over decoded documents in the order of ObjectIds."""
+        id_section = SnapshotCollection.header_format.size + self.__count * SnapshotCollection.key_entry_format.size
+        entry_size = SnapshotCollection.id_entry_format.size
+        for i in range(self.__count):
+            entry_id, position, length = SnapshotCollection.id_entry_format.unpack_from(
+                self.__index, id_section + i * entry_size)
+            yield self.__decode(position, length)
+
+    def find_max_id(self) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the collection, or None if the collection is empty."""
+        if self.__count == 0:
+            return None
+        id_section = SnapshotCollection.header_format.size + self.__count * SnapshotCollection.key_entry_format.size
+        entry_id, position, length = SnapshotCollection.id_entry_format.unpack_from(
+            self.__index, id_section + (self.__count - 1) * SnapshotCollection.id_entry_format.size)
+        return ObjectId(entry_id)
+
+    def close(self) -> None:
+        """Release memory maps and close the files."""
+        if self.__data is not None:
+            self.__data.close()
+        self.__index.close()
+        self.__data_file.close()
+        self.__index_file.close()
+
+    def __read_key_entry(self, index: int) -> Tuple[bytes, int, int]:
+        """Return key bytes, document position and document length for the entry in key section."""
+        key_position, key_length, position, length = SnapshotCollection.key_entry_format.unpack_from(
+            self.__index, SnapshotCollection.header_format.size + index * SnapshotCollection.key_entry_format.size)
+        return self.__index[key_position:key_position + key_length], position, length
+
+    def __decode(self, position: int, length: int) -> Dict[str, Any]:
+        """Decode document at the specified position of the data file."""
+        return bson.decode(self.__data[position:position + length], codec_options=SnapshotCollection.codec_options)
+
+    @staticmethod
+    def write(folder_path: str, name: str, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write serialized documents to data and index files for the collection
+        with the specified name, and return the number of documents written.
+
+        Each document must have _id and _key elements, and keys must be unique.
+        """
+
+        # Documents are written in the order received, the index
+        # is sorted after all documents have been written
+        entries: List[Tuple[bytes, bytes, int, int]] = []
+        with open(os.path.join(folder_path, name + '.bson'), 'wb') as data_file:
+            position = 0
+            for document in documents:
+                payload = bson.encode(document, codec_options=SnapshotCollection.codec_options)
+                data_file.write(payload)
+                entries.append((document['_key'].encode('utf-8'), document['_id'].binary, position, len(payload)))
+                position += len(payload)
+
+        entries.sort(key=lambda x: x[0])
+        count = len(entries)
+        key_section_size = count * SnapshotCollection.key_entry_format.size
+        id_section_size = count * SnapshotCollection.id_entry_format.size
+        key_position = SnapshotCollection.header_format.size + key_section_size + id_section_size
+
+        with open(os.path.join(folder_path, name + '.idx'), 'wb') as index_file:
+            index_file.write(SnapshotCollection.header_format.pack(SnapshotCollection.magic, count))
+            for key_bytes, id_bytes, position, length in entries:
+                index_file.write(SnapshotCollection.key_entry_format.pack(key_position, len(key_bytes), position, length))
+                key_position += len(key_bytes)
+            for key_bytes, id_bytes, position, length in sorted(entries, key=lambda x: x[1]):
+                index_file.write(SnapshotCollection.id_entry_format.pack(id_bytes, position, length))
+            for key_bytes, id_bytes, position, length in entries:
+                index_file.write(key_bytes)
+
+        return count
@@ -0,0 +1,210 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import attr
+import bson
+from typing import Dict, Optional, TypeVar, Iterable, Type, Any
+from bson import ObjectId
+from datacentric.storage.context import Context
+from datacentric.storage.record import Record
+from datacentric.storage.deleted_record import DeletedRecord
+from datacentric.storage.data_set import DataSet
+from datacentric.storage.data_source import DataSource
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.snapshot.snapshot_collection import SnapshotCollection
+from datacentric.storage.snapshot.snapshot_query import SnapshotQuery
+from datacentric.serialization.serializer import deserialize
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+@attr.s(slots=True, auto_attribs=True)
+class SnapshotDataSource(DataSource):
+    """
+    Read-only data source for a dataset snapshot written by SnapshotWriter.
+
+    The snapshot contains the resolved state of a single dataset, including
+    records loaded through its imports, as of the cutoff time of the data
+    source from which it was exported. Each collection is memory-mapped
+    when first accessed and records are decoded only when loaded, so that
+    opening a large snapshot is fast and its pages are shared by all
+    processes that open the same files.
+
+    Only the dataset from which the snapshot was exported can be used
+    as load_from argument. All write methods raise an error.
+    """
+
+    snapshot_folder_path: str = attr.ib(default=None, kw_only=True)
+    """Path to the folder where snapshot files are located."""
+
+    __manifest: Dict[str, Any] = attr.ib(default=None, init=False)
+    __collection_dict: Dict[str, SnapshotCollection] = attr.ib(factory=dict, init=False)
+
+    def init(self, context: Context) -> None:
+        """
+        Set Context property and perform validation of the record's data,
+        then initialize any fields or properties that depend on that data.
+
+        This method may be called multiple times for the same instance,
+        possibly with a different context parameter for each subsequent call.
+
+        IMPORTANT - Every override of this method must call base.Init()
+        first, and only then execute the rest of the override method's code.
+        """
+
+        # Initialize base before executing the rest of the code in this method
+        super().init(context)
+
+        if not self.snapshot_folder_path:
+            raise Exception('Snapshot data source folder path is not specified.')
+
+        # Snapshot is always read only
+        self.read_only = True
+
+        with open(os.path.join(self.snapshot_folder_path, SnapshotCollection.manifest_file_name), 'rb') as file:
+            self.__manifest = bson.decode(file.read())
+
+    @property
+    def data_set_id(self) -> ObjectId:
+        """TemporalId of the dataset from which the snapshot was exported."""
+        return self.__manifest['DataSet']
+
+    @property
+    def cutoff_time(self) -> Optional[ObjectId]:
+        """CutoffTime of the data source from which the snapshot was exported, or None."""
+        return self.__manifest.get('CutoffTime')
+
+    def create_ordered_object_id(self) -> ObjectId:
+        raise Exception(f'Snapshot data source {self.data_source_name} is read only.')
+
+    def load_or_null(self, record_type: Type[TRecord], id_: ObjectId) -> Optional[TRecord]:
+        """Load record by its ObjectId.
+
+        Only the record versions included in the snapshot can be loaded.
+        """
+        collection = self._get_collection_or_none(record_type)
+        if collection is None:
+            return None
+
+        document = collection.find_one(id_)
+        if document is not None:
+            result: TRecord = deserialize(document)
+
+            if result is not None and not isinstance(result, DeletedRecord):
+
+                is_requested_instance = isinstance(result, record_type)
+                if not is_requested_instance:
+                    raise Exception(f'Stored type {type(result).__name__} for ObjectId={id_} and '
+                                    f'Key={result.to_key()} is not an instance of the requested type '
+                                    f'{record_type.__name__}.')
+                result.init(self.context)
+                return result
+        return None
+
+    def load_or_null_by_key(self, type_: Type[TRecord], key_: str, load_from: ObjectId) -> Optional[TRecord]:
+        """Load record by string key from the snapshot.
+
+        The snapshot contains the version of each record selected by
+        the lookup rules at the time of export, therefore load_from
+        must be the dataset from which the snapshot was exported.
+
+        Return None if there is no record for the specified key;
+        however an exception will be thrown if the record exists but
+        is not derived from TRecord.
+        """
+        self._check_load_from(load_from)
+        collection_name, key_value = key_.split('=', 1)
+
+        collection = self._get_collection_or_none(type_)
+        if collection is None:
+            return None
+
+        document = collection.find_by_key(key_value)
+        if document is not None:
+            result: TRecord = deserialize(document)
+
+            if result is not None and not isinstance(result, DeletedRecord):
+
+                is_proper_record = isinstance(result, type_)
+                if not is_proper_record:
+                    raise Exception(f'Stored type {type(result).__name__} for Key={key_} in '
+                                    f'data_set={load_from} is not an instance of '
+                                    f'the requested type {type_.__name__}.')
+                result.init(self.context)
+                return result
+        return None
+
+    def get_query(self, record_type: Type[TRecord], load_from: ObjectId) -> SnapshotQuery:
+        """Get query for the specified type.
+
+        The query returns the version of each record selected by the
+        lookup rules at the time of export, therefore load_from must be
+        the dataset from which the snapshot was exported.
+        """
+        self._check_load_from(load_from)
+        collection = self._get_collection_or_none(record_type)
+        if collection is None:
+            raise Exception(f'Collection {ClassInfo.get_ultimate_base(record_type).__name__} '
+                            f'is not included in the snapshot.')
+        return SnapshotQuery(record_type, self, collection, load_from)
+
+    def get_max_id(self, record_type: Type[TRecord]) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the snapshot collection for record_type,
+        or None if the collection is empty or not included in the snapshot."""
+        collection = self._get_collection_or_none(record_type)
+        return collection.find_max_id() if collection is not None else None
+
+    def save_many(self, record_type: Type[TRecord], records: Iterable[TRecord], save_to: ObjectId) -> None:
+        raise Exception(f'Snapshot data source {self.data_source_name} is read only.')
+
+    def delete(self, record_type: Type[TRecord], key: str, delete_in: ObjectId) -> None:
+        raise Exception(f'Snapshot data source {self.data_source_name} is read only.')
+
+    def delete_db(self) -> None:
+        raise Exception(f'Snapshot data source {self.data_source_name} is read only.')
+
+    def get_data_set_or_none(self, data_set_name: str) -> Optional[ObjectId]:
+        """Get ObjectId of the dataset with the specified name.
+        Returns null if the snapshot was not exported from this dataset.
+        """
+        if data_set_name == self.__manifest['DataSetName']:
+            return self.__manifest['DataSet']
+        return None
+
+    def save_data_set(self, data_set: DataSet) -> None:
+        raise Exception(f'Snapshot data source {self.data_source_name} is read only.')
+
+    def close(self) -> None:
+        """Release memory maps and close snapshot files."""
+        for collection in self.__collection_dict.values():
+            collection.close()
+        self.__collection_dict.clear()
+
+    def _check_load_from(self, load_from: ObjectId) -> None:
+        """Error message if load_from is not the dataset from which the snapshot was exported."""
+        if load_from != self.__manifest['DataSet']:
+            raise Exception(f'Snapshot in {self.snapshot_folder_path} was exported from dataset '
+                            f'with TemporalId={self.__manifest["DataSet"]} and cannot be used '
+                            f'to load from dataset with TemporalId={load_from}.')
+
+    def _get_collection_or_none(self, type_: type) -> Optional[SnapshotCollection]:
+        collection_name = ClassInfo.get_ultimate_base(type_).__name__
+        collection = self.__collection_dict.get(collection_name)
+        if collection is None:
+            if collection_name not in self.__manifest['Collections']:
+                return None
+            collection = SnapshotCollection(self.snapshot_folder_path, collection_name)
+            self.__collection_dict[collection_name] = collection
+        return collection
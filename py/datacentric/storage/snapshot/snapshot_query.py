@@ -0,0 +1,51 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from typing import Iterable, Dict, Any, TypeVar, TYPE_CHECKING
+from bson import ObjectId
+
+from datacentric.storage.record import Record
+from datacentric.storage.memory.temporal_memory_query import TemporalMemoryQuery
+from datacentric.serialization.serializer import deserialize
+
+if TYPE_CHECKING:
+    from datacentric.storage.snapshot.snapshot_collection import SnapshotCollection
+    from datacentric.storage.snapshot.snapshot_data_source import SnapshotDataSource
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+class SnapshotQuery(TemporalMemoryQuery):
+    """Implements query methods for dataset snapshot data source.
+
+    The snapshot already contains a single resolved version of each key,
+    so the $match and $sort stages built by TemporalMongoQuery are
+    evaluated directly against the documents decoded from the
+    memory-mapped data file.
+    """
+
+    def __init__(self, record_type: type, data_source: SnapshotDataSource, collection: SnapshotCollection,
+                 load_from: ObjectId):
+        super().__init__(record_type, data_source, collection, load_from)
+
+    def _select_documents(self) -> Iterable[Dict[str, Any]]:
+        """Iterate over documents decoded from the snapshot in the order of ObjectIds."""
+        return self._collection.find_all_by_id()
+
+    def _to_record(self, document: Dict[str, Any]) -> TRecord:
+        """Deserialize the decoded document, which is not shared with other queries."""
+        result: TRecord = deserialize(document)
+        result.init(self._data_source.context)
+        return result
@@ -0,0 +1,75 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import bson
+from typing import Iterable, Dict, List
+from datacentric.storage.data_source import DataSource
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.snapshot.snapshot_collection import SnapshotCollection
+from datacentric.serialization.serializer import serialize
+
+
+class SnapshotWriter:
+    """
+    Exports the resolved state of a dataset to snapshot files that
+    can be opened using SnapshotDataSource.
+
+    For each collection, the snapshot includes the version of each key
+    selected by the lookup rules of the data source, which includes
+    records loaded through the dataset imports and takes into account
+    CutoffTime if it is set for the data source. Keys for which the
+    selected version is a DeletedRecord are not included.
+    """
+
+    @classmethod
+    def write_snapshot(cls, data_source: DataSource, data_set_name: str, record_types: Iterable[type],
+                       folder_path: str) -> Dict[str, int]:
+        """
+        Write snapshot of the dataset with the specified name to folder_path,
+        one data file and one index file per collection, and return the
+        number of records written for each collection.
+
+        Collections are determined by the ultimate base class of each
+        element of record_types.
+        """
+        load_from = data_source.get_data_set(data_set_name)
+
+        root_types: List[type] = []
+        for record_type in record_types:
+            root_type = ClassInfo.get_ultimate_base(record_type)
+            if root_type not in root_types:
+                root_types.append(root_type)
+
+        os.makedirs(folder_path, exist_ok=True)
+
+        result: Dict[str, int] = dict()
+        for root_type in root_types:
+            query = data_source.get_query(root_type, load_from)
+            documents = (serialize(record) for record in query.as_iterable())
+            result[root_type.__name__] = SnapshotCollection.write(folder_path, root_type.__name__, documents)
+
+        # Manifest is written last, so that incomplete snapshot cannot be opened
+        manifest = {
+            'DataSetName': data_set_name,
+            'DataSet': load_from,
+            'Collections': list(result.keys())
+        }
+        cutoff_time = getattr(data_source, 'cutoff_time', None)
+        if cutoff_time is not None:
+            manifest['CutoffTime'] = cutoff_time
+        with open(os.path.join(folder_path, SnapshotCollection.manifest_file_name), 'wb') as file:
+            file.write(bson.encode(manifest))
+
+        return result
@@ -0,0 +1,765 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+import bson
+import sqlite3
+from typing import Dict, Optional, TypeVar, Set, Iterable, Type, List, Any, Tuple
+from bson import ObjectId
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+from datacentric.storage.context import Context
+from datacentric.storage.record import Record
+from datacentric.storage.deleted_record import DeletedRecord
+from datacentric.storage.data_set import DataSet
+from datacentric.storage.data_source import DataSource
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.sqlite.temporal_sqlite_query import TemporalSqliteQuery
+from datacentric.serialization.serializer import serialize, deserialize
+from datacentric.storage.temporal_id import empty_id
+from datacentric.storage.versioning_method import VersioningMethod
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+@attr.s(slots=True, auto_attribs=True)
+class TemporalSqliteDataSource(DataSource):
+    """
+    Temporal data source with datasets based on embedded SQLite database.
+
+    Each collection, determined by the ultimate base class of the record,
+    is stored in its own table where the record is kept as BSON payload
+    together with its ObjectId, dataset ObjectId, key, and inheritance
+    chain. ObjectIds are stored as 12 byte BLOBs which are ordered the
+    same way as ObjectIds. A covering index on (key, dataset desc, id desc)
+    is used to select the version of each key according to the lookup
+    rules using SQL window functions.
+
+    File databases are opened in WAL journal mode, which permits
+    concurrent readers in other processes while a single writer
+    is active.
+
+    The term Temporal applied means the data source stores complete revision
+    history including copies of all previous versions of each record.
+
+    In addition to being temporal, this data source is also hierarchical; the
+    records are looked up across a hierarchy of datasets, including the dataset
+    itself, its direct Imports, Imports of Imports, etc., ordered by dataset's
+    TemporalId.
+    """
+
+    db_file_path: str = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """
+    Path to SQLite database file.
+
+    In-memory database that is not shared with other connections
+    is used if not specified.
+    """
+
+    cutoff_time: ObjectId = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """
+    Records with TemporalId that is greater than or equal to CutoffTime
+    will be ignored by load methods and queries, and the latest available
+    record where TemporalId is less than CutoffTime will be returned instead.
+
+    CutoffTime applies to both the records stored in the dataset itself,
+    and the reports loaded through the Imports list.
+    """
+
+    __connection: sqlite3.Connection = attr.ib(default=None, init=False)
+    """SQLite database connection."""
+
+    __table_dict: Dict[type, str] = attr.ib(factory=dict, init=False)
+    __data_set_dict: Dict[str, ObjectId] = attr.ib(factory=dict, init=False)
+    __import_dict: Dict[ObjectId, Set[ObjectId]] = attr.ib(factory=dict, init=False)
+    __imports_cutoff_dict: Dict[ObjectId, Optional[ObjectId]] = attr.ib(factory=dict, init=False)
+
+    __prev_object_id: ObjectId = attr.ib(default=empty_id, init=False)
+    """
+    Previous ObjectId generated by this instance of the data source.
+
+    This variable is used to ensure generation of ObjectIds in
+    strictly increasing order.
+    """
+
+    __codec_options = DEFAULT_CODEC_OPTIONS.with_options(tz_aware=True)
+    """
+    By default, UTC datetime is decoded from BSON as timezone naive.
+    This setting changes that to match the MongoDB data source.
+    """
+
+    __max_keys_per_select = 500
+    """Maximum number of keys in one IN clause, keeps the number of SQL parameters within SQLite limit."""
+
+    def init(self, context: Context) -> None:
+        """
+        Set Context property and perform validation of the record's data,
+        then initialize any fields or properties that depend on that data.
+
+        This method may be called multiple times for the same instance,
+        possibly with a different context parameter for each subsequent call.
+
+        IMPORTANT - Every override of this method must call base.Init()
+        first, and only then execute the rest of the override method's code.
+        """
+
+        # Initialize base before executing the rest of the code in this method
+        super().init(context)
+
+        # Open connection only once, init may be called again with another context
+        if self.__connection is None:
+            db_file_path = self.db_file_path if self.db_file_path is not None else ':memory:'
+            self.__connection = sqlite3.connect(db_file_path, check_same_thread=False)
+            if self.db_file_path is not None:
+                self.__connection.execute('PRAGMA journal_mode=WAL')
+                self.__connection.execute('PRAGMA synchronous=NORMAL')
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """SQLite database connection."""
+        return self.__connection
+
+    def create_ordered_object_id(self) -> ObjectId:
+        """The returned ObjectIds have the following order guarantees:
+
+        * For this data source instance, to arbitrary resolution; and
+        * Across all processes and machines, to one second resolution
+        """
+        result = ObjectId()
+        while result <= self.__prev_object_id:
+            result = ObjectId()
+
+        self.__prev_object_id = result
+        return result
+
+    def load_or_null(self, record_type: Type[TRecord], id_: ObjectId) -> Optional[TRecord]:
+        """Load record by its ObjectId.
+
+        Return None if if argument ObjectId is greater than
+        or equal to CutoffTime.
+        """
+        if self.cutoff_time is not None:
+            if id_ >= self.cutoff_time:
+                return None
+
+        table_name = self._get_or_create_table(record_type)
+        row = self.__connection.execute(f'SELECT payload FROM "{table_name}" WHERE id = ?',
+                                        (id_.binary,)).fetchone()
+        if row is not None:
+            result: TRecord = deserialize(self._decode(row[0]))
+
+            if result is not None and not isinstance(result, DeletedRecord):
+
+                is_requested_instance = isinstance(result, record_type)
+                if not is_requested_instance:
+                    raise Exception(f'Stored type {type(result).__name__} for ObjectId={id_} and '
+                                    f'Key={result.to_key()} is not an instance of the requested type '
+                                    f'{record_type.__name__}.')
+                result.init(self.context)
+                return result
+        return None
+
+    def load_or_null_by_key(self, type_: Type[TRecord], key_: str, load_from: ObjectId) -> Optional[TRecord]:
+        """Load record by string key from the specified dataset or
+        its list of imports. The lookup occurs first in descending
+        order of dataset ObjectIds, and then in the descending
+        order of record ObjectIds within the first dataset that
+        has at least one record. Both dataset and record ObjectIds
+        are ordered chronologically to one second resolution,
+        and are unique within the database server or cluster.
+
+        The root dataset has empty ObjectId value that is less
+        than any other ObjectId value. Accordingly, the root
+        dataset is the last one in the lookup order of datasets.
+
+        The first record in this lookup order is returned, or null
+        if no records are found or if DeletedRecord is the first
+        record.
+
+        Return None if there is no record for the specified ObjectId;
+        however an exception will be thrown if the record exists but
+        is not derived from TRecord.
+        """
+        collection_name, key_value = key_.split('=', 1)
+
+        table_name = self._get_or_create_table(type_)
+        sql, params = self._build_latest_select(table_name, load_from, key_condition='key = ?')
+        row = self.__connection.execute(sql, [key_value] + params).fetchone()
+        if row is not None:
+            result: TRecord = deserialize(self._decode(row[0]))
+
+            if result is not None and not isinstance(result, DeletedRecord):
+
+                is_proper_record = isinstance(result, type_)
+                if not is_proper_record:
+                    raise Exception(f'Stored type {type(result).__name__} for Key={key_} in '
+                                    f'data_set={load_from} is not an instance of '
+                                    f'the requested type {type_.__name__}.')
+                result.init(self.context)
+                return result
+        return None
+
+    def load_many(self, type_: Type[TRecord], keys: Iterable[str],
+                  load_from: ObjectId) -> List[Optional[TRecord]]:
+        """Lookup of multiple records by string key using the same
+        lookup rules as load_or_null_by_key(...).
+
+        Returns a list with one element for each key in the order of
+        keys, where the element is None if the record is not found or
+        is a DeletedRecord. Repeated keys return the same record instance.
+
+        Keys are resolved with one SELECT per chunk of keys.
+        """
+        keys = list(keys)
+        key_values = [key_.split('=', 1)[1] for key_ in keys]
+        distinct_key_values = list(dict.fromkeys(key_values))
+
+        table_name = self._get_or_create_table(type_)
+        loaded: Dict[str, Optional[TRecord]] = dict()
+        for chunk_start in range(0, len(distinct_key_values), TemporalSqliteDataSource.__max_keys_per_select):
+            chunk = distinct_key_values[chunk_start:chunk_start + TemporalSqliteDataSource.__max_keys_per_select]
+            sql, params = self._build_latest_select(
+                table_name, load_from, key_condition=f'key IN ({",".join("?" * len(chunk))})')
+            for row in self.__connection.execute(sql, chunk + params):
+                document = self._decode(row[0])
+                key_value = document['_key']
+                result: TRecord = deserialize(document)
+                if isinstance(result, DeletedRecord):
+                    continue
+                if not isinstance(result, type_):
+                    raise Exception(f'Stored type {type(result).__name__} for Key={key_value} in '
+                                    f'data_set={load_from} is not an instance of '
+                                    f'the requested type {type_.__name__}.')
+                result.init(self.context)
+                loaded[key_value] = result
+
+        return [loaded.get(key_value) for key_value in key_values]
+
+    def get_query(self, record_type: Type[TRecord], load_from: ObjectId) -> TemporalSqliteQuery:
+        """Get query for the specified type.
+
+        After applying query parameters, the lookup occurs first in
+        descending order of dataset ObjectIds, and then in the descending
+        order of record ObjectIds within the first dataset that
+        has at least one record. Both dataset and record ObjectIds
+        are ordered chronologically to one second resolution,
+        and are unique within the database server or cluster.
+
+        The root dataset has empty ObjectId value that is less
+        than any other ObjectId value. Accordingly, the root
+        dataset is the last one in the lookup order of datasets.
+        """
+        table_name = self._get_or_create_table(record_type)
+        return TemporalSqliteQuery(record_type, self, table_name, load_from)
+
+    def save_many(self, record_type: Type[TRecord], records: Iterable[TRecord], save_to: ObjectId):
+        """Save multiple records to the specified dataset. After the method exits,
+        for each record the property record.data_set will be set to the value of
+        the save_to parameter.
+
+        All save methods ignore the value of record.data_set before the
+        save method is called. When dataset is not specified explicitly,
+        the value of dataset from the context, not from the record, is used.
+        The reason for this behavior is that the record may be stored from
+        a different dataset than the one where it is used.
+
+        This method guarantees that ObjectIds of the saved records will be in
+        strictly increasing order.
+        """
+        self._check_not_readonly()
+
+        table_name = self._get_or_create_table(record_type)
+        if records is None:
+            return None
+
+        # Records are iterated twice, convert to list in case a generator is passed
+        records = list(records)
+        for record in records:
+            record_id = self.create_ordered_object_id()
+            if record_id <= save_to:
+                raise Exception(f'TemporalId={record_id} of a record must be greater than '
+                                f'TemporalId={save_to} of the dataset where it is being saved.')
+            record.id_ = record_id
+            record.data_set = save_to
+            record.init(self.context)
+
+        versioning_method = self.get_versioning_method(record_type)
+        if versioning_method in [VersioningMethod.Temporal, VersioningMethod.NonTemporal,
+                                 VersioningMethod.NonOverriding]:
+            self._insert_documents(table_name, [serialize(x) for x in records])
+        else:
+            raise Exception(f'Unknown versioning method {versioning_method}.')
+
+    def delete(self, record_type: Type[TRecord], key: str, delete_in: ObjectId) -> None:
+        """Write a DeletedRecord in delete_in dataset for the specified key
+        instead of actually deleting the record. This ensures that
+        a record in another dataset does not become visible during
+        lookup in a sequence of datasets.
+
+        To avoid an additional roundtrip to the data store, the delete
+        marker is written even when the record does not exist.
+        """
+        self._check_not_readonly()
+
+        if self.write_behind_buffer is not None:
+            self.write_behind_buffer.delete(record_type, key, delete_in)
+            return
+
+        record = DeletedRecord()
+        record.key = key
+
+        record.id_ = self.create_ordered_object_id()
+        record.data_set = delete_in
+
+        table_name = self._get_or_create_table(record_type)
+        self._insert_documents(table_name, [serialize(record)])
+
+    def insert_records(self, record_type: Type[TRecord], records: List[TRecord]) -> Dict[int, str]:
+        """Insert records for which ObjectId and dataset have already been
+        assigned into the collection for record_type, without validation.
+
+        Records are inserted in a single transaction. If the transaction
+        fails, each record is retried in its own transaction so that the
+        remaining records are written. Returns error message for each
+        record that could not be written by its index in the list.
+        """
+        errors: Dict[int, str] = dict()
+        documents = []
+        document_indices = []
+        for index, record in enumerate(records):
+            try:
+                documents.append(serialize(record))
+                document_indices.append(index)
+            except Exception as e:
+                errors[index] = str(e)
+
+        table_name = self._get_or_create_table(record_type)
+        try:
+            self._insert_documents(table_name, documents)
+        except sqlite3.Error:
+            for index, document in zip(document_indices, documents):
+                try:
+                    self._insert_documents(table_name, [document])
+                except sqlite3.Error as e:
+                    errors[index] = str(e)
+        return errors
+
+    def delete_db(self) -> None:
+        """Permanently deletes (drops) all tables in the database with
+        all records in them without the possibility to recover them later.
+
+        This method should only be used to free storage. For
+        all other purposes, methods that preserve history should
+        be used.
+
+        ATTENTION - THIS METHOD WILL DELETE ALL DATA WITHOUT
+        THE POSSIBILITY OF RECOVERY. USE WITH CAUTION.
+        """
+
+        if self.read_only is not None and self.read_only:
+            raise Exception(f'Attempting to drop (delete) database for the data source {self.data_source_name} '
+                            f'where ReadOnly flag is set.')
+
+        if self.__connection is not None:
+
+            if self.env_type in [EnvType.Dev, EnvType.User, EnvType.Test]:
+                # Only env types Dev, User, and Test of can be deleted from the API
+                table_names = [row[0] for row in self.__connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'")]
+                with self.__connection:
+                    for table_name in table_names:
+                        self.__connection.execute(f'DROP TABLE "{table_name}"')
+                self.__table_dict.clear()
+                self.__data_set_dict.clear()
+                self.__import_dict.clear()
+                self.__imports_cutoff_dict.clear()
+            else:
+                # Other env types must be deleted using an external tool
+                raise Exception(f'As an extra safety measure, database {self.db_file_path} cannot be '
+                                f'dropped because this operation is not permitted for '
+                                f'env_type={self.env_type.name}.')
+
+    def select_latest_documents(self, table_name: str, load_from: ObjectId,
+                                record_type: type = None) -> Iterable[Dict[str, Any]]:
+        """
+        Iterate over decoded documents for the version of each key selected by
+        the lookup rules in load_from dataset and its imports, in the order
+        of record ObjectIds.
+
+        If record_type is specified, only the keys where the selected version
+        is an instance of record_type are returned, which also excludes keys
+        where the selected version is a DeletedRecord.
+        """
+        sql, params = self._build_latest_select(table_name, load_from)
+        if record_type is not None:
+            sql = sql + ' AND types LIKE ?'
+            params.append(f'%;{record_type.__name__};%')
+        sql = sql + ' ORDER BY id'
+        for row in self.__connection.execute(sql, params):
+            yield self._decode(row[0])
+
+    def load_versions(self, record_type: Type[TRecord], key_: str, load_from: ObjectId,
+                      from_id: ObjectId = None, to_id: ObjectId = None) -> Iterable[Record]:
+        """Iterate over all versions of the record with the specified key
+        in load_from dataset and its imports, in ascending order of ObjectId.
+
+        Only versions where from_id <= ObjectId < to_id are returned,
+        each bound is ignored if None. Versions excluded by CutoffTime
+        and ImportsCutoffTime are not returned. DeletedRecord versions
+        are included.
+
+        The versions are selected using the index on key, dataset and id.
+        """
+        collection_name, key_value = key_.split('=', 1)
+
+        table_name = self._get_or_create_table(record_type)
+        conditions, params = self._build_lookup_conditions(load_from)
+        conditions.insert(0, 'key = ?')
+        params.insert(0, key_value)
+        if from_id is not None:
+            conditions.append('id >= ?')
+            params.append(from_id.binary)
+        if to_id is not None:
+            conditions.append('id < ?')
+            params.append(to_id.binary)
+
+        sql = f'SELECT payload FROM "{table_name}" WHERE {" AND ".join(conditions)} ORDER BY id'
+        for row in self.__connection.execute(sql, params):
+            version: Record = deserialize(self._decode(row[0]))
+            yield self._init_version(version, record_type, key_)
+
+    def get_changed_keys(self, record_type: Type[TRecord], load_from: ObjectId,
+                         from_id: Optional[ObjectId], to_id: ObjectId) -> Iterable[str]:
+        """Iterate in ascending order over distinct keys, without the collection
+        name prefix, that have at least one version where from_id <= ObjectId < to_id
+        in load_from dataset or its imports. The from_id bound is ignored if None.
+
+        The versions are selected by range scan of the primary key.
+        """
+        table_name = self._get_or_create_table(record_type)
+        conditions, params = self._build_lookup_conditions(load_from)
+        conditions.append('id < ?')
+        params.append(to_id.binary)
+        if from_id is not None:
+            conditions.append('id >= ?')
+            params.append(from_id.binary)
+
+        sql = f'SELECT DISTINCT key FROM "{table_name}" WHERE {" AND ".join(conditions)} ORDER BY key'
+        for row in self.__connection.execute(sql, params):
+            yield row[0]
+
+    def get_latest_versions(self, record_type: Type[TRecord], key_values: List[str], load_from: ObjectId,
+                            to_id: ObjectId) -> Dict[str, Tuple[ObjectId, bool]]:
+        """For each key without the collection name prefix, return ObjectId of the
+        version selected by the lookup rules among versions where ObjectId < to_id
+        and a flag that is True if this version is DeletedRecord. Keys for which
+        there is no such version are not included.
+        """
+        table_name = self._get_or_create_table(record_type)
+        conditions, params = self._build_lookup_conditions(load_from)
+        conditions.append('id < ?')
+        params.append(to_id.binary)
+
+        result: Dict[str, Tuple[ObjectId, bool]] = dict()
+        deleted_types = f';{DeletedRecord.__name__};'
+        for chunk_start in range(0, len(key_values), TemporalSqliteDataSource.__max_keys_per_select):
+            chunk = key_values[chunk_start:chunk_start + TemporalSqliteDataSource.__max_keys_per_select]
+            sql = (f'SELECT key, id, types FROM ('
+                   f'SELECT key, id, types, '
+                   f'ROW_NUMBER() OVER (PARTITION BY key ORDER BY data_set DESC, id DESC) AS version_rank '
+                   f'FROM "{table_name}" WHERE key IN ({",".join("?" * len(chunk))}) AND {" AND ".join(conditions)}'
+                   f') WHERE version_rank = 1')
+            for key_value, id_bytes, types in self.__connection.execute(sql, chunk + params):
+                result[key_value] = (ObjectId(id_bytes), types.endswith(deleted_types))
+        return result
+
+    def get_version_infos(self, record_type: Type[TRecord], to_id: ObjectId, after_key: Optional[str],
+                          max_keys: int) -> List[Tuple[str, ObjectId, ObjectId, int]]:
+        """Return (key, dataset, id, size in bytes) for all versions where
+        ObjectId < to_id, in all datasets, for up to max_keys distinct keys
+        that follow after_key in ascending order of keys, or for the first
+        keys if after_key is None. Keys do not include the collection name
+        prefix. The result is sorted by key, dataset, and id.
+
+        The size of each version is the size of its BSON payload.
+        """
+        table_name = self._get_or_create_table(record_type)
+        key_condition = 'key > ? AND ' if after_key is not None else ''
+        key_params = [after_key] if after_key is not None else []
+
+        sql = (f'SELECT key, data_set, id, length(payload) FROM "{table_name}" '
+               f'WHERE id < ? AND key IN ('
+               f'SELECT DISTINCT key FROM "{table_name}" WHERE {key_condition}id < ? ORDER BY key LIMIT ?'
+               f') ORDER BY key, data_set, id')
+        params = [to_id.binary] + key_params + [to_id.binary, max_keys]
+        return [(key_value, ObjectId(data_set), ObjectId(id_bytes), size)
+                for key_value, data_set, id_bytes, size in self.__connection.execute(sql, params)]
+
+    def purge_versions(self, record_type: Type[TRecord], ids: List[ObjectId]) -> None:
+        """Permanently delete the record versions with the specified ObjectIds
+        from the collection for record_type without writing DeletedRecord.
+
+        The space is reused by subsequent inserts, run VACUUM to return
+        it to the file system.
+        """
+        self._check_not_readonly()
+        table_name = self._get_or_create_table(record_type)
+        with self.__connection:
+            self.__connection.executemany(f'DELETE FROM "{table_name}" WHERE id = ?', [(x.binary,) for x in ids])
+
+    def get_max_id(self, record_type: Type[TRecord]) -> Optional[ObjectId]:
+        """Return the greatest ObjectId in the collection for record_type
+        across all datasets, or None if the collection is empty.
+
+        The value is obtained from the primary key index.
+        """
+        table_name = self._get_or_create_table(record_type)
+        row = self.__connection.execute(f'SELECT MAX(id) FROM "{table_name}"').fetchone()
+        return ObjectId(row[0]) if row[0] is not None else None
+
+    def load_many_by_id(self, record_type: Type[TRecord], ids: Iterable[ObjectId]) -> List[Optional[TRecord]]:
+        """Load records by ObjectId using the same rules as load_or_null(...),
+        with one SELECT per chunk of ObjectIds.
+
+        Returns a list with one element for each ObjectId in the order
+        of ids, where the element is None if the record is not found.
+        """
+        ids = list(ids)
+        distinct_ids = [x for x in dict.fromkeys(ids) if self.cutoff_time is None or x < self.cutoff_time]
+
+        table_name = self._get_or_create_table(record_type)
+        loaded: Dict[ObjectId, TRecord] = dict()
+        for chunk_start in range(0, len(distinct_ids), TemporalSqliteDataSource.__max_keys_per_select):
+            chunk = distinct_ids[chunk_start:chunk_start + TemporalSqliteDataSource.__max_keys_per_select]
+            sql = f'SELECT payload FROM "{table_name}" WHERE id IN ({",".join("?" * len(chunk))})'
+            for row in self.__connection.execute(sql, [x.binary for x in chunk]):
+                result: TRecord = deserialize(self._decode(row[0]))
+                if isinstance(result, DeletedRecord):
+                    continue
+                if not isinstance(result, record_type):
+                    raise Exception(f'Stored type {type(result).__name__} for ObjectId={result.id_} and '
+                                    f'Key={result.to_key()} is not an instance of the requested type '
+                                    f'{record_type.__name__}.')
+                result.init(self.context)
+                loaded[result.id_] = result
+
+        return [loaded.get(id_) for id_ in ids]
+
+    def get_data_set_or_none(self, data_set_name: str) -> Optional[ObjectId]:
+        """Get ObjectId of the dataset with the specified name.
+        Returns null if not found.
+        """
+        if data_set_name in self.__data_set_dict:
+            return self.__data_set_dict[data_set_name]
+
+        data_set_record = self.load_or_null_by_key(DataSet, DataSet.create_key(data_set_name=data_set_name), empty_id)
+
+        if data_set_record is None:
+            return None
+
+        self.__data_set_dict[data_set_name] = data_set_record.id_
+
+        if data_set_record.id_ not in self.__import_dict:
+            import_set = self._build_data_set_lookup_list(data_set_record)
+            self.__import_dict[data_set_record.id_] = import_set
+
+        return data_set_record.id_
+
+    def save_data_set(self, data_set: DataSet) -> None:
+        """Save new version of the dataset and update in-memory cache to the saved dataset."""
+        self.save_one(DataSet, data_set, empty_id)
+        self.__data_set_dict[data_set.data_set_name] = data_set.id_
+
+        lookup_set = self._build_data_set_lookup_list(data_set)
+        self.__import_dict[data_set.id_] = lookup_set
+
+    def get_data_set_lookup_list(self, load_from: ObjectId) -> Iterable[ObjectId]:
+        """Returns enumeration of import datasets for specified dataset data,
+        including imports of imports to unlimited depth with cyclic
+        references and duplicates removed.
+        """
+        if load_from == empty_id:
+            return [empty_id]
+
+        if load_from in self.__import_dict:
+            return self.__import_dict[load_from]
+
+        else:
+            data_set_data: DataSet = self.load_or_null(DataSet, load_from)
+            if data_set_data is None:
+                raise Exception(f'Dataset with ObjectId={load_from} is not found.')
+            if data_set_data.data_set != empty_id:
+                raise Exception(f'Dataset with ObjectId={load_from} is not stored in root dataset.')
+            result = self._build_data_set_lookup_list(data_set_data)
+            self.__import_dict[load_from] = result
+            return result
+
+    def get_versioning_method(self, record_type: Type[TRecord]) -> VersioningMethod:
+        """Gets the method of record or dataset versioning.
+
+        Versioning method is a required field for the data source. Its
+        value can be overridden for specific record types via an attribute.
+        """
+        if hasattr(record_type, 'versioning_method'):
+            return getattr(record_type, 'versioning_method')
+
+        return self.versioning_method
+
+    def get_imports_cutoff_time(self, data_set_id: ObjectId) -> Optional[ObjectId]:
+        """Gets ImportsCutoffTime from the dataset detail record.
+        Returns None if dataset detail record is not found.
+
+        Imported records (records loaded through the imports list)
+        where ObjectId is greater than or equal to cutoff_time
+        will be ignored by load methods and queries, and the latest
+        available record where ObjectId is less than cutoff_time will
+        be returned instead.
+
+        This setting only affects records loaded through the imports
+        list. It does not affect records stored in the dataset itself.
+        """
+        if data_set_id == empty_id:
+            return None
+
+        # Each version of the dataset has its own ObjectId,
+        # so the cached value never becomes stale
+        if data_set_id not in self.__imports_cutoff_dict:
+            data_set_data: DataSet = self.load_or_null(DataSet, data_set_id)
+            imports_cutoff = data_set_data.imports_cutoff_time if data_set_data is not None else None
+            self.__imports_cutoff_dict[data_set_id] = imports_cutoff
+
+        return self.__imports_cutoff_dict[data_set_id]
+
+    def _build_latest_select(self, table_name: str, load_from: ObjectId,
+                             key_condition: str = None) -> Tuple[str, List[Any]]:
+        """
+        Build SQL that selects payload of the version of each key according to
+        the lookup rules, ranking versions within each key in descending order
+        of dataset and record ObjectIds using ROW_NUMBER window function.
+
+        The returned SQL ends with the WHERE clause of the outer query so that
+        the caller can append further conditions. If key_condition is
+        specified, the first parameter for it must be inserted by the caller.
+        """
+        conditions, params = self._build_lookup_conditions(load_from)
+        if key_condition is not None:
+            conditions.insert(0, key_condition)
+
+        sql = (f'SELECT payload FROM ('
+               f'SELECT id, types, payload, '
+               f'ROW_NUMBER() OVER (PARTITION BY key ORDER BY data_set DESC, id DESC) AS version_rank '
+               f'FROM "{table_name}" WHERE {" AND ".join(conditions)}'
+               f') WHERE version_rank = 1')
+        return sql, params
+
+    def _build_lookup_conditions(self, load_from: ObjectId) -> Tuple[List[str], List[Any]]:
+        """
+        Build SQL conditions and parameters that restrict versions to the
+        dataset lookup list of load_from, CutoffTime and ImportsCutoffTime.
+        """
+        data_set_lookup_list = list(self.get_data_set_lookup_list(load_from))
+        imports_cutoff = self.get_imports_cutoff_time(load_from)
+
+        conditions: List[str] = [f'data_set IN ({",".join("?" * len(data_set_lookup_list))})']
+        params: List[Any] = [x.binary for x in data_set_lookup_list]
+        if self.cutoff_time is not None:
+            conditions.append('id < ?')
+            params.append(self.cutoff_time.binary)
+        if imports_cutoff is not None:
+            conditions.append('(data_set = ? OR id < ?)')
+            params.extend([load_from.binary, imports_cutoff.binary])
+        return conditions, params
+
+    def _insert_documents(self, table_name: str, documents: List[Dict[str, Any]]) -> None:
+        """Insert serialized documents in a single transaction."""
+        rows = [(document['_id'].binary,
+                 document['_dataset'].binary,
+                 document['_key'],
+                 ';' + ';'.join(document['_t']) + ';',
+                 bson.encode(document, codec_options=self.__codec_options))
+                for document in documents]
+        with self.__connection:
+            self.__connection.executemany(
+                f'INSERT INTO "{table_name}" (id, data_set, key, types, payload) VALUES (?, ?, ?, ?, ?)', rows)
+
+    def _decode(self, payload: bytes) -> Dict[str, Any]:
+        """Decode BSON payload to document."""
+        return bson.decode(payload, codec_options=self.__codec_options)
+
+    def _get_or_create_table(self, type_: type) -> str:
+        if type_ in self.__table_dict:
+            return self.__table_dict[type_]
+        root_type = ClassInfo.get_ultimate_base(type_)
+        table_name = root_type.__name__
+
+        # Table is clustered by ObjectId, and the index on key, dataset and id
+        # covers the window function that selects the version for each key
+        with self.__connection:
+            self.__connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table_name}" ('
+                f'id BLOB PRIMARY KEY, data_set BLOB NOT NULL, key TEXT NOT NULL, '
+                f'types TEXT NOT NULL, payload BLOB NOT NULL) WITHOUT ROWID')
+            self.__connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table_name}_key" ON "{table_name}" (key, data_set DESC, id DESC)')
+        self.__table_dict[type_] = table_name
+        return table_name
+
+    def _build_data_set_lookup_list(self, data_set_record: DataSet) -> Set[ObjectId]:
+        result: Set[ObjectId] = set()
+
+        self._fill_data_set_lookup_set(data_set_record, result)
+
+        return result
+
+    def _fill_data_set_lookup_set(self, data_set_record: DataSet, result: Set[ObjectId]) -> None:
+        if data_set_record is None:
+            return
+
+        if not ObjectId.is_valid(data_set_record.id_):
+            raise Exception('Required ObjectId value is not set.')
+        if data_set_record.data_set_name == '':
+            raise Exception('Required string value is not set.')
+
+        if self.cutoff_time is not None and data_set_record.id_ >= self.cutoff_time:
+            return
+
+        result.add(data_set_record.id_)
+
+        if data_set_record.imports is not None:
+            for data_set_id in data_set_record.imports:
+                if data_set_record.id_ == data_set_id:
+                    raise Exception(f'Dataset {data_set_record.to_key()} with ObjectId={data_set_record.id_} '
+                                    f'includes itself in the list of its imports.')
+                if data_set_id not in result:
+                    result.add(data_set_id)
+                    cached_import_list = self.get_data_set_lookup_list(data_set_id)
+                    for import_id in cached_import_list:
+                        result.add(import_id)
+
+    def _check_not_readonly(self):
+        """Error message if either ReadOnly flag or CutoffTime is set
+        for the data source."""
+        if self.read_only:
+            raise Exception(f'Attempting write operation for data source {self.data_source_name} '
+                            f'where ReadOnly flag is set.')
+
+        if self.cutoff_time is not None:
+            raise Exception(f'Attempting write operation for data source {self.data_source_name} where '
+                            f'CutoffTime is set. Historical view of the data cannot be written to.')
+
+    def _check_process_shareable(self):
+        """Error message if the database is in memory rather than in a file."""
+        if self.db_file_path is None:
+            raise Exception(f'Data source {self.data_source_name} uses in-memory SQLite database which '
+                            f'cannot be accessed from other processes, specify db_file_path.')
@@ -0,0 +1,55 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from typing import Iterable, Dict, Any, TypeVar, TYPE_CHECKING
+from bson import ObjectId
+
+from datacentric.storage.record import Record
+from datacentric.storage.memory.temporal_memory_query import TemporalMemoryQuery
+from datacentric.serialization.serializer import deserialize
+
+if TYPE_CHECKING:
+    from datacentric.storage.sqlite.temporal_sqlite_data_source import TemporalSqliteDataSource
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+class TemporalSqliteQuery(TemporalMemoryQuery):
+    """Implements query methods for temporal SQLite data source.
+
+    The version of each key selected by the dataset lookup rules and
+    restricted to the queried type is obtained from the database using
+    a window function over the key index. The remaining $match and $sort
+    stages built by TemporalMongoQuery are then evaluated in memory
+    against the decoded documents.
+    """
+
+    def __init__(self, record_type: type, data_source: TemporalSqliteDataSource, table_name: str,
+                 load_from: ObjectId):
+        super().__init__(record_type, data_source, table_name, load_from)
+
+    def _select_documents(self) -> Iterable[Dict[str, Any]]:
+        """
+        Iterate over decoded documents for the version of each key
+        selected by the dataset lookup rules, before applying the query
+        predicates, in the order of record ObjectIds.
+        """
+        return self._data_source.select_latest_documents(self._collection, self._load_from, self._type)
+
+    def _to_record(self, document: Dict[str, Any]) -> TRecord:
+        """Deserialize the decoded document, which is not shared with other queries."""
+        result: TRecord = deserialize(document)
+        result.init(self._data_source.context)
+        return result
@@ -0,0 +1,50 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datacentric.storage.temporal_id import empty_id
+from datacentric.storage.unit_test_context import UnitTestContext
+from datacentric.storage.sqlite.temporal_sqlite_data_source import TemporalSqliteDataSource
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.versioning_method import VersioningMethod
+
+
+class TemporalSqliteUnitTestContext(UnitTestContext):
+    """
+    TemporalSqliteUnitTestContext is the context for use in test fixtures
+    that require a temporal SQLite data source.
+
+    It extends UnitTestContext by creating a temporal SQLite data
+    source backed by an in-memory database specific to the test
+    method. The data is released when the context is released.
+
+    For tests that must run against MongoDB, use TemporalMongoUnitTestContext.
+    For tests that do not require a data source, use UnitTestContext.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        """Inspect call stack to set properties."""
+        super().__init__()
+
+        # Create and initialize data source with TEST environment type.
+        # Database file path is not specified, so in-memory database is used
+        self.data_source = TemporalSqliteDataSource(
+            env_type=EnvType.Test,
+            env_group=self.test_module_name,
+            env_name=self.test_method_name,
+            versioning_method=VersioningMethod.Temporal
+        )
+
+        # Assign root dataset to data_set property of this context
+        self.data_set = empty_id
@@ -57,11 +57,13 @@ class UnitTestContext(Context):
         # Inspect call stack to get filename and method name of the
         # source code location where UnitTestContext constructor is called.
         # The location we are looking for is the first one that is
-        # not inside an __init__ method.
+        # not inside an __init__ method or a private helper method
+        # (name starts with underscore), so that tests can create
+        # the context in a helper shared by several test methods.
         stack_frame_index: int = 1
         while True:
             caller_frame = sys._getframe(stack_frame_index)
-            if caller_frame.f_code.co_name != '__init__':
+            if not caller_frame.f_code.co_name.startswith('_'):
                 break
             stack_frame_index = stack_frame_index + 1
 
@@ -0,0 +1,163 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import bisect
+import itertools
+from typing import List, Iterable, Set
+from bson import ObjectId
+from datacentric.storage.data_set import DataSet
+from datacentric.storage.data_source import DataSource
+from datacentric.storage.class_info import ClassInfo
+from datacentric.storage.compaction_result import CompactionResult
+
+
+class VersionCompactor:
+    """
+    Permanently deletes record versions that are older than the retention
+    horizon and can no longer be returned by load methods and queries.
+
+    For each key and dataset, the compactor keeps:
+
+    * All versions where ObjectId is greater than or equal to the horizon
+    * The latest version older than the horizon, so that lookups with
+      CutoffTime at or after the horizon return the same result
+    * The latest version older than each pinned time, which includes
+      ImportsCutoffTime of every version of each dataset and the times
+      passed by the caller
+
+    DeletedRecord versions are compacted in the same way, so that a kept
+    DeletedRecord continues to hide the key in imported datasets.
+
+    The collection is processed in batches of keys, and each batch is
+    deleted before the next one is read, so that memory use is bounded
+    and the job can be interrupted and restarted at any point. An optional
+    pause after each batch limits the load on the data store.
+
+    The DataSet collection cannot be compacted because TemporalIds of
+    dataset versions are referenced by the records stored in them.
+    """
+
+    __slots__ = ('__data_source', '__horizon', '__batch_size', '__pause_seconds', '__pinned_times')
+
+    __max_id: ObjectId = ObjectId(b'\xff' * 12)
+    """Greater than any ObjectId, used to read all dataset versions."""
+
+    __data_source: DataSource
+    __horizon: ObjectId
+    __batch_size: int
+    __pause_seconds: float
+    __pinned_times: List[ObjectId]
+
+    def __init__(self, data_source: DataSource, horizon: ObjectId, *, batch_size: int = 1000,
+                 pause_seconds: float = 0.0, pinned_times: Iterable[ObjectId] = None):
+        """
+        Create compactor for the data source that deletes versions older
+        than horizon, except the versions that must be kept.
+        """
+
+        if batch_size < 1:
+            raise Exception(f'Compaction batch_size={batch_size} must be positive.')
+
+        self.__data_source = data_source
+        """Data source where versions are deleted."""
+
+        self.__horizon = horizon
+        """Versions where ObjectId is less than this value are candidates for deletion."""
+
+        self.__batch_size = batch_size
+        """Maximum number of keys read and versions deleted in one batch."""
+
+        self.__pause_seconds = pause_seconds
+        """Pause after each batch of deleted versions."""
+
+        self.__pinned_times = list(pinned_times) if pinned_times is not None else []
+        """Additional cutoff times for which the selected versions must be kept."""
+
+    def compact(self, record_type: type) -> CompactionResult:
+        """Compact the collection for record_type and return the outcome."""
+        root_type = ClassInfo.get_ultimate_base(record_type)
+        if root_type is DataSet:
+            raise Exception('DataSet collection cannot be compacted because TemporalIds of dataset '
+                            'versions are referenced by the records stored in them.')
+
+        self.__data_source._check_not_readonly()
+
+        # The horizon is the last pinned time, versions at or after it are never read
+        pinned_times = sorted(x for x in self.__get_pinned_times() if x < self.__horizon)
+        pinned_times.append(self.__horizon)
+
+        result = CompactionResult(collection_name=root_type.__name__)
+        pending_ids: List[ObjectId] = []
+        after_key = None
+        while True:
+            version_infos = self.__data_source.get_version_infos(
+                root_type, self.__horizon, after_key, self.__batch_size)
+            if not version_infos:
+                break
+            after_key = version_infos[-1][0]
+
+            for (key_value, data_set), group in itertools.groupby(version_infos, key=lambda x: (x[0], x[1])):
+                versions = list(group)
+                version_ids = [x[2] for x in versions]
+                result.versions_scanned += len(versions)
+
+                # Keep the latest version older than each pinned time
+                kept_indices: Set[int] = set()
+                for pinned_time in pinned_times:
+                    index = bisect.bisect_left(version_ids, pinned_time) - 1
+                    if index >= 0:
+                        kept_indices.add(index)
+
+                for index, (_, _, version_id, size) in enumerate(versions):
+                    if index not in kept_indices:
+                        pending_ids.append(version_id)
+                        result.versions_deleted += 1
+                        result.bytes_reclaimed += size
+
+                if len(pending_ids) >= self.__batch_size:
+                    self.__purge(root_type, pending_ids)
+                    pending_ids = []
+
+        if pending_ids:
+            self.__purge(root_type, pending_ids)
+
+        return result
+
+    def __purge(self, root_type: type, ids: List[ObjectId]) -> None:
+        """Delete versions and pause if throttling is specified."""
+        self.__data_source.purge_versions(root_type, ids)
+        if self.__pause_seconds > 0:
+            time.sleep(self.__pause_seconds)
+
+    def __get_pinned_times(self) -> List[ObjectId]:
+        """Times passed by the caller and ImportsCutoffTime of every version of each dataset.
+
+        Earlier versions of a dataset are included because lookups from
+        their TemporalId continue to use their ImportsCutoffTime after
+        the dataset is saved again.
+        """
+        result = list(self.__pinned_times)
+        after_key = None
+        while True:
+            version_infos = self.__data_source.get_version_infos(
+                DataSet, VersionCompactor.__max_id, after_key, self.__batch_size)
+            if not version_infos:
+                break
+            after_key = version_infos[-1][0]
+
+            for data_set in self.__data_source.load_many_by_id(DataSet, [x[2] for x in version_infos]):
+                if data_set is not None and data_set.imports_cutoff_time is not None:
+                    result.append(data_set.imports_cutoff_time)
+        return result
@@ -0,0 +1,200 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import time
+from typing import Dict, List, Tuple, Optional, TypeVar, TYPE_CHECKING
+from bson import ObjectId
+from datacentric.storage.record import Record
+from datacentric.storage.deleted_record import DeletedRecord
+from datacentric.storage.class_info import ClassInfo
+
+if TYPE_CHECKING:
+    from datacentric.storage.data_source import DataSource
+
+TRecord = TypeVar('TRecord', bound=Record)
+
+
+class WriteBehindBuffer:
+    """
+    Coalesces save_one(...) and delete(...) calls on the data source
+    into chunked bulk writes.
+
+    Use data_source.write_behind(...) to create the buffer in a with
+    statement. While the buffer is active, save_one(...) and delete(...)
+    validate the record and assign its ObjectId and dataset at the time
+    of the call, so that ObjectIds remain in strictly increasing order
+    of the calls, but the record is written to the data source only when
+    the buffer is flushed. This happens when the number of buffered
+    records reaches max_batch_size, when a call is made after more than
+    max_delay_seconds have passed since the oldest buffered record,
+    when flush() is called, and on exit from the with statement.
+
+    Buffered records are not visible to load methods and queries until
+    they are flushed.
+
+    A record that could not be written does not prevent the remaining
+    records from being written. Each such record is reported to the
+    context log and recorded in the errors list, and an exception is
+    raised on exit from the with statement if there are any errors.
+    """
+
+    __slots__ = ('__data_source', '__max_batch_size', '__max_delay_seconds',
+                 '__pending', '__pending_since', '__errors', '__written_count')
+
+    __data_source: DataSource
+    __max_batch_size: int
+    __max_delay_seconds: float
+    __pending: List[Tuple[type, Record]]
+    __pending_since: Optional[float]
+    __errors: List[Tuple[Record, str]]
+    __written_count: int
+
+    def __init__(self, data_source: DataSource, max_batch_size: int = 1000, max_delay_seconds: float = 1.0):
+        """
+        Create buffer for the data source. Use data_source.write_behind(...)
+        instead of calling this constructor directly.
+        """
+
+        if max_batch_size < 1:
+            raise Exception(f'Write-behind buffer max_batch_size={max_batch_size} must be positive.')
+
+        self.__data_source = data_source
+        """Data source to which buffered records are written."""
+
+        self.__max_batch_size = max_batch_size
+        """The buffer is flushed when the number of buffered records reaches this value."""
+
+        self.__max_delay_seconds = max_delay_seconds
+        """The buffer is flushed on the next call after this delay since the oldest buffered record."""
+
+        self.__pending = []
+        """Buffered records together with the type passed to save_one(...) or delete(...)."""
+
+        self.__pending_since = None
+        """Value of time.monotonic() when the oldest buffered record was added."""
+
+        self.__errors = []
+        """Records that could not be written, together with error message."""
+
+        self.__written_count = 0
+        """Number of records successfully written by this buffer."""
+
+    def __enter__(self) -> WriteBehindBuffer:
+        """Activate the buffer for save_one(...) and delete(...) calls on the data source."""
+        self.__data_source._set_write_behind_buffer(self)
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        """Flush buffered records and deactivate the buffer."""
+        try:
+            self.flush()
+        finally:
+            self.__data_source._set_write_behind_buffer(None)
+
+        # Report write errors unless another exception is already propagating
+        if type_ is None and self.__errors:
+            record, message = self.__errors[0]
+            raise Exception(f'{len(self.__errors)} record(s) could not be written to data source '
+                            f'{self.__data_source.data_source_name}. First error for record with '
+                            f'key {record.to_key()}: {message}')
+
+        # Return False to propagate exception to the caller
+        return False
+
+    @property
+    def errors(self) -> List[Tuple[Record, str]]:
+        """Records that could not be written, together with error message."""
+        return self.__errors
+
+    @property
+    def written_count(self) -> int:
+        """Number of records successfully written by this buffer."""
+        return self.__written_count
+
+    @property
+    def pending_count(self) -> int:
+        """Number of records that are buffered but not yet written."""
+        return len(self.__pending)
+
+    def save_one(self, record_type: type, record: TRecord, save_to: ObjectId) -> None:
+        """
+        Assign ObjectId and dataset to the record and add it to the buffer.
+        After the method exits, record.data_set will be set to the value of
+        the save_to parameter.
+        """
+        self.__data_source._check_not_readonly()
+
+        record_id = self.__data_source.create_ordered_object_id()
+        if record_id <= save_to:
+            raise Exception(f'TemporalId={record_id} of a record must be greater than '
+                            f'TemporalId={save_to} of the dataset where it is being saved.')
+        record.id_ = record_id
+        record.data_set = save_to
+        record.init(self.__data_source.context)
+
+        self.__add(record_type, record)
+
+    def delete(self, record_type: type, key: str, delete_in: ObjectId) -> None:
+        """Add DeletedRecord for the specified key in delete_in dataset to the buffer."""
+        self.__data_source._check_not_readonly()
+
+        record = DeletedRecord()
+        record.key = key
+
+        record.id_ = self.__data_source.create_ordered_object_id()
+        record.data_set = delete_in
+
+        self.__add(record_type, record)
+
+    def flush(self) -> None:
+        """
+        Write all buffered records to the data source in chunks
+        of up to max_batch_size records per collection.
+        """
+        if not self.__pending:
+            return
+
+        pending = self.__pending
+        self.__pending = []
+        self.__pending_since = None
+
+        # Group by collection preserving the order of calls within each
+        # collection. Because ObjectIds were assigned when the calls were
+        # made, the order of writes across collections does not matter.
+        collection_dict: Dict[type, List[Record]] = dict()
+        for record_type, record in pending:
+            root_type = ClassInfo.get_ultimate_base(record_type)
+            collection_dict.setdefault(root_type, []).append(record)
+
+        for root_type, records in collection_dict.items():
+            for chunk_start in range(0, len(records), self.__max_batch_size):
+                chunk = records[chunk_start:chunk_start + self.__max_batch_size]
+                chunk_errors = self.__data_source.insert_records(root_type, chunk)
+                self.__written_count += len(chunk) - len(chunk_errors)
+                for index, message in sorted(chunk_errors.items()):
+                    record = chunk[index]
+                    self.__errors.append((record, message))
+                    self.__data_source.context.log.error(
+                        f'Write-behind buffer could not write record with key {record.to_key()}.', message)
+
+    def __add(self, record_type: type, record: Record) -> None:
+        """Add record to the buffer and flush if size or time threshold is reached."""
+        now = time.monotonic()
+        if self.__pending_since is None:
+            self.__pending_since = now
+        self.__pending.append((record_type, record))
+
+        if len(self.__pending) >= self.__max_batch_size or now - self.__pending_since >= self.__max_delay_seconds:
+            self.flush()
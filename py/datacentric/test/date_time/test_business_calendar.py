@@ -0,0 +1,71 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import datetime as dt
+import numpy as np
+from datacentric.date_time.local_date import LocalDate
+from datacentric.date_time.iso_day_of_week import IsoDayOfWeek
+from datacentric.date_time.business_calendar import BusinessCalendar
+
+
+class TestBusinessCalendar(unittest.TestCase):
+    """Unit tests for BusinessCalendar."""
+
+    def test_smoke(self):
+        """Smoke test"""
+
+        calendar = BusinessCalendar(holidays=[20240101, 20241225])
+
+        # Monday holiday, Tuesday business day, Saturday weekend
+        self.assertFalse(calendar.is_business_day(20240101))
+        self.assertTrue(calendar.is_business_day(20240102))
+        self.assertFalse(calendar.is_business_day(20240106))
+
+        # From Monday holiday to the next Monday
+        self.assertEqual(4, calendar.count_business_days(20240101, 20240108))
+        self.assertEqual(-4, calendar.count_business_days(20240108, 20240101))
+        self.assertEqual(0, calendar.count_business_days(20240102, 20240102))
+
+        # Custom weekend
+        friday_weekend = BusinessCalendar(weekend=[IsoDayOfWeek.Friday])
+        self.assertFalse(friday_weekend.is_business_day(20240105))
+        self.assertTrue(friday_weekend.is_business_day(20240106))
+
+    def test_array(self):
+        """Array operations match counting days one by one"""
+
+        holidays = [20240101, 20240527, 20240704, 20241225, 20250101]
+        calendar = BusinessCalendar(holidays=holidays)
+
+        start = dt.date(2023, 12, 1)
+        dates = [start + dt.timedelta(days=x) for x in range(500)]
+        values = np.array([LocalDate.from_date(x) for x in dates])
+        expected = [x.isoweekday() <= 5 and LocalDate.from_date(x) not in holidays for x in dates]
+        self.assertEqual(expected, calendar.is_business_day_array(values).tolist())
+
+        # Count from the first date to each date, and between consecutive dates
+        counts = calendar.count_business_days_array(values[0], values)
+        self.assertEqual([sum(expected[:i]) for i in range(len(dates))], counts.tolist())
+        counts = calendar.count_business_days_array(values[:-1], values[1:])
+        self.assertEqual([int(x) for x in expected[:-1]], counts.tolist())
+
+        # Full range
+        self.assertEqual(calendar.count_business_days(19700101, 20000101) +
+                         calendar.count_business_days(20000101, 99991231),
+                         calendar.count_business_days(19700101, 99991231))
+
+
+if __name__ == "__main__":
+    unittest.main()
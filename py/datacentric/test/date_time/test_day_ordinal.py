@@ -0,0 +1,73 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+import datetime as dt
+import numpy as np
+from datacentric.date_time.local_date import LocalDate
+from datacentric.date_time.day_ordinal import DayOrdinal
+from datacentric.date_time.iso_day_of_week import IsoDayOfWeek
+
+
+class TestDayOrdinal(unittest.TestCase):
+    """Unit tests for DayOrdinal."""
+
+    def test_smoke(self):
+        """Smoke test"""
+
+        self.assertEqual(0, DayOrdinal.from_local_date(19700101))
+        self.assertEqual(19700101, DayOrdinal.to_local_date(0))
+        self.assertEqual(99991231, DayOrdinal.to_local_date(DayOrdinal.max_value))
+        self.assertEqual(20000301, DayOrdinal.add_days(20000228, 2))
+        self.assertEqual(20240229, DayOrdinal.add_days(20240301, -1))
+        self.assertEqual(IsoDayOfWeek.Monday, DayOrdinal.day_of_week(20240101))
+        self.assertEqual(IsoDayOfWeek.Thursday, DayOrdinal.day_of_week(19700101))
+
+        with self.assertRaises(Exception):
+            DayOrdinal.from_local_date(20230229)
+        with self.assertRaises(Exception):
+            DayOrdinal.add_days(19700101, -1)
+
+    def test_array(self):
+        """Array operations match operations on dt.date"""
+
+        random.seed(0)
+        dates = [dt.date(1970, 1, 1) + dt.timedelta(days=random.randrange(DayOrdinal.max_value + 1))
+                 for _ in range(1000)]
+        days = [random.randrange(-1000, 1000) for _ in dates]
+        values = np.array([LocalDate.from_date(x) for x in dates])
+
+        ordinals = DayOrdinal.from_local_date_array(values)
+        self.assertEqual([(x - dt.date(1970, 1, 1)).days for x in dates], ordinals.tolist())
+        self.assertEqual(values.tolist(), DayOrdinal.to_local_date_array(ordinals).tolist())
+        self.assertEqual([x.isoweekday() for x in dates], DayOrdinal.day_of_week_array(values).tolist())
+
+        expected = [LocalDate.from_date(x + dt.timedelta(days=y))
+                    if dt.date(1970, 1, 1) <= x + dt.timedelta(days=y) <= dt.date(9999, 12, 31) else None
+                    for x, y in zip(dates, days)]
+        in_range = [i for i, x in enumerate(expected) if x is not None]
+        self.assertEqual([expected[i] for i in in_range],
+                         DayOrdinal.add_days_array(values[in_range], np.array(days)[in_range]).tolist())
+        self.assertEqual([20030502, 20030601], DayOrdinal.add_days_array([20030501, 20030531], 1).tolist())
+
+        # Validation
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            DayOrdinal.from_local_date_array([20230228, 20230229])
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            DayOrdinal.to_local_date_array([0, -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,7 @@ import unittest
 from typing import Union
 import attr
 import datetime as dt
+import numpy as np
 import pandas as pd
 import dateutil
 from datacentric.date_time.instant import Instant
@@ -73,6 +74,43 @@ class TestInstant(unittest.TestCase):
         t10_str_rounded = '2003-05-01T10:15:30.123Z'
         self.assertEqual(Instant.to_str(Instant.from_str(t10_str)), t10_str_rounded)
 
+        # Fast path and strptime path produce the same result
+        self.assertEqual(Instant.from_str('2003-05-01T10:15:30.500Z'), Instant.from_str('2003-05-01T10:15:30.5Z'))
+        with self.assertRaises(Exception):
+            Instant.from_str('2003-02-30T10:15:30.500Z')
+
+        # Milliseconds before the Unix epoch
+        self.assertEqual(Instant.to_str(Instant.from_unix_millis(-1)), '1969-12-31T23:59:59.999Z')
+        self.assertEqual(Instant.to_unix_millis(Instant.from_str('1969-12-31T23:59:59.999Z')), -1)
+
+    def test_array(self):
+        """Array conversions match scalar conversions"""
+
+        date_strs = ['2003-05-01T10:15:30.500Z', '1970-01-01T00:00:00.000Z', '9999-12-31T23:59:59.999Z']
+        unix_millis = [Instant.to_unix_millis(Instant.from_str(x)) for x in date_strs]
+
+        # Milliseconds since Unix epoch
+        instants = Instant.from_unix_millis_array(unix_millis)
+        self.assertEqual('datetime64[ms]', str(instants.dtype))
+        self.assertEqual(unix_millis, Instant.to_unix_millis_array(instants).tolist())
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            Instant.to_unix_millis_array(np.array(['2003-05-01T10:15:30.500', '2003-05-01T10:15:30.5001'],
+                                                  dtype='datetime64[us]'))
+
+        # Strings
+        self.assertEqual(date_strs, Instant.to_str_array(instants).tolist())
+        parsed, is_valid = Instant.from_str_array(date_strs)
+        self.assertEqual(unix_millis, Instant.to_unix_millis_array(parsed).tolist())
+        self.assertTrue(is_valid.all())
+
+        # Strings in other formats accepted by from_str and invalid strings
+        parsed, is_valid = Instant.from_str_array(['2003-05-01T10:15:30Z', '2003-02-30T10:15:30.500Z',
+                                                   '2003-05-01T10:15:30.500', '2003-05-01T10:15:30.50xZ'])
+        self.assertEqual([True, False, False, False], is_valid.tolist())
+        self.assertEqual(Instant.to_unix_millis(Instant.from_str('2003-05-01T10:15:30Z')),
+                         parsed[0].astype(np.int64))
+        self.assertTrue(np.isnat(parsed[1:]).all())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,7 @@ import timeit
 import random
 import unittest
 import datetime as dt
+import numpy as np
 
 from typing import Union
 from datacentric.date_time.local_date import LocalDate
@@ -54,6 +55,43 @@ class TestLocalDate(unittest.TestCase):
         # Test string representation roundtrip
         self.assertEqual(LocalDate.to_str(d1), date_str)
 
+    def test_array(self):
+        """Array conversions match scalar conversions"""
+
+        date_strs = ['2003-05-01', '1970-01-01', '2000-02-29', '9999-12-31']
+        iso_ints = [LocalDate.from_str(x) for x in date_strs]
+        values = np.array(iso_ints)
+
+        # Fields
+        years, months, days = LocalDate.to_fields_array(values)
+        self.assertEqual([LocalDate.to_fields(x) for x in iso_ints], list(zip(years, months, days)))
+        self.assertEqual(iso_ints, LocalDate.from_fields_array(years, months, days).tolist())
+
+        # Strings
+        self.assertEqual(date_strs, LocalDate.to_str_array(values).tolist())
+        self.assertEqual(iso_ints, LocalDate.from_str_array(date_strs).tolist())
+
+        # NumPy datetime64
+        datetimes = np.array(date_strs, dtype='datetime64[D]')
+        self.assertTrue(np.array_equal(datetimes, LocalDate.to_datetime64_array(values)))
+        self.assertEqual(iso_ints, LocalDate.from_datetime64_array(datetimes).tolist())
+        self.assertEqual(iso_ints, LocalDate.from_datetime64_array(datetimes.astype('datetime64[ms]')).tolist())
+
+        # Argument is not modified
+        self.assertEqual(iso_ints, values.tolist())
+
+        # Validation
+        invalid = np.array([20030501, 20031301, 20030500])
+        self.assertEqual([True, False, False], LocalDate.is_valid_array(invalid).tolist())
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            LocalDate.validate_array(invalid)
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            LocalDate.to_str_array([20030501, 20030231])
+        with self.assertRaises(Exception):
+            LocalDate.from_str_array(['2003-05-01Z'])
+        with self.assertRaises(Exception):
+            LocalDate.from_str_array(['2003-02-30'])
+
     @unittest.skip('Performance')
     def test_perf(self):
         count = 1000
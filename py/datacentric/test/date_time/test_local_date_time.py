@@ -0,0 +1,110 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import timeit
+import random
+import unittest
+import datetime as dt
+import numpy as np
+from datacentric.date_time.local_date_time import LocalDateTime
+
+
+class TestLocalDateTime(unittest.TestCase):
+    """Unit tests for LocalDateTime."""
+
+    def test_smoke(self):
+        """Smoke test"""
+
+        iso_int: int = 20030501101530500
+        d: dt.datetime = dt.datetime(2003, 5, 1, 10, 15, 30, 500000)
+
+        LocalDateTime.validate(iso_int)
+        self.assertEqual(iso_int, LocalDateTime.from_fields(2003, 5, 1, 10, 15, 30, 500))
+        self.assertEqual(iso_int, LocalDateTime.from_datetime(d))
+        self.assertEqual(d, LocalDateTime.to_datetime(iso_int))
+
+    def test_array(self):
+        """Array conversions match scalar conversions"""
+
+        datetimes = [dt.datetime(2003, 5, 1, 10, 15, 30, 500000), dt.datetime(1970, 1, 1),
+                     dt.datetime(2000, 2, 29, 23, 59, 59, 999000), dt.datetime(9999, 12, 31, 23, 59, 59, 999000)]
+        iso_ints = [LocalDateTime.from_datetime(x) for x in datetimes]
+        values = np.array(iso_ints)
+
+        # Fields
+        fields = LocalDateTime.to_fields_array(values)
+        self.assertEqual(iso_ints, LocalDateTime.from_fields_array(*fields).tolist())
+        self.assertEqual([20030501000000000], LocalDateTime.from_fields_array([2003], [5], [1]).tolist())
+
+        # NumPy datetime64
+        datetimes64 = LocalDateTime.to_datetime64_array(values)
+        self.assertEqual(datetimes, datetimes64.tolist())
+        self.assertEqual(iso_ints, LocalDateTime.from_datetime64_array(datetimes64).tolist())
+        self.assertEqual([20030501000000000],
+                         LocalDateTime.from_datetime64_array(np.array(['2003-05-01'], dtype='datetime64[D]')).tolist())
+
+        # Sub-millisecond part is truncated, as for scalar values
+        sub_ms = [dt.datetime(2003, 5, 1, 10, 15, 30, 500400), dt.datetime(2003, 5, 1, 10, 15, 30, 500600),
+                  dt.datetime(2020, 2, 29, 23, 59, 59, 999900)]
+        for unit in ('us', 'ns'):
+            truncated = np.array(sub_ms, dtype=f'datetime64[{unit}]')
+            self.assertEqual([LocalDateTime.from_datetime(x) for x in sub_ms],
+                             LocalDateTime.from_datetime64_array(truncated).tolist())
+            self.assertEqual(20200229235959999, LocalDateTime.from_datetime64_array(truncated)[2])
+
+        # Validation
+        invalid = np.array([20030501101530500, 20030501106030500, 20030231101530500])
+        self.assertEqual([True, False, True], LocalDateTime.is_valid_array(invalid).tolist())
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            LocalDateTime.validate_array(invalid)
+        with self.assertRaisesRegex(Exception, 'at index 2'):
+            LocalDateTime.to_datetime64_array(invalid[[0, 0, 2]])
+
+    @unittest.skip('Performance')
+    def test_perf(self):
+        count = 100_000
+        repeat = 10
+
+        start = dt.datetime(1970, 1, 1)
+        as_datetimes = [start + dt.timedelta(milliseconds=random.randrange(10 ** 12)) for i in range(count)]
+        as_ints = [LocalDateTime.from_datetime(x) for x in as_datetimes]
+        as_array = np.array(as_ints)
+        as_datetimes64 = LocalDateTime.to_datetime64_array(as_array)
+
+        t = timeit.timeit('[LocalDateTime.to_datetime(x) for x in as_ints]',
+                          globals={'LocalDateTime': LocalDateTime, 'as_ints': as_ints}, number=repeat)
+        print(f'{t:.4f}: int->dt.datetime')
+        t = timeit.timeit('LocalDateTime.to_datetime64_array(as_array)',
+                          globals={'LocalDateTime': LocalDateTime, 'as_array': as_array}, number=repeat)
+        print(f'{t:.4f}: int64[]->datetime64[]')
+        print('===================')
+
+        t = timeit.timeit('[LocalDateTime.from_datetime(x) for x in as_datetimes]',
+                          globals={'LocalDateTime': LocalDateTime, 'as_datetimes': as_datetimes}, number=repeat)
+        print(f'{t:.4f}: dt.datetime->int')
+        t = timeit.timeit('LocalDateTime.from_datetime64_array(as_datetimes64)',
+                          globals={'LocalDateTime': LocalDateTime, 'as_datetimes64': as_datetimes64}, number=repeat)
+        print(f'{t:.4f}: datetime64[]->int64[]')
+        print('===================')
+
+        t = timeit.timeit('[LocalDateTime.validate(x) for x in as_ints]',
+                          globals={'LocalDateTime': LocalDateTime, 'as_ints': as_ints}, number=repeat)
+        print(f'{t:.4f}: validate')
+        t = timeit.timeit('LocalDateTime.validate_array(as_array)',
+                          globals={'LocalDateTime': LocalDateTime, 'as_array': as_array}, number=repeat)
+        print(f'{t:.4f}: validate_array')
+
+
+if __name__ == "__main__":
+    unittest.main()
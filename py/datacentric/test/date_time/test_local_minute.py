@@ -14,6 +14,7 @@
 
 import unittest
 import datetime as dt
+import numpy as np
 from typing import Union
 from datacentric.date_time.local_minute import LocalMinute
 
@@ -53,6 +54,30 @@ class TestLocalMinute(unittest.TestCase):
         t6_str = '10:15'
         self.assertEqual(LocalMinute.to_str(LocalMinute.from_str(t6_str)), t6_str)
 
+    def test_array(self):
+        """Array conversions match scalar conversions"""
+
+        iso_ints = [1015, 0, 2359]
+        values = np.array(iso_ints)
+
+        # Fields
+        hours, minutes = LocalMinute.to_fields_array(values)
+        self.assertEqual([LocalMinute.to_fields(x) for x in iso_ints], list(zip(hours, minutes)))
+        self.assertEqual(iso_ints, LocalMinute.from_fields_array(hours, minutes).tolist())
+
+        # NumPy timedelta64 since midnight
+        durations = LocalMinute.to_timedelta64_array(values)
+        self.assertEqual([615, 0, 1439], durations.astype(np.int64).tolist())
+        self.assertEqual(iso_ints, LocalMinute.from_timedelta64_array(durations.astype('timedelta64[ms]')).tolist())
+
+        # Validation
+        invalid = np.array([1015, 1060])
+        self.assertEqual([True, False], LocalMinute.is_valid_array(invalid).tolist())
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            LocalMinute.validate_array(invalid)
+        with self.assertRaises(Exception):
+            LocalMinute.from_timedelta64_array(np.array([0, 61], dtype='timedelta64[s]'))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -14,6 +14,7 @@
 
 import unittest
 import datetime as dt
+import numpy as np
 from typing import Union
 from datacentric.date_time.local_time import LocalTime
 
@@ -68,6 +69,38 @@ class TestLocalTime(unittest.TestCase):
         t10_str_rounded = '10:15:30.123'
         self.assertEqual(LocalTime.to_str(LocalTime.from_str(t10_str)), t10_str_rounded)
 
+    def test_array(self):
+        """Array conversions match scalar conversions"""
+
+        time_strs = ['10:15:30.500', '00:00:00.000', '23:59:59.999']
+        iso_ints = [LocalTime.from_str(x) for x in time_strs]
+        values = np.array(iso_ints)
+
+        # Fields
+        fields = LocalTime.to_fields_array(values)
+        self.assertEqual([LocalTime.to_fields(x) for x in iso_ints], list(zip(*fields)))
+        self.assertEqual(iso_ints, LocalTime.from_fields_array(*fields).tolist())
+        self.assertEqual([101530000], LocalTime.from_fields_array([10], [15], [30]).tolist())
+
+        # NumPy timedelta64 since midnight
+        durations = LocalTime.to_timedelta64_array(values)
+        self.assertEqual([dt.timedelta(hours=10, minutes=15, seconds=30, milliseconds=500)], durations[:1].tolist())
+        self.assertEqual(iso_ints, LocalTime.from_timedelta64_array(durations).tolist())
+
+        # Rounding to the whole millisecond, half to even as for scalar values
+        microseconds = np.array([1499, 1500, 2500, 2501], dtype='timedelta64[us]')
+        expected = [LocalTime.from_time(dt.time(0, 0, 0, int(x))) for x in microseconds.astype(np.int64)]
+        self.assertEqual(expected, LocalTime.from_timedelta64_array(microseconds).tolist())
+        self.assertEqual([2], LocalTime.from_timedelta64_array(np.array([2_499_999], dtype='timedelta64[ns]')).tolist())
+
+        # Validation
+        invalid = np.array([101530500, 106030500, 101530500])
+        self.assertEqual([True, False, True], LocalTime.is_valid_array(invalid).tolist())
+        with self.assertRaisesRegex(Exception, 'at index 1'):
+            LocalTime.validate_array(invalid)
+        with self.assertRaises(Exception):
+            LocalTime.from_timedelta64_array(np.array([24], dtype='timedelta64[h]'))
+
 
 if __name__ == "__main__":
     unittest.main()
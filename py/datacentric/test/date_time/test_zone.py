@@ -0,0 +1,60 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import numpy as np
+import pytz
+from datacentric.date_time.zone import Zone
+
+
+class TestZone(unittest.TestCase):
+    """Unit tests for Zone."""
+
+    def test_smoke(self):
+        """Smoke test"""
+
+        key = Zone.create_key(zone_name='America/New_York')
+        self.assertEqual('America/New_York', Zone.get_zone_name_from_key(key))
+        self.assertIs(Zone.get_tzinfo_from_key(key), Zone.get_tzinfo_from_key(key))
+        self.assertEqual(pytz.timezone('America/New_York'), Zone.get_tzinfo_from_key(key))
+
+    def test_array(self):
+        """Array conversions match conversion of each element with pytz"""
+
+        # Every 15 minutes around the transitions to and from daylight saving time
+        utc_times = np.concatenate([np.arange(np.datetime64(x) - np.timedelta64(3, 'h'),
+                                              np.datetime64(x) + np.timedelta64(3, 'h'),
+                                              np.timedelta64(15, 'm')).astype('datetime64[ms]')
+                                    for x in ['2024-03-10T07:00', '2024-11-03T06:00', '1975-01-01T00:00']])
+
+        for zone_name in ['America/New_York', 'Europe/London', 'Australia/Sydney', 'UTC', 'Etc/GMT+5']:
+            key = Zone.create_key(zone_name=zone_name)
+            tzinfo = pytz.timezone(zone_name)
+
+            # UTC to local
+            local_times = Zone.to_local_array(key, utc_times)
+            expected = [pytz.UTC.localize(x).astimezone(tzinfo).replace(tzinfo=None) for x in utc_times.tolist()]
+            self.assertEqual(expected, local_times.tolist())
+
+            # Local to UTC, including local times that occur twice or do not occur
+            expected = [tzinfo.localize(x, is_dst=False).astimezone(pytz.UTC).replace(tzinfo=None)
+                        for x in utc_times.tolist()]
+            self.assertEqual(expected, Zone.to_utc_array(key, utc_times).tolist())
+
+        with self.assertRaises(Exception):
+            Zone.to_local_array(Zone.create_key(zone_name='UTC'), np.array([1, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import gzip
+import tempfile
 import unittest
 from datacentric.file_system.text_writer import TextWriter
 from datacentric.file_system.file_writer import FileWriter
@@ -30,6 +33,35 @@ class TestFileWriter(unittest.TestCase):
         file_writer.write_line('DEF')
         file_writer.flush()
 
+    def test_rotation(self):
+        """Test rotation by size with compression and retention."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path: str = os.path.join(temp_dir, 'rotation.txt')
+            file_writer: FileWriter = FileWriter(file_path, max_bytes=10, retention_count=2)
+            for i in range(5):
+                file_writer.write_line(f'Line {i} of 5')
+                file_writer.rotate_if_due()
+            file_writer.write_line('Last line')
+            file_writer.rotate_if_due()
+            file_writer.close()
+
+            # Each line exceeds max_bytes, only two most recent archives are kept
+            self.assertEqual(['rotation.txt', 'rotation.txt.5.gz', 'rotation.txt.6.gz'], sorted(os.listdir(temp_dir)))
+            with gzip.open(file_path + '.5.gz', 'rt') as file:
+                self.assertEqual('Line 4 of 5\n', file.read())
+            with gzip.open(file_path + '.6.gz', 'rt') as file:
+                self.assertEqual('Last line\n', file.read())
+            with open(file_path) as file:
+                self.assertEqual('', file.read())
+
+            # Numbering continues from existing archives, without compression
+            file_writer = FileWriter(file_path, max_bytes=10, compress=False)
+            file_writer.write_line('Next run line')
+            file_writer.rotate_if_due()
+            file_writer.close()
+            with open(file_path + '.7') as file:
+                self.assertEqual('Next run line\n', file.read())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from datacentric.log.log_entry import LogEntry
+from datacentric.log.log_verbosity import LogVerbosity
+from datacentric.log.data_log import DataLog
+from datacentric.log.span_log_entry import SpanLogEntry
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+
+
+class TestDataLog(unittest.TestCase):
+    """Unit tests for DataLog."""
+
+    def test_smoke(self):
+        """Smoke test for DataLog."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_log = DataLog(log_name='SmokeLog', verbosity=LogVerbosity.Info,
+                               max_batch_size=3, max_delay_seconds=60.0)
+            data_log.init(context)
+
+            for i in range(10):
+                data_log.info(f'Title {i}', f'Description {i}')
+            data_log.verify('Title for verify', 'Not recorded because log verbosity is Info')
+
+            # The last entry is below size threshold and is only written by flush
+            data_log.flush()
+            entries = self.__load_entries(context, data_log)
+            self.assertEqual([f'Title {i}' for i in range(10)], [entry.title for entry in entries])
+            self.assertTrue(all(entry.log == data_log.to_key() for entry in entries))
+            self.assertTrue(all(entry.data_set == context.data_set for entry in entries))
+
+            data_log.error('Title after flush', 'Written on close')
+            data_log.close()
+            entries = self.__load_entries(context, data_log)
+            self.assertEqual('Title after flush', entries[-1].title)
+
+            with self.assertRaises(Exception):
+                data_log.error('Title after close')
+
+    def test_delay(self):
+        """Test that entries are written after max_delay_seconds without flush."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_log = DataLog(log_name='DelayLog', verbosity=LogVerbosity.Info, max_delay_seconds=0.05)
+            data_log.init(context)
+            data_log.info('Title for info')
+
+            deadline = time.monotonic() + 10.0
+            while not self.__load_entries(context, data_log) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(['Title for info'], [entry.title for entry in self.__load_entries(context, data_log)])
+            data_log.close()
+
+    def test_span(self):
+        """Test that span entries are saved with their timing and counters."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_log = DataLog(log_name='SpanLog', verbosity=LogVerbosity.Info)
+            data_log.init(context)
+
+            with data_log.span('Load') as span:
+                span.add('Records', 5)
+            data_log.flush()
+
+            entries = self.__load_entries(context, data_log)
+            self.assertEqual(2, len(entries))
+            self.assertTrue(all(isinstance(entry, SpanLogEntry) for entry in entries))
+            self.assertEqual([1, 1], [entry.span_count for entry in entries])
+            self.assertEqual(['Span Load', 'Summary of span Load'], [entry.title.split(':')[0] for entry in entries])
+            self.assertEqual(('Records', 5), (entries[0].counters[0].name, entries[0].counters[0].value))
+            self.assertEqual(entries[0].wall_seconds, entries[1].wall_seconds)
+            data_log.close()
+
+    def __load_entries(self, context, data_log):
+        """Load entries of the log sorted by ObjectId."""
+        query = context.data_source.get_query(LogEntry, context.data_set).where({'log': data_log.to_key()})
+        return sorted(query.as_iterable(), key=lambda entry: entry.id_)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+import tempfile
+import unittest
+from datacentric.date_time.instant import Instant
+from datacentric.log.log_verbosity import LogVerbosity
+from datacentric.log.json_lines_log import JsonLinesLog
+from datacentric.log.json_lines_log_reader import JsonLinesLogReader
+from datacentric.storage.unit_test_context import UnitTestContext
+
+
+class TestJsonLinesLog(unittest.TestCase):
+    """Unit tests for JsonLinesLog and JsonLinesLogReader."""
+
+    def test_smoke(self):
+        """Smoke test for JsonLinesLog."""
+
+        with UnitTestContext() as context, tempfile.TemporaryDirectory() as temp_dir:
+
+            file_path: str = os.path.join(temp_dir, 'log.jsonl')
+            json_lines_log: JsonLinesLog = JsonLinesLog(log_file_path=file_path, verbosity=LogVerbosity.Info)
+            json_lines_log.init(context)
+
+            json_lines_log.error('Title for error', 'Multi-line description\nSecond line of description')
+            json_lines_log.flush()
+
+            # Calling init again keeps the entries already written
+            json_lines_log.init(context)
+            json_lines_log.info('Title for info "quoted"')
+            json_lines_log.verify('Title for verify')
+            json_lines_log.flush()
+
+            with open(file_path) as file:
+                lines = file.read().splitlines()
+            self.assertEqual(2, len(lines))
+            self.assertTrue(lines[0].startswith('{"Time":"'))
+            self.assertTrue(lines[0].endswith('","Verbosity":"Error","Title":"Title for error",'
+                                              '"Description":"Multi-line description\\nSecond line of description"}'))
+
+            reader = JsonLinesLogReader(file_path)
+            self.assertEqual(2, reader.count())
+            entries = list(reader.read())
+            self.assertEqual(['Title for error', 'Title for info "quoted"'], [entry['Title'] for entry in entries])
+            self.assertEqual('Multi-line description\nSecond line of description', entries[0]['Description'])
+            self.assertEqual(['Title for error'], [entry['Title'] for entry in reader.read(verbosity=LogVerbosity.Error)])
+            reader.close()
+            json_lines_log.close()
+
+    def test_index(self):
+        """Test reading by time window and extending the index."""
+
+        with UnitTestContext() as context, tempfile.TemporaryDirectory() as temp_dir:
+
+            file_path: str = os.path.join(temp_dir, 'log.jsonl')
+            json_lines_log: JsonLinesLog = JsonLinesLog(log_file_path=file_path, verbosity=LogVerbosity.Info)
+            json_lines_log.init(context)
+
+            # Entries in three batches separated in time
+            for batch in range(3):
+                if batch > 0:
+                    time.sleep(0.01)
+                for i in range(5):
+                    json_lines_log.publish(LogVerbosity.Info if i % 2 == 0 else LogVerbosity.Warning, f'{batch}.{i}')
+            json_lines_log.flush()
+
+            reader = JsonLinesLogReader(file_path)
+            entries = list(reader.read())
+            self.assertEqual(15, len(entries))
+            times = [Instant.from_str(entry['Time']) for entry in entries]
+            self.assertEqual(sorted(times), times)
+
+            # Window that starts at the first entry of the second batch and ends at the first entry of the third
+            start, end = times[5], times[10]
+            titles = [entry['Title'] for entry in reader.read(start, end)]
+            self.assertEqual([f'1.{i}' for i in range(5)], titles)
+            titles = [entry['Title'] for entry in reader.read(start, end, LogVerbosity.Warning)]
+            self.assertEqual(['1.1', '1.3'], titles)
+            reader.close()
+
+            # Complete lines appended after the index was created are added to it, the incomplete line is not
+            json_lines_log.error('Appended')
+            json_lines_log.flush()
+            with open(file_path, 'a') as file:
+                file.write('{"Time":"')
+            reader = JsonLinesLogReader(file_path)
+            self.assertEqual(16, reader.count())
+            self.assertEqual(['Appended'], [entry['Title'] for entry in reader.read(verbosity=LogVerbosity.Error)])
+            reader.close()
+            json_lines_log.close()
+
+            # Lines that are not in the layout written by JsonLinesLog are parsed as JSON
+            with open(file_path, 'w') as file:
+                file.write('{"Title":"Reordered","Verbosity":"Info","Time":"2003-05-01T10:15:30Z"}\n')
+            reader = JsonLinesLogReader(file_path)
+            self.assertEqual(['Reordered'], [entry['Title'] for entry in reader.read()])
+            reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
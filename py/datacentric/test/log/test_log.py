@@ -0,0 +1,134 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+import timeit
+import unittest
+from datacentric.log.log_verbosity import LogVerbosity
+from datacentric.log.text_log import TextLog
+from datacentric.file_system.string_writer import StringWriter
+from datacentric.storage.context import Context
+
+
+@attr.s(slots=True, auto_attribs=True)
+class _StringLog(TextLog):
+    """Writes log output to a string."""
+
+    def init(self, context: Context) -> None:
+        """Initialize base, then assign string writer."""
+        super().init(context)
+        self._text_writer = StringWriter()
+
+    def __str__(self):
+        """Log output as string."""
+        return str(self._text_writer)
+
+
+class TestLog(unittest.TestCase):
+    """Unit tests for Log base class."""
+
+    def test_lazy(self):
+        """Test that lazy title and description are only evaluated for published entries."""
+
+        log = _StringLog(verbosity=LogVerbosity.Info)
+        log.init(Context())
+
+        evaluated = []
+
+        def message(text: str):
+            evaluated.append(text)
+            return text
+
+        log.verify(lambda: message('Verify title'), lambda: message('Verify description'))
+        log.publish(LogVerbosity.Verify, lambda: message('Published title'))
+        log.info(lambda: message('Info title'), lambda: message('Info description'))
+        self.assertEqual(['Info title', 'Info description'], evaluated)
+
+        self.assertEqual('Info: Info title\n'
+                         '        Info description\n', str(log))
+
+    def test_format_args(self):
+        """Test that format args are substituted into title and description of published entries."""
+
+        log = _StringLog(verbosity=LogVerbosity.Info)
+        log.init(Context())
+
+        log.info('Loaded {0} records', format_args=[5])
+        log.info('Loaded {0} records', 'Description')
+        log.verify('Verify {0}', format_args=['not formatted'])
+        log.warning('Warning {0} of {1}', 'Description {1}', format_args=(1, 2))
+        log.assert_(False, 'Assert {0}', format_args=['not formatted'])
+        log.assert_(True, 'Assert {0}', format_args=['formatted'])
+        self.assertEqual('Info: Loaded 5 records\n'
+                         'Info: Loaded {0} records\n'
+                         '        Description\n'
+                         'Warning: Warning 1 of 2\n'
+                         '        Description 2\n'
+                         'Error: Assert formatted\n', str(log))
+
+    def test_span(self):
+        """Test nested spans with counters and the summary published by flush."""
+
+        log = _StringLog(verbosity=LogVerbosity.Info)
+        log.init(Context())
+
+        with log.span('Outer') as outer:
+            for i in range(2):
+                with log.span('Inner') as inner:
+                    inner.add('Records', 10)
+                    inner.add('Records')
+            outer.add('Bytes', 100)
+            with log.span('Skipped', LogVerbosity.Verify) as skipped:
+                skipped.add('Records')
+        with self.assertRaises(Exception):
+            with log.span('Failed'):
+                raise Exception('Failed span.')
+
+        output = str(log).splitlines()
+        self.assertEqual(['Span Outer/Inner', 'Records: 11', 'Span Outer/Inner', 'Records: 11', 'Span Outer', 'Bytes: 100',
+                          'Span Failed'], [line.split(': wall')[0].strip().replace('Info: ', '') for line in output])
+        self.assertTrue(output[-1].endswith(', raised Exception'))
+
+        log.flush()
+        summary = str(log).splitlines()[len(output):]
+        self.assertEqual(['Info: Summary of span Failed: 1 calls',
+                          'Info: Summary of span Outer: 1 calls',
+                          '        Bytes: 100',
+                          'Info: Summary of span Outer/Inner: 2 calls',
+                          '        Records: 22'], [line.split(', wall')[0] for line in summary])
+
+        # Summary is reset by flush
+        log.flush()
+        self.assertEqual(len(output) + len(summary), len(str(log).splitlines()))
+
+    @unittest.skip('Performance')
+    def test_perf(self):
+        """Compare the cost of skipped entries with and without verbosity check before LogEntry is created."""
+
+        log = _StringLog()
+        log.init(Context())
+        count = 100_000
+
+        t = timeit.timeit('log.verify("Title", "Description")', globals={'log': log}, number=count)
+        print(f'{t:.4f}: verify')
+        t = timeit.timeit('log.verify(lambda: f"Title {count}")', globals={'log': log, 'count': count}, number=count)
+        print(f'{t:.4f}: verify lazy')
+        t = timeit.timeit('log.publish_entry(LogEntry(verbosity=LogVerbosity.Verify, title="Title"))',
+                          setup='from datacentric.log.log_entry import LogEntry',
+                          globals={'log': log, 'LogVerbosity': LogVerbosity}, number=count)
+        print(f'{t:.4f}: LogEntry created before verbosity check')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import gzip
+import tempfile
+import unittest
+from datacentric.log.log_verbosity import LogVerbosity
+from datacentric.log.queue_file_log import QueueFileLog
+from datacentric.log.queue_full_policy import QueueFullPolicy
+from datacentric.storage.unit_test_context import UnitTestContext
+
+
+class TestQueueFileLog(unittest.TestCase):
+    """Unit tests for QueueFileLog."""
+
+    def test_smoke(self):
+        """Smoke test for QueueFileLog."""
+
+        with UnitTestContext() as context:
+
+            # File name for log output
+            file_path: str = __file__.replace(".py", ".test_smoke.file_log_output.txt")
+
+            queue_file_log: QueueFileLog = QueueFileLog(log_file_path=file_path, verbosity=LogVerbosity.Info)
+            queue_file_log.init(context)
+
+            queue_file_log.error('Title for error', 'Description for error')
+            queue_file_log.warning('Title for warning', 'Description for warning')
+            queue_file_log.info('Multi-line title\nSecond line of title',
+                                'Multi-line description\nSecond line of description')
+            queue_file_log.verify('Title for verify')
+
+            # Output is written to the file by flush
+            queue_file_log.flush()
+            with open(file_path) as file:
+                self.assertEqual('Error: Title for error\n'
+                                 '        Description for error\n'
+                                 'Warning: Title for warning\n'
+                                 '        Description for warning\n'
+                                 'Info: Multi-line title Second line of title\n'
+                                 '        Multi-line description\n'
+                                 '        Second line of description\n', file.read())
+
+            queue_file_log.close()
+            with self.assertRaises(Exception):
+                queue_file_log.error('Title after close')
+
+    def test_drop(self):
+        """Test that entries which do not fit into the queue are counted and reported."""
+
+        with UnitTestContext() as context, tempfile.TemporaryDirectory() as temp_dir:
+
+            # The number of dropped entries varies between runs, write output to a temporary file
+            file_path: str = os.path.join(temp_dir, 'drop.txt')
+
+            queue_file_log: QueueFileLog = QueueFileLog(log_file_path=file_path, max_queue_size=1,
+                                                        queue_full_policy=QueueFullPolicy.Drop)
+            queue_file_log.init(context)
+
+            count = 1000
+            for i in range(count):
+                queue_file_log.error(f'Title {i}')
+            queue_file_log.close()
+
+            with open(file_path) as file:
+                lines = file.read().splitlines()
+            written_lines = [line for line in lines if line.startswith('Error: ')]
+            dropped_counts = [int(line.split()[1]) for line in lines if line.startswith('Warning: ')]
+            self.assertEqual(count, len(written_lines) + queue_file_log.dropped_count)
+            self.assertEqual(queue_file_log.dropped_count, sum(dropped_counts))
+
+    def test_rotation(self):
+        """Test that rotated files together contain all entries."""
+
+        with UnitTestContext() as context, tempfile.TemporaryDirectory() as temp_dir:
+
+            file_path: str = os.path.join(temp_dir, 'rotation.txt')
+            queue_file_log: QueueFileLog = QueueFileLog(log_file_path=file_path, max_file_bytes=100)
+            queue_file_log.init(context)
+
+            count = 100
+            for i in range(count):
+                queue_file_log.error(f'Title {i}')
+                if i % 10 == 0:
+                    queue_file_log.flush()
+            queue_file_log.close()
+
+            archive_names = sorted((name for name in os.listdir(temp_dir) if name.endswith('.gz')),
+                                   key=lambda name: int(name.split('.')[-2]))
+            self.assertTrue(len(archive_names) > 0)
+            lines = []
+            for archive_name in archive_names:
+                with gzip.open(os.path.join(temp_dir, archive_name), 'rt') as file:
+                    lines.extend(file.read().splitlines())
+            with open(file_path) as file:
+                lines.extend(file.read().splitlines())
+            self.assertEqual([f'Error: Title {i}' for i in range(count)], lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
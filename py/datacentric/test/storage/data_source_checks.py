@@ -0,0 +1,686 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
+from bson import ObjectId
+from datacentric.storage.context import Context
+from datacentric.storage.data_set import DataSet
+from datacentric.storage.deleted_record import DeletedRecord
+from datacentric.storage.version_compactor import VersionCompactor
+from datacentric.storage.prefetch import prefetch, aprefetch
+from datacentric.date_time.local_date import LocalDate
+from datacentric.date_time.local_time import LocalTime
+from datacentric.date_time.local_minute import LocalMinute
+from datacentric.date_time.local_date_time import LocalDateTime
+from datacentric.date_time.instant import Instant
+from datacentric.test.storage.sample_enum import SampleEnum
+from datacentric.test.storage.element_sample import ElementSample
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.test.storage.derived_sample import DerivedSample
+
+
+def at_minute(minute: int, second: int = 0) -> ObjectId:
+    """ObjectId for the specified time on a fixed date."""
+    return ObjectId.from_datetime(dt.datetime(2020, 1, 1, 0, minute, second, tzinfo=dt.timezone.utc))
+
+
+def save_base_record(context: Context, data_set_id, record_id, record_index) -> ObjectId:
+    """Save base record."""
+
+    rec = BaseSample()
+    rec.record_name = record_id
+    rec.record_index = record_index
+    rec.double_element = 100.0
+    rec.local_date_element = LocalDate.from_fields(2003, 5, 1)
+    rec.local_time_element = LocalTime.from_fields(10, 15, 30)  # 10:15:30
+    rec.local_minute_element = LocalMinute.from_fields(10, 15)  # 10:15
+    rec.local_date_time_element = LocalDateTime.from_fields(2003, 5, 1, 10, 15)  # 2003-05-01T10:15:00
+    rec.enum_value = SampleEnum.EnumValue2
+
+    data_set = context.data_source.get_data_set(data_set_id)
+    context.data_source.save_one(BaseSample, rec, data_set)
+
+    return rec.id_
+
+
+def save_derived_record(context: Context, data_set_id, record_id, record_index) -> ObjectId:
+    """Save derived record"""
+
+    rec = DerivedSample()
+    rec.record_name = record_id
+    rec.record_index = record_index
+    rec.double_element = 300.
+    rec.local_date_element = LocalDate.from_fields(2003, 5, 1)
+    rec.local_time_element = LocalTime.from_fields(10, 15, 30)  # 10:15:30
+    rec.local_minute_element = LocalMinute.from_fields(10, 15)  # 10:15
+    rec.local_date_time_element = LocalDateTime.from_fields(2003, 5, 1, 10, 15)  # 2003-05-01T10:15:00
+    rec.instant_element = Instant.from_fields(2003, 5, 1, 10, 15, 0)
+    rec.string_element2 = ''
+    rec.double_element = 200.
+    rec.list_of_string = ['A', 'B', 'C']
+
+    rec.list_of_double = [1.0, 2.0, 3.0]
+    rec.list_of_nullable_double = [10.0, None, 30.0]
+
+    # Data element
+    rec.data_element = ElementSample()
+    rec.data_element.double_element3 = 1.0
+    rec.data_element.string_element3 = 'AA'
+
+    # Data element list
+
+    element_list0 = ElementSample()
+    element_list0.double_element3 = 1.0
+    element_list0.string_element3 = "A0"
+    element_list1 = ElementSample()
+    element_list1.double_element3 = 2.0
+    element_list1.string_element3 = "A1"
+    rec.data_element_list = [element_list0, element_list1]
+
+    # Key element
+    rec.key_element = BaseSample.create_key(record_name='BB', record_index=2)
+
+    # Key element list
+    rec.key_element_list = [BaseSample.create_key(record_name='B0', record_index=3),
+                            BaseSample.create_key(record_name='B1', record_index=4)]
+
+    data_set = context.data_source.get_data_set(data_set_id)
+    context.data_source.save_one(DerivedSample, rec, data_set)
+    return rec.id_
+
+
+def save_basic_data(context: Context) -> None:
+    """Two datasets and two objects, one base and one derived."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    save_base_record(context, 'DataSet0', 'A', 0)
+
+    context.data_source.create_data_set('DataSet1', [data_set0])
+    save_derived_record(context, 'DataSet1', 'B', 0)
+
+
+def load_outcome(context: Context, data_set_id, key) -> str:
+    """Load the object and describe the outcome."""
+
+    data_set = context.data_source.get_data_set(data_set_id)
+    record = context.data_source.load_or_null_by_key(BaseSample, key, data_set)
+
+    if record is None:
+        return 'Not found'
+    else:
+        if record.to_key() != key:
+            return 'Found, key mismatch.'
+        else:
+            return f'Found, type = {type(record).__name__}'
+
+
+def save_minimal_record(context: Context, data_set_id, record_id, record_index, version):
+    """Save record with minimal data for testing how the records are found."""
+
+    rec = BaseSample()
+    rec.record_name = record_id
+    rec.record_index = record_index
+    rec.version = version
+
+    data_set = context.data_source.get_data_set(data_set_id)
+    context.data_source.save_one(BaseSample, rec, data_set)
+
+    return rec.id_
+
+
+def verify_smoke(test: unittest.TestCase, context: Context) -> None:
+    """Smoke test for the data source."""
+
+    save_basic_data(context)
+
+    key_a0 = 'BaseSample=A;0'
+    key_b0 = 'BaseSample=B;0'
+
+    test.assertEqual('Found, type = BaseSample', load_outcome(context, 'DataSet0', key_a0))
+    test.assertEqual('Found, type = BaseSample', load_outcome(context, 'DataSet1', key_a0))
+    test.assertEqual('Not found', load_outcome(context, 'DataSet0', key_b0))
+    test.assertEqual('Found, type = DerivedSample', load_outcome(context, 'DataSet1', key_b0))
+
+
+def verify_multiple_data_set_query(test: unittest.TestCase, context: Context) -> None:
+    """Test working with multiple datasets."""
+
+    # Begin from DataSet0
+    data_set0 = context.data_source.create_data_set('DataSet0')
+
+    # Create initial version of the records
+    save_minimal_record(context, 'DataSet0', 'A', 0, 0)
+    save_minimal_record(context, 'DataSet0', 'B', 1, 0)
+    save_minimal_record(context, 'DataSet0', 'A', 2, 0)
+    save_minimal_record(context, 'DataSet0', 'B', 3, 0)
+
+    # Create second version of some records
+    save_minimal_record(context, 'DataSet0', 'A', 0, 1)
+    save_minimal_record(context, 'DataSet0', 'B', 1, 1)
+    save_minimal_record(context, 'DataSet0', 'A', 2, 1)
+    save_minimal_record(context, 'DataSet0', 'B', 3, 1)
+
+    # Create third version of even fewer records
+    save_minimal_record(context, 'DataSet0', 'A', 0, 2)
+    save_minimal_record(context, 'DataSet0', 'B', 1, 2)
+    save_minimal_record(context, 'DataSet0', 'A', 2, 2)
+    save_minimal_record(context, 'DataSet0', 'B', 3, 2)
+
+    # Same in DataSet1
+    data_set1 = context.data_source.create_data_set("DataSet1", [data_set0])
+
+    # Create initial version of the records
+    save_minimal_record(context, "DataSet1", "A", 4, 0)
+    save_minimal_record(context, "DataSet1", "B", 5, 0)
+    save_minimal_record(context, "DataSet1", "A", 6, 0)
+    save_minimal_record(context, "DataSet1", "B", 7, 0)
+
+    # Create second version of some records
+    save_minimal_record(context, "DataSet1", "A", 4, 1)
+    save_minimal_record(context, "DataSet1", "B", 5, 1)
+    save_minimal_record(context, "DataSet1", "A", 6, 1)
+    save_minimal_record(context, "DataSet1", "B", 7, 1)
+
+    # Next in DataSet2
+    data_set2 = context.data_source.create_data_set("DataSet2", [data_set0])
+    save_minimal_record(context, "DataSet2", "A", 8, 0)
+    save_minimal_record(context, "DataSet2", "B", 9, 0)
+
+    # Next in DataSet3
+    data_set3 = context.data_source.create_data_set("DataSet3", [data_set0, data_set1, data_set2])
+    save_minimal_record(context, "DataSet3", "A", 10, 0)
+    save_minimal_record(context, "DataSet3", "B", 11, 0)
+
+    query = context.data_source.get_query(BaseSample, data_set3) \
+        .where({'record_name': 'B'}) \
+        .sort_by('record_name') \
+        .sort_by('record_index')
+
+    query_result = []
+    for obj in query.as_iterable():  # type: BaseSample
+        data_set: DataSet = context.data_source.load_or_null(DataSet, obj.data_set)
+        data_set_name = data_set.data_set_name
+        query_result.append((obj.to_key().split('=', 1)[1], data_set_name, obj.version))
+
+    test.assertEqual(query_result[0], ('B;1', 'DataSet0', 2))
+    test.assertEqual(query_result[1], ('B;3', 'DataSet0', 2))
+    test.assertEqual(query_result[2], ('B;5', 'DataSet1', 1))
+    test.assertEqual(query_result[3], ('B;7', 'DataSet1', 1))
+    test.assertEqual(query_result[4], ('B;9', 'DataSet2', 0))
+    test.assertEqual(query_result[5], ('B;11', 'DataSet3', 0))
+
+
+def verify_create_ordered_id(test: unittest.TestCase, context: Context) -> None:
+    """Stress tests to check ObjectIds are created in increasing order."""
+
+    ids = [context.data_source.create_ordered_object_id() for i in range(10_000)]
+    test.assertTrue(all(previous < current for previous, current in zip(ids, ids[1:])))
+
+
+def verify_delete(test: unittest.TestCase, context: Context) -> None:
+    """Test that deleted record hides the record in imported dataset."""
+
+    save_basic_data(context)
+
+    key_a0 = 'BaseSample=A;0'
+    data_set1 = context.data_source.get_data_set('DataSet1')
+
+    # Delete in DataSet1 does not affect DataSet0
+    context.data_source.delete(BaseSample, key_a0, data_set1)
+    test.assertEqual('Found, type = BaseSample', load_outcome(context, 'DataSet0', key_a0))
+    test.assertEqual('Not found', load_outcome(context, 'DataSet1', key_a0))
+
+    # Query does not return deleted record
+    query_result = [obj.to_key() for obj in context.data_source.get_query(BaseSample, data_set1).as_iterable()]
+    test.assertEqual(['BaseSample=B;0'], query_result)
+
+    # Saving again makes the record visible
+    save_base_record(context, 'DataSet1', 'A', 0)
+    test.assertEqual('Found, type = BaseSample', load_outcome(context, 'DataSet1', key_a0))
+    test.assertEqual('Found, type = BaseSample', load_outcome(context, 'DataSet0', key_a0))
+
+
+def verify_cutoff_time(test: unittest.TestCase, context: Context) -> None:
+    """Test that cutoff time restricts load and query to earlier versions."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    save_minimal_record(context, 'DataSet0', 'A', 0, 0)
+    cutoff_time = save_minimal_record(context, 'DataSet0', 'A', 0, 1)
+    save_minimal_record(context, 'DataSet0', 'A', 0, 2)
+
+    record = context.data_source.load_by_key(BaseSample, 'BaseSample=A;0', data_set0)
+    test.assertEqual(2, record.version)
+
+    context.data_source.cutoff_time = cutoff_time
+    record = context.data_source.load_by_key(BaseSample, 'BaseSample=A;0', data_set0)
+    test.assertEqual(0, record.version)
+    test.assertIsNone(context.data_source.load_or_null(BaseSample, cutoff_time))
+
+    query_result = [obj.version for obj in context.data_source.get_query(BaseSample, data_set0).as_iterable()]
+    test.assertEqual([0], query_result)
+
+    # Writes are not permitted when cutoff time is set
+    with test.assertRaises(Exception):
+        save_minimal_record(context, 'DataSet0', 'A', 0, 3)
+
+
+def verify_query_operators(test: unittest.TestCase, context: Context) -> None:
+    """Test query with comparison operators and descending sort."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    for record_index in range(6):
+        save_minimal_record(context, 'DataSet0', 'A' if record_index % 2 == 0 else 'B', record_index, 0)
+
+    query = context.data_source.get_query(BaseSample, data_set0) \
+        .where({'record_index': {'$gte': 2}}) \
+        .where({'record_name': {'$in': ['A', 'C']}}) \
+        .sort_by_descending('record_index')
+    query_result = [obj.record_index for obj in query.as_iterable()]
+    test.assertEqual([4, 2], query_result)
+
+
+def verify_async(test: unittest.TestCase, context: Context) -> None:
+    """Asyncio versions of load, save and query methods, used from two event loops in turn."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0), data_set0)
+    data_set1 = context.data_source.create_data_set('DataSet1', [data_set0])
+    context.data_source.save_one(BaseSample, BaseSample(record_name='B', record_index=0), data_set1)
+
+    async def run():
+        try:
+            record = await context.data_source.aload_or_null_by_key(BaseSample, 'BaseSample=A;0', data_set1)
+            test.assertEqual('BaseSample=A;0', record.to_key())
+            test.assertIsNone(await context.data_source.aload_or_null_by_key(
+                BaseSample, 'BaseSample=B;0', data_set0))
+
+            records = [BaseSample(record_name='C', record_index=i) for i in range(3)]
+            await context.data_source.asave_many(BaseSample, records, data_set0)
+
+            keys = ['BaseSample=C;2', 'BaseSample=B;0', 'BaseSample=A;0', 'BaseSample=D;0']
+            loaded = await context.data_source.aload_many(BaseSample, keys, data_set1)
+            test.assertEqual(keys[:3], [x.to_key() for x in loaded[:3]])
+            test.assertIsNone(loaded[3])
+
+            query = context.data_source.get_query(BaseSample, data_set1).sort_by('record_index')
+            return [obj.to_key() async for obj in query]
+        finally:
+            await context.data_source.aclose()
+
+    query_result = asyncio.run(run())
+    test.assertEqual(['BaseSample=A;0', 'BaseSample=B;0', 'BaseSample=C;0',
+                      'BaseSample=C;1', 'BaseSample=C;2'], sorted(query_result))
+
+    # Resources bound to the first event loop are not reused in the next one
+    async def run_again():
+        try:
+            return await context.data_source.aload_or_null_by_key(BaseSample, 'BaseSample=C;1', data_set1)
+        finally:
+            await context.data_source.aclose()
+
+    test.assertEqual('BaseSample=C;1', asyncio.run(run_again()).to_key())
+
+
+def verify_history(test: unittest.TestCase, context: Context) -> None:
+    """Test version history including deleted records, time range and stride."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', [data_set0])
+
+    # Versions with ObjectIds at specified times, one minute apart
+    key_a0 = 'BaseSample=A;0'
+    versions = []
+    for version in range(6):
+        rec = BaseSample()
+        rec.record_name = 'A'
+        rec.record_index = 0
+        rec.version = version
+        rec.id_ = ObjectId.from_datetime(dt.datetime(2020, 1, 1, 0, version, tzinfo=dt.timezone.utc))
+        rec.data_set = data_set0 if version < 3 else data_set1
+        versions.append(rec)
+    deleted = DeletedRecord()
+    deleted.key = key_a0
+    deleted.id_ = ObjectId.from_datetime(dt.datetime(2020, 1, 1, 0, 6, tzinfo=dt.timezone.utc))
+    deleted.data_set = data_set1
+    versions.append(deleted)
+    test.assertEqual(dict(), context.data_source.insert_records(BaseSample, versions))
+
+    def get_history(load_from, **kwargs):
+        return [x.version if isinstance(x, BaseSample) else 'Deleted'
+                for x in context.data_source.get_history(BaseSample, key_a0, load_from, **kwargs)]
+
+    # Dataset lookup list determines which versions are included
+    test.assertEqual([0, 1, 2], get_history(data_set0))
+    test.assertEqual([0, 1, 2, 3, 4, 5, 'Deleted'], get_history(data_set1))
+
+    # From time is inclusive and to time is exclusive
+    test.assertEqual([2, 3, 4], get_history(
+        data_set1, from_time=dt.datetime(2020, 1, 1, 0, 2), to_time=dt.datetime(2020, 1, 1, 0, 5)))
+
+    # Last version in each three minute interval from the first version
+    test.assertEqual([2, 5, 'Deleted'], get_history(data_set1, stride=dt.timedelta(minutes=3)))
+
+
+def verify_diff(test: unittest.TestCase, context: Context) -> None:
+    """Test added, changed and deleted keys between two cutoff times."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', [data_set0])
+
+    # Versions with ObjectIds at specified times
+    versions = []
+    for record_name, minute, second, data_set in [
+            ('A', 0, 0, data_set0), ('B', 1, 0, data_set0), ('C', 2, 0, data_set0), ('A', 3, 0, data_set0),
+            ('E', 3, 30, data_set0), ('D', 5, 0, data_set0), ('F', 5, 30, data_set1), ('C', 6, 0, data_set0)]:
+        rec = BaseSample()
+        rec.record_name = record_name
+        rec.record_index = 0
+        rec.id_ = at_minute(minute, second)
+        rec.data_set = data_set
+        versions.append(rec)
+    for record_name, minute, second in [('B', 4, 0), ('E', 4, 30)]:
+        deleted = DeletedRecord()
+        deleted.key = f'BaseSample={record_name};0'
+        deleted.id_ = at_minute(minute, second)
+        deleted.data_set = data_set0
+        versions.append(deleted)
+    test.assertEqual(dict(), context.data_source.insert_records(BaseSample, versions))
+
+    def diff(load_from, cutoff_a):
+        return [(x.key, x.change_type.name) for x in
+                context.data_source.diff(BaseSample, load_from, cutoff_a, at_minute(6))]
+
+    # Record added and deleted between cutoff times is not included
+    test.assertEqual([('BaseSample=A;0', 'Changed'), ('BaseSample=B;0', 'Deleted'),
+                      ('BaseSample=D;0', 'Added')], diff(data_set0, at_minute(3)))
+    test.assertEqual([('BaseSample=A;0', 'Changed'), ('BaseSample=B;0', 'Deleted'),
+                      ('BaseSample=D;0', 'Added'), ('BaseSample=F;0', 'Added')], diff(data_set1, at_minute(3)))
+
+    # All records are added when earlier cutoff time is not specified
+    test.assertEqual([('BaseSample=A;0', 'Added'), ('BaseSample=C;0', 'Added'),
+                      ('BaseSample=D;0', 'Added')], diff(data_set0, None))
+
+    change = next(x for x in context.data_source.diff(BaseSample, data_set0, at_minute(3), at_minute(6)))
+    test.assertEqual(at_minute(0), change.previous_id)
+    test.assertEqual(at_minute(3), change.current_id)
+
+
+def verify_compaction(test: unittest.TestCase, context: Context) -> None:
+    """Keep versions selected as of horizon and imports cutoff time, delete the rest."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1_record = DataSet(data_set_name='DataSet1', imports=[data_set0], imports_cutoff_time=at_minute(1, 30))
+    context.data_source.save_data_set(data_set1_record)
+    data_set1 = data_set1_record.id_
+
+    # Later version of the dataset without imports cutoff time, the earlier
+    # version is still used by lookups from its TemporalId and its imports
+    # cutoff time must remain pinned
+    context.data_source.save_data_set(DataSet(data_set_name='DataSet1', imports=[data_set0]))
+
+    versions = []
+    for record_name, minute, data_set in [('A', 0, data_set0), ('A', 1, data_set0), ('A', 2, data_set0),
+                                          ('A', 3, data_set0), ('A', 4, data_set0), ('A', 5, data_set0),
+                                          ('B', 0, data_set1), ('B', 1, data_set1), ('C', 2, data_set0)]:
+        rec = BaseSample(record_name=record_name, record_index=0, version=minute)
+        rec.id_ = at_minute(minute, 0 if record_name == 'A' else 10)
+        rec.data_set = data_set
+        versions.append(rec)
+    deleted = DeletedRecord()
+    deleted.key = 'BaseSample=C;0'
+    deleted.id_ = at_minute(3, 10)
+    deleted.data_set = data_set0
+    versions.append(deleted)
+    test.assertEqual(dict(), context.data_source.insert_records(BaseSample, versions))
+
+    def get_history(key, load_from):
+        return [x.version if isinstance(x, BaseSample) else 'Deleted'
+                for x in context.data_source.get_history(BaseSample, key, load_from)]
+
+    # Versions selected as of imports cutoff time and horizon are kept
+    compactor = VersionCompactor(context.data_source, at_minute(4, 30), batch_size=1)
+    result = compactor.compact(BaseSample)
+    test.assertEqual('BaseSample', result.collection_name)
+    test.assertEqual(9, result.versions_scanned)
+    test.assertEqual(5, result.versions_deleted)
+    test.assertTrue(result.bytes_reclaimed > 0)
+
+    test.assertEqual([1, 4, 5], get_history('BaseSample=A;0', data_set0))
+    test.assertEqual([1], get_history('BaseSample=B;0', data_set1))
+    test.assertEqual(['Deleted'], get_history('BaseSample=C;0', data_set0))
+
+    # Lookups return the same records as before compaction
+    test.assertEqual(5, context.data_source.load_by_key(BaseSample, 'BaseSample=A;0', data_set0).version)
+    test.assertEqual(1, context.data_source.load_by_key(BaseSample, 'BaseSample=A;0', data_set1).version)
+    test.assertIsNone(context.data_source.load_or_null_by_key(BaseSample, 'BaseSample=C;0', data_set0))
+
+    # Repeated compaction does not delete anything
+    test.assertEqual(0, compactor.compact(BaseSample).versions_deleted)
+
+    # Dataset collection cannot be compacted
+    with test.assertRaises(Exception):
+        compactor.compact(DataSet)
+
+
+def verify_load_many(test: unittest.TestCase, context: Context) -> None:
+    """Load many selects the same version of each key as load by key."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', [data_set0])
+
+    # Versions in the imported dataset are later than the version in data_set1
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=0), data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=1), data_set1)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=2), data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=3), data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='B', record_index=0, version=0), data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='B', record_index=0, version=1), data_set0)
+
+    keys = ['BaseSample=A;0', 'BaseSample=B;0', 'BaseSample=C;0', 'BaseSample=A;0']
+    for load_from, expected in [(data_set0, [3, 1, None, 3]), (data_set1, [1, 1, None, 1])]:
+        by_key = [context.data_source.load_or_null_by_key(BaseSample, key_, load_from) for key_ in keys]
+        test.assertEqual(expected, [x.version if x is not None else None for x in by_key])
+        loaded = context.data_source.load_many(BaseSample, keys, load_from)
+        test.assertEqual(expected, [x.version if x is not None else None for x in loaded])
+        loaded = asyncio.run(context.data_source.aload_many(BaseSample, keys, load_from))
+        test.assertEqual(expected, [x.version if x is not None else None for x in loaded])
+
+
+def verify_prefetch(test: unittest.TestCase, context: Context) -> None:
+    """Referenced keys are resolved using lookup rules, missing and deleted keys map to None."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=0), data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=1), data_set1)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='B', record_index=0, version=0), data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='C', record_index=0, version=0), data_set0)
+    context.data_source.delete(BaseSample, 'BaseSample=C;0', data_set1)
+
+    for record_index in range(3):
+        context.data_source.save_one(DerivedSample, DerivedSample(
+            record_name='D', record_index=record_index, key_element='BaseSample=A;0',
+            key_element_list=['BaseSample=B;0', 'BaseSample=C;0', 'BaseSample=E;0']), data_set1)
+    context.data_source.save_one(DerivedSample, DerivedSample(record_name='F', record_index=0), data_set1)
+
+    records = list(context.data_source.get_query(DerivedSample, data_set1).sort_by('record_name').as_iterable())
+    test.assertEqual(4, len(records))
+
+    # Single key field, lookup in the dataset from context is not the same as in data_set1
+    context.data_set = data_set1
+    referenced = prefetch(records, 'key_element')
+    test.assertEqual(['BaseSample=A;0'], list(referenced.keys()))
+    test.assertEqual(1, referenced['BaseSample=A;0'].version)
+    referenced = prefetch(records, 'key_element', load_from=data_set0)
+    test.assertEqual(0, referenced['BaseSample=A;0'].version)
+
+    # Several fields including list of keys
+    referenced = prefetch(records, 'key_element', 'key_element_list')
+    test.assertEqual(4, len(referenced))
+    test.assertEqual(0, referenced['BaseSample=B;0'].version)
+    test.assertIsNone(referenced['BaseSample=C;0'])
+    test.assertIsNone(referenced['BaseSample=E;0'])
+
+    # Asynchronous version
+    referenced = asyncio.run(aprefetch(records, 'key_element_list', load_from=data_set0))
+    test.assertEqual(0, referenced['BaseSample=C;0'].version)
+
+    # Fields without key metadata
+    with test.assertRaises(Exception):
+        prefetch(records, 'record_name')
+    test.assertEqual(dict(), prefetch([], 'record_name'))
+
+    # Query operator resolves referenced records together with the results
+    query = context.data_source.get_query(DerivedSample, data_set1).include('key_element').sort_by('record_name')
+    test.assertEqual(0, len(query.included))
+    for record in query.as_iterable():
+        if record.key_element is not None:
+            test.assertEqual(1, query.included[record.key_element].version)
+    test.assertEqual(['BaseSample=A;0'], list(query.included.keys()))
+
+
+def verify_partitions(test: unittest.TestCase, context: Context) -> None:
+    """Partitions return each record of the query exactly once, using lookup rules."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+    records = [BaseSample(record_name='A', record_index=x, version=0) for x in range(20)]
+    context.data_source.save_many(BaseSample, records, data_set0)
+
+    # Later versions and deletion move records out of the ObjectId range of their first version
+    for record_index in range(0, 20, 3):
+        context.data_source.save_one(
+            BaseSample, BaseSample(record_name='A', record_index=record_index, version=1), data_set1)
+    context.data_source.delete(BaseSample, 'BaseSample=A;1', data_set1)
+
+    query = context.data_source.get_query(BaseSample, data_set1).where({'record_index': {'$lt': 15}})
+    expected = sorted((x.to_key(), x.version) for x in query.as_iterable())
+    test.assertEqual(14, len(expected))
+
+    partitions = query.partitions(4)
+    test.assertEqual(4, len(partitions))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        partition_results = list(executor.map(
+            lambda x: [(r.to_key(), r.version) for r in x.as_iterable()], partitions))
+    test.assertTrue(all(len(x) > 0 for x in partition_results))
+    test.assertEqual(expected, sorted(x for partition_result in partition_results for x in partition_result))
+
+    # Sort order applies within each partition
+    sorted_partitions = query.sort_by_descending('record_index').partitions(2)
+    for partition in sorted_partitions:
+        indices = [x.record_index for x in partition.as_iterable()]
+        test.assertEqual(sorted(indices, reverse=True), indices)
+
+    # Single partition and more partitions than records
+    test.assertEqual(expected, sorted((x.to_key(), x.version) for x in query.partitions(1)[0].as_iterable()))
+    many_partitions = query.partitions(100)
+    test.assertTrue(len(many_partitions) <= 15)
+    test.assertEqual(expected, sorted((x.to_key(), x.version)
+                                      for partition in many_partitions for x in partition.as_iterable()))
+
+    # Query without records has a single unbounded partition
+    empty_query = context.data_source.get_query(BaseSample, data_set1).where({'record_index': {'$gt': 100}})
+    empty_partitions = empty_query.partitions(4)
+    test.assertEqual(1, len(empty_partitions))
+    test.assertEqual([], list(empty_partitions[0].as_iterable()))
+
+
+def verify_superseded_batch(test: unittest.TestCase, context: Context) -> None:
+    """Query continues after a full batch of versions that are all superseded by later versions."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+
+    # The first 1000 versions in the order of ObjectId are superseded by later versions
+    context.data_source.save_many(
+        BaseSample, [BaseSample(record_name='A', record_index=x, version=0) for x in range(1000)], data_set0)
+    context.data_source.save_many(
+        BaseSample, [BaseSample(record_name='A', record_index=x, version=1) for x in range(1000)], data_set1)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='B', record_index=0, version=0), data_set1)
+
+    for load_from, expected_versions in [(data_set0, [0] * 1000), (data_set1, [1] * 1000 + [0])]:
+        versions = [x.version for x in context.data_source.get_query(BaseSample, load_from).as_iterable()]
+        test.assertEqual(expected_versions, versions)
+
+        async def aget_versions():
+            return [x.version async for x in context.data_source.get_query(BaseSample, load_from)]
+
+        test.assertEqual(expected_versions, asyncio.run(aget_versions()))
+
+
+def verify_checkpoints(test: unittest.TestCase, context: Context) -> None:
+    """Resumed query returns the records after the checkpoint, each exactly once."""
+
+    data_set0 = context.data_source.create_data_set('DataSet0')
+    data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+    records = [BaseSample(record_name=record_name, record_index=record_index, version=0)
+               for record_index in range(700) for record_name in ['C', 'A', 'B']]
+    context.data_source.save_many(BaseSample, records, data_set0)
+    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=1), data_set1)
+
+    for query in [context.data_source.get_query(BaseSample, data_set1),
+                  context.data_source.get_query(BaseSample, data_set1).sort_by_descending('record_name'),
+                  context.data_source.get_query(BaseSample, data_set1).where({'record_index': {'$lt': 500}})
+                  .sort_by('record_name').sort_by_descending('record_index')]:
+        expected = [(x.to_key(), x.version) for x in query.as_iterable()]
+        test.assertEqual(len(set(expected)), len(expected))
+        test.assertIsNotNone(query.checkpoint)
+
+        # Stop in the middle of the second batch, checkpoint is at the end of the first batch
+        processed = []
+        checkpoint = None
+        for record in query.as_iterable():
+            processed.append((record.to_key(), record.version))
+            checkpoint = query.checkpoint
+            if len(processed) == 1500:
+                break
+        test.assertEqual(expected[:1500], processed)
+
+        resumed = query.resume_from(checkpoint)
+        test.assertEqual(expected[1000:], [(x.to_key(), x.version) for x in resumed.as_iterable()])
+
+        # Checkpoint after the last record
+        test.assertEqual([], list(query.resume_from(resumed.checkpoint).as_iterable()))
+
+    # Checkpoint cannot be used for a query with different sort order
+    with test.assertRaises(Exception):
+        context.data_source.get_query(BaseSample, data_set1).sort_by('record_index').resume_from(checkpoint)
+
+
+def verify_null_checkpoints(test: unittest.TestCase, context: Context) -> None:
+    """Resumed query returns the records after the checkpoint when sort values are null."""
+
+    versions = [None, 2, None, 1, 3, None]
+    double_elements = [1.0, None, None, 2.0, None, 1.0]
+    records = [BaseSample(record_name='A', record_index=x, version=versions[x], double_element=double_elements[x])
+               for x in range(len(versions))]
+    context.data_source.save_many(BaseSample, records, context.data_set)
+
+    for sort_by in [lambda q: q.sort_by('version'),
+                    lambda q: q.sort_by_descending('version'),
+                    lambda q: q.sort_by_descending('double_element').sort_by('version')]:
+        query = sort_by(context.data_source.get_query(BaseSample, context.data_set))
+        expected = [x.record_index for x in query.as_iterable()]
+        test.assertEqual(len(versions), len(expected))
+
+        # Checkpoint after each record is taken at the end of a query for the records up to it
+        for count in range(1, len(expected) + 1):
+            head_query = sort_by(context.data_source.get_query(BaseSample, context.data_set)
+                                 .where({'record_index': {'$in': expected[:count]}}))
+            test.assertEqual(expected[:count], [x.record_index for x in head_query.as_iterable()])
+            resumed = query.resume_from(head_query.checkpoint)
+            test.assertEqual(expected[count:], [x.record_index for x in resumed.as_iterable()])
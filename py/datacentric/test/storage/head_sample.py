@@ -0,0 +1,38 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import attr
+from datacentric.attributes.head_collection_attribute import head_collection
+from datacentric.storage.record import Record
+
+
+@attr.s(slots=True, auto_attribs=True)
+@head_collection
+class HeadSample(Record):
+    """A sample data type stored with head collection."""
+
+    record_name: str = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Sample element."""
+
+    version: int = attr.ib(default=None, kw_only=True, metadata={'optional': True})
+    """Sample element."""
+
+    def to_key(self) -> str:
+        """Get HeadSample key."""
+        return 'HeadSample=' + self.record_name
+
+    @classmethod
+    def create_key(cls, *, record_name: str) -> str:
+        """Create HeadSample key."""
+        return 'HeadSample=' + record_name
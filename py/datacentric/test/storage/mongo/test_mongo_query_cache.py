@@ -0,0 +1,79 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from datacentric.storage.query_cache import QueryCache
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.storage.mongo.temporal_mongo_unit_test_context import TemporalMongoUnitTestContext
+
+
+class TestMongoQueryCache(unittest.TestCase):
+    """Tests for QueryCache with TemporalMongoQuery."""
+
+    def test_hit(self):
+        """Cached ObjectIds are reused while the watermark does not change."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_set0 = context.data_source.create_data_set('DataSet0')
+            data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+            records = [BaseSample(record_name=record_name, record_index=record_index, version=0)
+                       for record_index in range(1200) for record_name in ['B', 'A']]
+            context.data_source.save_many(BaseSample, records, data_set0)
+            context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=1),
+                                         data_set1)
+
+            cache = QueryCache()
+            query = context.data_source.get_query(BaseSample, data_set1) \
+                .where({'record_index': {'$lt': 1100}}) \
+                .sort_by_descending('record_name')
+            expected = [(x.to_key(), x.version) for x in query.as_iterable()]
+
+            cached_query = query.with_cache(cache)
+            self.assertEqual(expected, [(x.to_key(), x.version) for x in cached_query.as_iterable()])
+            self.assertEqual((0, 1, 1), (cache.hits, cache.misses, cache.entry_count))
+            self.assertEqual(expected, [(x.to_key(), x.version) for x in cached_query.as_iterable()])
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+            # Order of fields in where(...) does not change the cache key
+            query_a = context.data_source.get_query(BaseSample, data_set1) \
+                .where({'record_index': 0, 'version': 1}).with_cache(cache)
+            query_b = context.data_source.get_query(BaseSample, data_set1) \
+                .where({'version': 1, 'record_index': 0}).with_cache(cache)
+            self.assertEqual(['BaseSample=A;0'], [x.to_key() for x in query_a.as_iterable()])
+            self.assertEqual(['BaseSample=A;0'], [x.to_key() for x in query_b.as_iterable()])
+            self.assertEqual((2, 2, 2), (cache.hits, cache.misses, cache.entry_count))
+
+    def test_invalidation(self):
+        """Cached result is discarded when the watermark moves after a save."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_set0 = context.data_source.create_data_set('DataSet0')
+            context.data_source.save_many(BaseSample, [BaseSample(record_name='A', record_index=x, version=0)
+                                                       for x in range(3)], data_set0)
+
+            cache = QueryCache()
+            query = context.data_source.get_query(BaseSample, data_set0) \
+                .where({'version': 0}).sort_by('record_index').with_cache(cache)
+            self.assertEqual([0, 1, 2], [x.record_index for x in query.as_iterable()])
+            self.assertEqual([0, 1, 2], [x.record_index for x in query.as_iterable()])
+            self.assertEqual((1, 1, 0), (cache.hits, cache.misses, cache.invalidations))
+
+            # New version of a record removes it from the result
+            context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=1, version=1),
+                                         data_set0)
+            self.assertEqual([0, 2], [x.record_index for x in query.as_iterable()])
+            self.assertEqual((1, 2, 1), (cache.hits, cache.misses, cache.invalidations))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import unittest
 from bson import ObjectId
 from datacentric.storage.context import Context
@@ -25,6 +26,8 @@ from datacentric.test.storage.sample_enum import SampleEnum
 from datacentric.test.storage.element_sample import ElementSample
 from datacentric.test.storage.base_sample import BaseSample
 from datacentric.test.storage.derived_sample import DerivedSample
+from datacentric.test.storage.head_sample import HeadSample
+from datacentric.test.storage import data_source_checks
 from datacentric.storage.mongo.temporal_mongo_unit_test_context import TemporalMongoUnitTestContext
 
 
@@ -124,6 +127,117 @@ class TestTemporalMongoDataSource(unittest.TestCase):
             # TODO: fix logging
             # self.assertTrue(str(context.log) == '')
 
+    def test_async(self):
+        """Test asyncio versions of load, save and query methods."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_async(self, context)
+
+    def test_history(self):
+        """Test version history including deleted records, time range and stride."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_history(self, context)
+
+    def test_diff(self):
+        """Test added, changed and deleted keys between two cutoff times."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_diff(self, context)
+
+    def test_compaction(self):
+        """Keep versions selected as of horizon and imports cutoff time, delete the rest."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_compaction(self, context)
+
+    def test_load_many(self):
+        """Load many selects the same version of each key as load by key."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_load_many(self, context)
+
+    def test_prefetch(self):
+        """Referenced keys are resolved using lookup rules, missing and deleted keys map to None."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_prefetch(self, context)
+
+    def test_partitions(self):
+        """Partitions return each record of the query exactly once, using lookup rules."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_partitions(self, context)
+
+    def test_superseded_batch(self):
+        """Query continues after a full batch of versions that are all superseded by later versions."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_superseded_batch(self, context)
+
+    def test_checkpoints(self):
+        """Resumed query returns the records after the checkpoint, each exactly once."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_checkpoints(self, context)
+
+    def test_null_checkpoints(self):
+        """Resumed query returns the records after the checkpoint when sort values are null."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_source_checks.verify_null_checkpoints(self, context)
+
+    def test_head_collection(self):
+        """Test that load and query from head collection return the same records as from versions."""
+
+        with TemporalMongoUnitTestContext() as context:
+            data_set0 = context.data_source.create_data_set('DataSet0')
+            data_set1 = context.data_source.create_data_set('DataSet1', [data_set0])
+
+            cutoff_time = None
+            for version in range(3):
+                for record_name, data_set in [('A', data_set0), ('B', data_set0), ('B', data_set1)]:
+                    record = HeadSample(record_name=record_name, version=version)
+                    context.data_source.save_one(HeadSample, record, data_set)
+                if version == 0:
+                    cutoff_time = context.data_source.create_ordered_object_id()
+            context.data_source.delete(HeadSample, 'HeadSample=A', data_set1)
+
+            # One head document per key and dataset, including DeletedRecord for A in DataSet1
+            head_collection = context.data_source.get_head_collection_or_none(HeadSample, data_set1)
+            self.assertEqual(4, head_collection.count_documents({}))
+
+            self.assertEqual(2, context.data_source.load_by_key(HeadSample, 'HeadSample=A', data_set0).version)
+            self.assertIsNone(context.data_source.load_or_null_by_key(HeadSample, 'HeadSample=A', data_set1))
+            record = context.data_source.load_by_key(HeadSample, 'HeadSample=B', data_set1)
+            self.assertEqual(2, record.version)
+            self.assertEqual(data_set1, record.data_set)
+
+            query_result = [(obj.record_name, obj.version) for obj in
+                            context.data_source.get_query(HeadSample, data_set1).as_iterable()]
+            self.assertEqual([('B', 2)], query_result)
+
+            # Asynchronous methods also use head collection and return the same records
+            async def run_async():
+                try:
+                    self.assertIsNotNone(context.data_source.get_async_head_collection_or_none(HeadSample, data_set1))
+                    self.assertIsNone(await context.data_source.aload_or_null_by_key(
+                        HeadSample, 'HeadSample=A', data_set1))
+                    loaded = await context.data_source.aload_many(
+                        HeadSample, ['HeadSample=A', 'HeadSample=B'], data_set0)
+                    self.assertEqual([2, 2], [x.version for x in loaded])
+                    return [(obj.record_name, obj.version) async for obj in
+                            context.data_source.get_query(HeadSample, data_set1)]
+                finally:
+                    await context.data_source.aclose()
+
+            self.assertEqual(query_result, asyncio.run(run_async()))
+
+            # Versions are used when cutoff time is set
+            context.data_source.cutoff_time = cutoff_time
+            self.assertIsNone(context.data_source.get_head_collection_or_none(HeadSample, data_set1))
+            self.assertEqual(0, context.data_source.load_by_key(HeadSample, 'HeadSample=A', data_set1).version)
+
     def save_base_record(self, context: Context, data_set_id, record_id, record_index) -> ObjectId:
         """Save base record."""
 
@@ -0,0 +1,89 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tempfile
+import unittest
+from datacentric.storage.context import Context
+from datacentric.storage.env_type import EnvType
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.test.storage.derived_sample import DerivedSample
+from datacentric.storage.snapshot.snapshot_writer import SnapshotWriter
+from datacentric.storage.snapshot.snapshot_data_source import SnapshotDataSource
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+
+
+class TestSnapshotDataSource(unittest.TestCase):
+    """Tests for SnapshotWriter and SnapshotDataSource."""
+
+    def test_smoke(self):
+        """Export dataset with imports and load from snapshot."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_set0 = context.data_source.create_data_set('DataSet0')
+            self.save_record(context, BaseSample, data_set0, 'A', 0, 0)
+            self.save_record(context, BaseSample, data_set0, 'B', 1, 0)
+            self.save_record(context, BaseSample, data_set0, 'C', 2, 0)
+            data_set1 = context.data_source.create_data_set('DataSet1', [data_set0])
+            self.save_record(context, BaseSample, data_set1, 'A', 0, 1)
+            self.save_record(context, DerivedSample, data_set1, 'D', 3, 0)
+            context.data_source.delete(BaseSample, 'BaseSample=C;2', data_set1)
+
+            with tempfile.TemporaryDirectory() as folder_path:
+                counts = SnapshotWriter.write_snapshot(context.data_source, 'DataSet1', [DerivedSample], folder_path)
+                self.assertEqual({'BaseSample': 3}, counts)
+
+                snapshot = SnapshotDataSource(env_type=EnvType.Test, env_group='Snapshot', env_name='Snapshot',
+                                              snapshot_folder_path=folder_path)
+                snapshot.init(context)
+                self.assertEqual(data_set1, snapshot.get_data_set('DataSet1'))
+                self.assertIsNone(snapshot.get_data_set_or_none('DataSet0'))
+
+                # Load by key returns the version selected at export time
+                record = snapshot.load_by_key(BaseSample, 'BaseSample=A;0', data_set1)
+                self.assertEqual(1, record.version)
+                self.assertEqual(data_set1, record.data_set)
+                self.assertEqual(DerivedSample, type(snapshot.load_by_key(BaseSample, 'BaseSample=D;3', data_set1)))
+                self.assertIsNone(snapshot.load_or_null_by_key(BaseSample, 'BaseSample=C;2', data_set1))
+                self.assertIsNone(snapshot.load_or_null_by_key(BaseSample, 'BaseSample=E;4', data_set1))
+
+                # Load by ObjectId
+                self.assertEqual('BaseSample=A;0', snapshot.load_or_null(BaseSample, record.id_).to_key())
+
+                # Query with constraints and sort
+                query = snapshot.get_query(BaseSample, data_set1) \
+                    .where({'record_index': {'$lt': 3}}) \
+                    .sort_by_descending('record_name')
+                self.assertEqual(['BaseSample=B;1', 'BaseSample=A;0'], [x.to_key() for x in query.as_iterable()])
+
+                # Snapshot cannot be used for another dataset or written to
+                with self.assertRaises(Exception):
+                    snapshot.load_or_null_by_key(BaseSample, 'BaseSample=A;0', data_set0)
+                with self.assertRaises(Exception):
+                    snapshot.save_one(BaseSample, BaseSample(record_name='E', record_index=4), data_set1)
+
+                snapshot.close()
+
+    def save_record(self, context: Context, record_type: type, data_set, record_name, record_index, version):
+        """Save record with minimal data."""
+
+        rec = record_type()
+        rec.record_name = record_name
+        rec.record_index = record_index
+        rec.version = version
+        context.data_source.save_one(record_type, rec, data_set)
+        return rec.id_
+
+
+if __name__ == "__main__":
+    unittest.main()
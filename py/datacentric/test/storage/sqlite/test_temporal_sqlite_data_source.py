@@ -0,0 +1,92 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import tempfile
+import unittest
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.versioning_method import VersioningMethod
+from datacentric.storage.sqlite.temporal_sqlite_data_source import TemporalSqliteDataSource
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.test.storage import data_source_checks
+from datacentric.storage.sqlite.temporal_sqlite_unit_test_context import TemporalSqliteUnitTestContext
+
+
+class TestTemporalSqliteDataSource(unittest.TestCase):
+    """Tests for TemporalSqliteDataSource."""
+
+    def test_file_database(self):
+        """Test that records saved to database file are visible to another data source."""
+
+        with tempfile.TemporaryDirectory() as temp_folder_path:
+            db_file_path = os.path.join(temp_folder_path, 'test_file_database.db')
+
+            with TemporalSqliteUnitTestContext() as context:
+                context.data_source = TemporalSqliteDataSource(
+                    env_type=EnvType.Test,
+                    env_group=context.test_module_name,
+                    env_name=context.test_method_name,
+                    versioning_method=VersioningMethod.Temporal,
+                    db_file_path=db_file_path
+                )
+                data_source_checks.save_basic_data(context)
+
+                journal_mode = context.data_source.connection.execute('PRAGMA journal_mode').fetchone()[0]
+                self.assertEqual('wal', journal_mode)
+
+                # Open the same file from another data source in read only mode
+                reader = TemporalSqliteDataSource(
+                    env_type=EnvType.Test,
+                    env_group=context.test_module_name,
+                    env_name=context.test_method_name,
+                    versioning_method=VersioningMethod.Temporal,
+                    db_file_path=db_file_path,
+                    read_only=True
+                )
+                reader.init(context)
+                data_set1 = reader.get_data_set('DataSet1')
+                record = reader.load_by_key(BaseSample, 'BaseSample=B;0', data_set1)
+                self.assertEqual('DerivedSample', type(record).__name__)
+                reader.connection.close()
+                context.data_source.connection.close()
+
+    def test_pickled_partition(self):
+        """Test that pickled query partition reconnects to the database file."""
+
+        with tempfile.TemporaryDirectory() as temp_folder_path:
+            with TemporalSqliteUnitTestContext() as context:
+                context.data_source = TemporalSqliteDataSource(
+                    env_type=EnvType.Test,
+                    env_group=context.test_module_name,
+                    env_name=context.test_method_name,
+                    versioning_method=VersioningMethod.Temporal,
+                    db_file_path=os.path.join(temp_folder_path, 'test_pickled_partition.db')
+                )
+                data_set = context.data_source.create_data_set('DataSet0')
+                records = [BaseSample(record_name='A', record_index=x, version=0) for x in range(20)]
+                context.data_source.save_many(BaseSample, records, data_set)
+
+                partitions = context.data_source.get_query(BaseSample, data_set).partitions(3)
+                unpickled = pickle.loads(pickle.dumps(partitions[1]))
+                self.assertIsNot(context.data_source, unpickled._data_source)
+                self.assertEqual([x.to_key() for x in partitions[1].as_iterable()],
+                                 [x.to_key() for x in unpickled.as_iterable()])
+
+                unpickled._data_source.connection.close()
+                context.data_source.connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.versioning_method import VersioningMethod
+from datacentric.storage.sqlite.temporal_sqlite_data_source import TemporalSqliteDataSource
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+from datacentric.storage.sqlite.temporal_sqlite_unit_test_context import TemporalSqliteUnitTestContext
+
+
+def get_name_and_version(record: BaseSample):
+    """Function applied to records in worker processes, must be defined at module level."""
+    return record.to_key(), record.version
+
+
+def fail_on_b(record: BaseSample):
+    """Function that raises an error for one of the records."""
+    if record.record_name == 'B':
+        raise Exception('Test error.')
+    return record.version
+
+
+class TestParallelMap(unittest.TestCase):
+    """Tests for parallel map over query results."""
+
+    def test_sqlite(self):
+        """Parallel map over records in SQLite database file."""
+
+        with tempfile.TemporaryDirectory() as temp_folder_path:
+            with TemporalSqliteUnitTestContext() as context:
+                context.data_source = TemporalSqliteDataSource(
+                    env_type=EnvType.Test,
+                    env_group=context.test_module_name,
+                    env_name=context.test_method_name,
+                    versioning_method=VersioningMethod.Temporal,
+                    db_file_path=os.path.join(temp_folder_path, 'test_parallel_map.db')
+                )
+
+                data_set0 = context.data_source.create_data_set('DataSet0')
+                data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+                records = [BaseSample(record_name=record_name, record_index=record_index, version=0)
+                           for record_name in ['A', 'B', 'C'] for record_index in range(20)]
+                context.data_source.save_many(BaseSample, records, data_set0)
+                context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=1),
+                                             data_set1)
+                context.data_source.delete(BaseSample, 'BaseSample=C;0', data_set1)
+
+                query = context.data_source.get_query(BaseSample, data_set1).where({'record_index': {'$lt': 10}})
+                expected = sorted(get_name_and_version(x) for x in query.as_iterable())
+                self.assertEqual(29, len(expected))
+                self.assertIn(('BaseSample=A;0', 1), expected)
+
+                # Unordered results
+                result = list(query.parallel_map(get_name_and_version, workers=3, ordered=False, chunk_size=4))
+                self.assertEqual(expected, sorted(result))
+
+                # Ordered results are in the order of the query
+                result = list(query.parallel_map(get_name_and_version, workers=3, chunk_size=4))
+                self.assertEqual([get_name_and_version(x) for x in query.as_iterable()], result)
+
+                # Ordered results of sorted query, including equal sort values
+                sorted_query = query.sort_by_descending('record_index').sort_by('record_name')
+                result = list(sorted_query.parallel_map(get_name_and_version, workers=3, chunk_size=4))
+                self.assertEqual([get_name_and_version(x) for x in sorted_query.as_iterable()], result)
+                self.assertEqual(('BaseSample=A;9', 0), result[0])
+
+                # Error in worker process
+                with self.assertRaises(Exception):
+                    list(query.parallel_map(fail_on_b, workers=2))
+
+                context.data_source.connection.close()
+
+    def test_memory(self):
+        """In-memory data source cannot be accessed from worker processes."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            with self.assertRaises(Exception):
+                list(context.data_source.get_query(BaseSample, context.data_set).parallel_map(get_name_and_version))
+
+
+if __name__ == "__main__":
+    unittest.main()
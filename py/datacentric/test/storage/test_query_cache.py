@@ -0,0 +1,167 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import tempfile
+import unittest
+from datacentric.storage.env_type import EnvType
+from datacentric.storage.query_cache import QueryCache
+from datacentric.storage.snapshot.snapshot_writer import SnapshotWriter
+from datacentric.storage.snapshot.snapshot_data_source import SnapshotDataSource
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+from datacentric.storage.sqlite.temporal_sqlite_unit_test_context import TemporalSqliteUnitTestContext
+
+context_types = [TemporalMemoryUnitTestContext, TemporalSqliteUnitTestContext]
+"""Unit test contexts for the data sources that support QueryCache."""
+
+
+class TestQueryCache(unittest.TestCase):
+    """Tests for QueryCache."""
+
+    def test_hit(self):
+        """Cached ObjectIds are reused while the watermark does not change."""
+
+        for context_type in context_types:
+            with self.subTest(context_type=context_type.__name__), context_type() as context:
+                data_set0 = context.data_source.create_data_set('DataSet0')
+                data_set1 = context.data_source.create_data_set('DataSet1', imports=[data_set0])
+                records = [BaseSample(record_name=record_name, record_index=record_index, version=0)
+                           for record_index in range(1200) for record_name in ['B', 'A']]
+                context.data_source.save_many(BaseSample, records, data_set0)
+                context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0, version=1),
+                                             data_set1)
+
+                cache = QueryCache()
+                query = context.data_source.get_query(BaseSample, data_set1) \
+                    .where({'record_index': {'$lt': 1100}}) \
+                    .sort_by_descending('record_name')
+                expected = [(x.to_key(), x.version) for x in query.as_iterable()]
+
+                cached_query = query.with_cache(cache)
+                self.assertEqual(expected, [(x.to_key(), x.version) for x in cached_query.as_iterable()])
+                self.assertEqual((0, 1, 1), (cache.hits, cache.misses, cache.entry_count))
+                self.assertEqual(expected, [(x.to_key(), x.version) for x in cached_query.as_iterable()])
+                self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+                # Order of fields in where(...) does not change the cache key
+                query_a = context.data_source.get_query(BaseSample, data_set1) \
+                    .where({'record_index': 0, 'version': 1}).with_cache(cache)
+                query_b = context.data_source.get_query(BaseSample, data_set1) \
+                    .where({'version': 1, 'record_index': 0}).with_cache(cache)
+                self.assertEqual(['BaseSample=A;0'], [x.to_key() for x in query_a.as_iterable()])
+                self.assertEqual(['BaseSample=A;0'], [x.to_key() for x in query_b.as_iterable()])
+                self.assertEqual((2, 2), (cache.hits, cache.misses))
+
+                # Different load_from dataset is a different entry
+                self.assertEqual([], list(context.data_source.get_query(BaseSample, data_set0)
+                                          .where({'version': 1}).with_cache(cache).as_iterable()))
+                self.assertEqual((2, 3, 3), (cache.hits, cache.misses, cache.entry_count))
+
+                # Result is cached only when all records have been iterated
+                for record in context.data_source.get_query(BaseSample, data_set0).with_cache(cache).as_iterable():
+                    break
+                self.assertEqual(3, cache.entry_count)
+
+    def test_invalidation(self):
+        """Cached result is discarded when the watermark moves after a save."""
+
+        for context_type in context_types:
+            with self.subTest(context_type=context_type.__name__), context_type() as context:
+                data_set0 = context.data_source.create_data_set('DataSet0')
+                context.data_source.save_many(BaseSample, [BaseSample(record_name='A', record_index=x, version=0)
+                                                           for x in range(3)], data_set0)
+
+                cache = QueryCache()
+                query = context.data_source.get_query(BaseSample, data_set0) \
+                    .where({'version': 0}).sort_by('record_index').with_cache(cache)
+                self.assertEqual([0, 1, 2], [x.record_index for x in query.as_iterable()])
+
+                # New version of a record removes it from the result
+                context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=1, version=1),
+                                             data_set0)
+                self.assertEqual([0, 2], [x.record_index for x in query.as_iterable()])
+                self.assertEqual((0, 2, 1), (cache.hits, cache.misses, cache.invalidations))
+
+                # Delete also moves the watermark
+                context.data_source.delete(BaseSample, 'BaseSample=A;2', data_set0)
+                self.assertEqual([0], [x.record_index for x in query.as_iterable()])
+                self.assertEqual([0], [x.record_index for x in query.as_iterable()])
+                self.assertEqual((1, 3, 2), (cache.hits, cache.misses, cache.invalidations))
+
+    def test_snapshot(self):
+        """Cached result for snapshot is discarded when the snapshot is exported again with new data."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_set0 = context.data_source.create_data_set('DataSet0')
+            context.data_source.save_many(BaseSample, [BaseSample(record_name='A', record_index=x, version=0)
+                                                       for x in range(3)], data_set0)
+
+            cache = QueryCache()
+            with tempfile.TemporaryDirectory() as folder_path:
+                SnapshotWriter.write_snapshot(context.data_source, 'DataSet0', [BaseSample], folder_path)
+                snapshot = SnapshotDataSource(env_type=EnvType.Test, env_group='Snapshot', env_name='Snapshot',
+                                              snapshot_folder_path=folder_path)
+                snapshot.init(context)
+                query = snapshot.get_query(BaseSample, data_set0).with_cache(cache)
+                self.assertEqual(3, len(list(query.as_iterable())))
+                self.assertEqual(3, len(list(query.as_iterable())))
+                self.assertEqual((1, 1), (cache.hits, cache.misses))
+                snapshot.close()
+
+            context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=3, version=0),
+                                         data_set0)
+            with tempfile.TemporaryDirectory() as folder_path:
+                SnapshotWriter.write_snapshot(context.data_source, 'DataSet0', [BaseSample], folder_path)
+                snapshot = SnapshotDataSource(env_type=EnvType.Test, env_group='Snapshot', env_name='Snapshot',
+                                              snapshot_folder_path=folder_path)
+                snapshot.init(context)
+                query = snapshot.get_query(BaseSample, data_set0).with_cache(cache)
+                self.assertEqual(4, len(list(query.as_iterable())))
+                self.assertEqual((1, 2, 1), (cache.hits, cache.misses, cache.invalidations))
+                snapshot.close()
+
+    def test_eviction(self):
+        """Least recently used entries are evicted when max_bytes is exceeded."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_set0 = context.data_source.create_data_set('DataSet0')
+            context.data_source.save_many(BaseSample, [BaseSample(record_name='A', record_index=x, version=x % 3)
+                                                       for x in range(30)], data_set0)
+
+            queries = [context.data_source.get_query(BaseSample, data_set0).where({'version': x})
+                       for x in range(3)]
+            cache = QueryCache()
+            for query in queries:
+                list(query.with_cache(cache).as_iterable())
+            entry_size = cache.size_bytes // 3
+
+            # Room for two entries, the least recently used is evicted
+            cache = QueryCache(max_bytes=2 * entry_size + entry_size // 2)
+            list(queries[0].with_cache(cache).as_iterable())
+            list(queries[1].with_cache(cache).as_iterable())
+            list(queries[0].with_cache(cache).as_iterable())
+            list(queries[2].with_cache(cache).as_iterable())
+            self.assertEqual((2, 1), (cache.entry_count, cache.evictions))
+            list(queries[0].with_cache(cache).as_iterable())
+            list(queries[1].with_cache(cache).as_iterable())
+            self.assertEqual({'Hits': 2, 'Misses': 4, 'Invalidations': 0, 'Evictions': 2, 'Entries': 2,
+                              'SizeBytes': cache.size_bytes}, cache.get_metrics())
+
+            # Result larger than max_bytes is not cached
+            cache = QueryCache(max_bytes=entry_size // 2)
+            list(queries[0].with_cache(cache).as_iterable())
+            self.assertEqual((0, 0), (cache.entry_count, cache.size_bytes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from typing import Callable
+from datacentric.storage.context import Context
+from datacentric.test.storage import data_source_checks
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+from datacentric.storage.sqlite.temporal_sqlite_unit_test_context import TemporalSqliteUnitTestContext
+
+context_types = [TemporalMemoryUnitTestContext, TemporalSqliteUnitTestContext]
+"""Unit test contexts for the data sources on which the common checks are run."""
+
+
+class TestTemporalDataSource(unittest.TestCase):
+    """Checks common to all temporal data sources, run for each type of unit test context."""
+
+    def test_smoke(self):
+        """Smoke test for the data source."""
+
+        self._run(data_source_checks.verify_smoke)
+
+    def test_multiple_data_set_query(self):
+        """Test working with multiple datasets."""
+
+        self._run(data_source_checks.verify_multiple_data_set_query)
+
+    def test_create_ordered_id(self):
+        """Stress tests to check ObjectIds are created in increasing order."""
+
+        self._run(data_source_checks.verify_create_ordered_id)
+
+    def test_delete(self):
+        """Test that deleted record hides the record in imported dataset."""
+
+        self._run(data_source_checks.verify_delete)
+
+    def test_cutoff_time(self):
+        """Test that cutoff time restricts load and query to earlier versions."""
+
+        self._run(data_source_checks.verify_cutoff_time)
+
+    def test_query_operators(self):
+        """Test query with comparison operators and descending sort."""
+
+        self._run(data_source_checks.verify_query_operators)
+
+    def test_async(self):
+        """Test asyncio versions of load, save and query methods."""
+
+        self._run(data_source_checks.verify_async)
+
+    def test_history(self):
+        """Test version history including deleted records, time range and stride."""
+
+        self._run(data_source_checks.verify_history)
+
+    def test_diff(self):
+        """Test added, changed and deleted keys between two cutoff times."""
+
+        self._run(data_source_checks.verify_diff)
+
+    def test_compaction(self):
+        """Keep versions selected as of horizon and imports cutoff time, delete the rest."""
+
+        self._run(data_source_checks.verify_compaction)
+
+    def test_load_many(self):
+        """Load many selects the same version of each key as load by key."""
+
+        self._run(data_source_checks.verify_load_many)
+
+    def test_prefetch(self):
+        """Referenced keys are resolved using lookup rules, missing and deleted keys map to None."""
+
+        self._run(data_source_checks.verify_prefetch)
+
+    def test_partitions(self):
+        """Partitions return each record of the query exactly once, using lookup rules."""
+
+        self._run(data_source_checks.verify_partitions)
+
+    def test_superseded_batch(self):
+        """Query continues after a full batch of versions that are all superseded by later versions."""
+
+        self._run(data_source_checks.verify_superseded_batch)
+
+    def test_checkpoints(self):
+        """Resumed query returns the records after the checkpoint, each exactly once."""
+
+        self._run(data_source_checks.verify_checkpoints)
+
+    def test_null_checkpoints(self):
+        """Resumed query returns the records after the checkpoint when sort values are null."""
+
+        self._run(data_source_checks.verify_null_checkpoints)
+
+    def _run(self, check: Callable[[unittest.TestCase, Context], None]) -> None:
+        """Run the check in a new context of each type, as a separate subtest."""
+        for context_type in context_types:
+            with self.subTest(context_type=context_type.__name__), context_type() as context:
+                check(self, context)
+
+
+if __name__ == "__main__":
+    unittest.main()
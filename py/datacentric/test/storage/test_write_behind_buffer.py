@@ -0,0 +1,95 @@
+# Copyright (C) 2013-present The DataCentric Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import time
+import unittest
+from datacentric.test.storage.base_sample import BaseSample
+from datacentric.test.storage.derived_sample import DerivedSample
+from datacentric.storage.memory.temporal_memory_unit_test_context import TemporalMemoryUnitTestContext
+
+
+class TestWriteBehindBuffer(unittest.TestCase):
+    """Tests for WriteBehindBuffer."""
+
+    def test_smoke(self):
+        """Records are written on size threshold and on exit, ObjectIds are assigned at call time."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_set = context.data_source.create_data_set('DataSet0')
+
+            ids = []
+            with context.data_source.write_behind(max_batch_size=3, max_delay_seconds=60.0) as buffer:
+                for record_index in range(4):
+                    record = BaseSample(record_name='A', record_index=record_index)
+                    context.data_source.save_one(BaseSample, record, data_set)
+                    ids.append(record.id_)
+                    self.assertEqual(data_set, record.data_set)
+
+                # Size threshold reached after three records
+                self.assertEqual(3, buffer.written_count)
+                self.assertEqual(1, buffer.pending_count)
+                self.assertIsNone(context.data_source.load_or_null_by_key(BaseSample, 'BaseSample=A;3', data_set))
+
+                # Delete is buffered after the save
+                context.data_source.delete(BaseSample, 'BaseSample=A;0', data_set)
+                self.assertEqual(2, buffer.pending_count)
+                self.assertIsNotNone(context.data_source.load_or_null_by_key(BaseSample, 'BaseSample=A;0', data_set))
+
+            self.assertIsNone(context.data_source.write_behind_buffer)
+            self.assertEqual(sorted(ids), ids)
+            self.assertEqual(5, buffer.written_count)
+            self.assertEqual(0, buffer.pending_count)
+            self.assertIsNone(context.data_source.load_or_null_by_key(BaseSample, 'BaseSample=A;0', data_set))
+            self.assertEqual(3, context.data_source.load_by_key(BaseSample, 'BaseSample=A;3', data_set).record_index)
+
+    def test_delay(self):
+        """Records are written on the next call after time threshold."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_set = context.data_source.create_data_set('DataSet0')
+
+            with context.data_source.write_behind(max_delay_seconds=0.01) as buffer:
+                context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0), data_set)
+                self.assertEqual(1, buffer.pending_count)
+                time.sleep(0.02)
+                context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=1), data_set)
+                self.assertEqual(0, buffer.pending_count)
+                self.assertEqual(2, buffer.written_count)
+
+    def test_errors(self):
+        """Record that cannot be written is reported without preventing other records from being written."""
+
+        with TemporalMemoryUnitTestContext() as context:
+            data_set = context.data_source.create_data_set('DataSet0')
+
+            with self.assertRaises(Exception):
+                with context.data_source.write_behind() as buffer:
+                    context.data_source.save_one(BaseSample, BaseSample(record_name='A', record_index=0), data_set)
+
+                    # Key element does not match the collection specified in metadata
+                    invalid_record = DerivedSample(record_name='B', record_index=1, key_element='DataSet=C')
+                    context.data_source.save_one(DerivedSample, invalid_record, data_set)
+
+                    context.data_source.save_one(BaseSample, BaseSample(record_name='C', record_index=2), data_set)
+
+            self.assertEqual(2, buffer.written_count)
+            self.assertEqual(1, len(buffer.errors))
+            self.assertIs(invalid_record, buffer.errors[0][0])
+            self.assertIsNotNone(context.data_source.load_or_null_by_key(BaseSample, 'BaseSample=C;2', data_set))
+            self.assertIsNone(context.data_source.load_or_null_by_key(BaseSample, 'BaseSample=B;1', data_set))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,7 @@ setuptools.setup(
     description="Core services library for data-centric development.",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    install_requires=['typing_inspect>=0.4', 'numpy>=1.17', 'pymongo>=3.9.0'],
+    install_requires=['typing_inspect>=0.4', 'numpy>=1.17', 'pymongo>=4.13'],
     url="https://github.com/datacentricorg/datacentric-py",
     packages=setuptools.find_packages(include=('datacentric', 'datacentric.*'), exclude=['tests', 'tests.*']),
     classifiers=[